@@ -63,6 +63,11 @@ def create_app(test_config=None):
     app.register_blueprint(compliance_bp)
     app.register_blueprint(api_bp)
     
+    # Bulk job progress streams reconnect every BULK_EVENTS_MAX_SECONDS and
+    # would soon exhaust the default hourly limits
+    from app.utils.rate_limiter import limiter
+    limiter.exempt(app.view_functions['compliance.stream_bulk_job_events'])
+    
     # Register error handlers
     from app.utils.error_handler import handle_error, AppError, NotFoundError
     
@@ -87,11 +92,44 @@ def create_app(test_config=None):
             return jsonify({'error': 'Internal server error', 'message': str(error), 'status_code': 500}), 500
         return handle_error(AppError('An internal server error occurred', status_code=500))
     
+    # Application errors raised outside error_handler routes, e.g. a full task queue (503)
+    @app.errorhandler(AppError)
+    def app_error(error):
+        return handle_error(error)
+    
     # Seed database with sample data
     with app.app_context():
         from app.services.seed_service import seed_compliance_rules
         seed_compliance_rules()
     
+    # Serve compliance rules from an in-process cache
+    from app.services.rule_store import init_rule_store
+    init_rule_store(app)
+    
+    # Share rule verdicts for repeated paragraphs across documents
+    from app.services.verdict_cache import init_verdict_cache
+    init_verdict_cache(app)
+    
+    # Split very large documents across worker processes
+    from app.services.rule_pool import init_rule_pool
+    init_rule_pool(app)
+    
+    # Extract large PDFs across worker processes, OCR scanned pages and reuse
+    # results for repeated uploads
+    from app.services.extraction_service import init_extraction_service
+    init_extraction_service(app)
+    
+    # Keep bulk files and background tasks in a durable queue shared by all
+    # processes
+    from app.services.job_queue import init_job_queue
+    init_job_queue(app)
+    from app.utils.background_tasks import init_background_tasks
+    init_background_tasks(app)
+    
+    # Run bulk ingestion on a worker pool shared by all jobs
+    from app.services.bulk_processor import init_bulk_processor
+    init_bulk_processor(app)
+    
     # Register health check endpoints
     @app.route('/ping')
     def ping():
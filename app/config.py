@@ -51,6 +51,93 @@ class Config:
     # Compliance settings
     DEFAULT_COMPLIANCE_TYPES = ['GDPR', 'HIPAA']
     
+    # Compliance rule cache: seconds between rule version checks, and whether
+    # to also watch the rules collection for changes (requires a replica set)
+    RULE_CACHE_REFRESH_SECONDS = float(os.environ.get('RULE_CACHE_REFRESH_SECONDS', '30'))
+    RULE_CHANGE_STREAM_ENABLED = os.environ.get('RULE_CHANGE_STREAM_ENABLED', 'True').lower() in ('true', '1', 't')
+    
+    # Paragraph verdict cache: verdicts kept in memory, and whether to also
+    # share them through the paragraph_verdicts collection
+    VERDICT_CACHE_SIZE = int(os.environ.get('VERDICT_CACHE_SIZE', '100000'))
+    VERDICT_CACHE_PERSISTENT = os.environ.get('VERDICT_CACHE_PERSISTENT', 'False').lower() in ('true', '1', 't')
+    
+    # Parallel rule evaluation: worker processes (0 disables) and the number
+    # of paragraphs to evaluate from which a document is split across them
+    PARALLEL_EVALUATION_WORKERS = int(os.environ.get('PARALLEL_EVALUATION_WORKERS', str(os.cpu_count() or 1)))
+    PARALLEL_EVALUATION_MIN_PARAGRAPHS = int(os.environ.get('PARALLEL_EVALUATION_MIN_PARAGRAPHS', '20000'))
+    
+    # Parallel PDF extraction: worker processes (0 disables) and the page
+    # count from which a PDF is split across them
+    PDF_EXTRACTION_WORKERS = int(os.environ.get('PDF_EXTRACTION_WORKERS', str(os.cpu_count() or 1)))
+    PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '100'))
+    
+    # Extraction result cache keyed by file content (defaults to
+    # instance/extraction_cache) and its size limit in bytes
+    EXTRACTION_CACHE_ENABLED = os.environ.get('EXTRACTION_CACHE_ENABLED', 'True').lower() in ('true', '1', 't')
+    EXTRACTION_CACHE_DIR = os.environ.get('EXTRACTION_CACHE_DIR', '')
+    EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+    
+    # OCR for PDF pages without a text layer: tesseract worker processes,
+    # seconds allowed per page, rasterization resolution and language
+    OCR_ENABLED = os.environ.get('OCR_ENABLED', 'True').lower() in ('true', '1', 't')
+    OCR_WORKERS = int(os.environ.get('OCR_WORKERS', '2'))
+    OCR_PAGE_TIMEOUT = float(os.environ.get('OCR_PAGE_TIMEOUT', '60'))
+    OCR_DPI = int(os.environ.get('OCR_DPI', '300'))
+    OCR_LANGUAGE = os.environ.get('OCR_LANGUAGE', 'eng')
+    
+    # Durable job queue for bulk files and background tasks: seconds a claimed
+    # task stays owned without a heartbeat, runs before a task fails, and the
+    # first and longest delay between retries
+    QUEUE_LEASE_SECONDS = float(os.environ.get('QUEUE_LEASE_SECONDS', '60'))
+    QUEUE_MAX_ATTEMPTS = int(os.environ.get('QUEUE_MAX_ATTEMPTS', '3'))
+    QUEUE_RETRY_DELAY = float(os.environ.get('QUEUE_RETRY_DELAY', '5'))
+    QUEUE_MAX_RETRY_DELAY = float(os.environ.get('QUEUE_MAX_RETRY_DELAY', '300'))
+    
+    # Whether this process consumes the queue, background tasks it runs at
+    # once, and seconds between polls of an empty queue
+    QUEUE_CONSUMER_ENABLED = os.environ.get('QUEUE_CONSUMER_ENABLED', 'True').lower() in ('true', '1', 't')
+    QUEUE_CONSUMER_THREADS = int(os.environ.get('QUEUE_CONSUMER_THREADS', '4'))
+    QUEUE_POLL_INTERVAL = float(os.environ.get('QUEUE_POLL_INTERVAL', '1'))
+    
+    # Background tasks: queued tasks from which enqueuing is refused
+    # ('reject') or waits up to the enqueue timeout ('wait'), default seconds
+    # a task may run, and seconds finished tasks are kept (0 for no limit)
+    BACKGROUND_TASK_MAX_QUEUED = int(os.environ.get('BACKGROUND_TASK_MAX_QUEUED', '1000'))
+    BACKGROUND_TASK_QUEUE_FULL = os.environ.get('BACKGROUND_TASK_QUEUE_FULL', 'reject')
+    BACKGROUND_TASK_ENQUEUE_TIMEOUT = float(os.environ.get('BACKGROUND_TASK_ENQUEUE_TIMEOUT', '10'))
+    BACKGROUND_TASK_TIMEOUT = float(os.environ.get('BACKGROUND_TASK_TIMEOUT', '3600'))
+    BACKGROUND_TASK_TTL = float(os.environ.get('BACKGROUND_TASK_TTL', '86400'))
+    
+    # Seconds a standalone worker (python -m app.worker) lets running tasks
+    # finish after SIGTERM before exiting
+    WORKER_SHUTDOWN_TIMEOUT = float(os.environ.get('WORKER_SHUTDOWN_TIMEOUT', '300'))
+    
+    # Bulk ingestion: worker processes shared by all bulk jobs of a queue
+    # consuming process, and documents inserted per MongoDB write. Web
+    # processes run none by default, since every gunicorn worker would start
+    # its own pool; python -m app.worker defaults to one per CPU
+    BULK_WORKERS = int(os.environ.get('BULK_WORKERS', '0'))
+    BULK_WRITE_BATCH_SIZE = int(os.environ.get('BULK_WRITE_BATCH_SIZE', '100'))
+    # Store bulk file contents in MongoDB (GridFS) so workers on other hosts
+    # can process them; disable when every worker shares the upload folder
+    BULK_STORE_FILES = os.environ.get('BULK_STORE_FILES', 'True').lower() in ('true', '1', 't')
+    
+    # Bulk job progress streams: seconds between checks for finished files,
+    # and seconds after which a stream ends and the browser reconnects (kept
+    # below the gunicorn worker timeout)
+    BULK_EVENTS_POLL_INTERVAL = float(os.environ.get('BULK_EVENTS_POLL_INTERVAL', '1'))
+    BULK_EVENTS_MAX_SECONDS = float(os.environ.get('BULK_EVENTS_MAX_SECONDS', '60'))
+    
+    # CSV and spreadsheet extraction: rows formatted into each paragraph of
+    # text and raw rows returned per file or sheet (0 omits the raw rows)
+    TABLE_CHUNK_ROWS = int(os.environ.get('TABLE_CHUNK_ROWS', '1000'))
+    TABLE_DATA_SAMPLE_ROWS = int(os.environ.get('TABLE_DATA_SAMPLE_ROWS', '100'))
+    
+    # Include the nested element structure in XML extraction results and the
+    # parsed data in JSON extraction results (held in memory, so off by default)
+    XML_INCLUDE_STRUCTURE = os.environ.get('XML_INCLUDE_STRUCTURE', 'False').lower() in ('true', '1', 't')
+    JSON_INCLUDE_DATA = os.environ.get('JSON_INCLUDE_DATA', 'False').lower() in ('true', '1', 't')
+    
     # LLM settings
     USE_MOCK_LLM = os.environ.get('USE_MOCK_LLM', 'False').lower() in ('true', '1', 't')
     if USE_MOCK_LLM:
@@ -6,7 +6,7 @@ from bson.json_util import dumps
 import json
 
 from app.utils.error_handler import error_handler, AppError, NotFoundError
-from app.utils.security import require_api_key, validate_id
+from app.utils.security import require_api_key, validate_id, validate_query_filter
 from app.utils.rate_limiter import api_rate_limit, rate_limit
 from app.utils.pdf_export import generate_compliance_pdf, generate_document_pdf
 
@@ -134,6 +134,49 @@ def check_document_compliance_api(document_id):
     # Return results
     return json.loads(dumps(compliance_results))
 
+@api_bp.route('/documents/check', methods=['POST'])
+@require_api_key
+@rate_limit(api_rate_limit)
+@error_handler
+def check_documents_compliance_api():
+    """Check compliance for many documents in one call (API endpoint)."""
+    from flask import current_app
+    from app.services.rule_engine import check_documents_compliance
+    
+    data = request.get_json() or {}
+    document_ids = data.get('document_ids')
+    query = data.get('filter')
+    compliance_types = data.get('compliance_types') or current_app.config['DEFAULT_COMPLIANCE_TYPES']
+    
+    if document_ids is None and query is None:
+        raise AppError('Either document_ids or filter is required', status_code=400)
+    if document_ids is not None:
+        if not isinstance(document_ids, list) or not all(validate_id(document_id) for document_id in document_ids):
+            raise AppError('Invalid document ID format', status_code=400)
+    elif not isinstance(query, dict) or not validate_query_filter(query):
+        raise AppError('Invalid document filter', status_code=400)
+    
+    results = check_documents_compliance(
+        compliance_types,
+        document_ids=document_ids,
+        query=query,
+        incremental=data.get('incremental', True)
+    )
+    
+    status_counts = {}
+    for result in results.values():
+        status_counts[result['status']] = status_counts.get(result['status'], 0) + 1
+    
+    response = {
+        'checked': len(results),
+        'by_status': status_counts,
+        'results': results
+    }
+    if document_ids is not None:
+        response['not_found'] = [document_id for document_id in document_ids if document_id not in results]
+    
+    return jsonify(response)
+
 @api_bp.route('/documents/<document_id>/export/pdf', methods=['GET'])
 @require_api_key
 @rate_limit(api_rate_limit)
@@ -213,6 +256,7 @@ def list_compliance_rules_api():
 def get_stats_api():
     """Get application statistics (API endpoint)."""
     from app.extensions import mongo
+    from app.services.verdict_cache import get_verdict_cache
     
     # Get document statistics
     total_documents = mongo.db.documents.count_documents({})
@@ -238,7 +282,8 @@ def get_stats_api():
         },
         'rules': {
             'total': mongo.db.compliance_rules.count_documents({})
-        }
+        },
+        'verdict_cache': get_verdict_cache().stats()
     }
     
     return jsonify(stats)
@@ -1,8 +1,10 @@
 # app/routes/compliance.py
 
-from flask import Blueprint, render_template, request, jsonify, current_app, make_response
+from flask import Blueprint, render_template, request, jsonify, current_app, make_response, Response, stream_with_context
 from app.services.rule_engine import check_document_compliance
+import json
 import os
+import uuid
 from datetime import datetime
 from werkzeug.utils import secure_filename
 from app.extensions import mongo
@@ -171,9 +173,10 @@ def upload_bulk_documents():
     # Prepare file info for bulk processor
     file_info_list = []
     for file in files:
-        # Save file to uploads directory
+        # Save file to uploads directory, under a name no later upload reuses
+        # while the file is still queued
         filename = secure_filename(file.filename)
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], f"{uuid.uuid4().hex}_{filename}")
         file.save(file_path)
         
         # Add to file info list
@@ -185,8 +188,16 @@ def upload_bulk_documents():
     
     # Start bulk processing job
     from app.services.bulk_processor import get_bulk_processor
+    from app.utils.error_handler import AppError
     bulk_processor = get_bulk_processor()
-    job = bulk_processor.start_bulk_job(file_info_list, job_name=request.form.get('job_name'))
+    try:
+        job = bulk_processor.start_bulk_job(
+            file_info_list,
+            job_name=request.form.get('job_name'),
+            group_id=request.form.get('group_id')
+        )
+    except AppError as e:
+        return jsonify({'error': e.message}), e.status_code
     
     return jsonify({
         'message': f'Bulk processing job started with {len(files)} files',
@@ -195,13 +206,54 @@ def upload_bulk_documents():
 
 @compliance_bp.route('/bulk/status/<job_id>', methods=['GET'])
 def get_bulk_job_status(job_id):
-    """Get status of a bulk processing job"""
+    """Get status of a bulk processing job (?summary=true omits the files and results)"""
     from app.services.bulk_processor import get_bulk_processor
     bulk_processor = get_bulk_processor()
-    job_status = bulk_processor.get_job_status(job_id)
+    summary = request.args.get('summary', 'false').lower() in ('true', '1', 't')
+    job_status = bulk_processor.get_job_status(job_id, summary=summary)
     
     return jsonify(job_status)
 
+@compliance_bp.route('/bulk/events/<job_id>', methods=['GET'])
+def stream_bulk_job_events(job_id):
+    """
+    Stream progress of a bulk processing job as Server-Sent Events
+    
+    Sends a "progress" event with the job summary, a "file" event per
+    finished file and a "done" event once the job is complete, after which
+    clients should close the EventSource. The stream ends after
+    BULK_EVENTS_MAX_SECONDS; browsers then reconnect with Last-Event-ID and
+    resume from its ID, so no finished file is missed.
+    """
+    from app.services.bulk_processor import get_bulk_processor
+    bulk_processor = get_bulk_processor()
+    after = request.headers.get('Last-Event-ID', request.args.get('after', '0'))
+    after = int(after) if after.isdigit() else 0
+    events = bulk_processor.iter_job_events(
+        job_id,
+        after=after,
+        poll_interval=current_app.config.get('BULK_EVENTS_POLL_INTERVAL', 1.0),
+        max_seconds=current_app.config.get('BULK_EVENTS_MAX_SECONDS', 60)
+    )
+    
+    def generate():
+        # Reconnect quickly once the stream ends
+        yield 'retry: 1000\n\n'
+        for event, event_id, data in events:
+            if event is None:
+                # Keeps proxies from closing an idle stream
+                yield ': keepalive\n\n'
+                continue
+            message = f'event: {event}\n'
+            if event_id is not None:
+                message += f'id: {event_id}\n'
+            yield message + f'data: {json.dumps(data, default=str)}\n\n'
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @compliance_bp.route('/export/<document_id>', methods=['GET'])
 def export_compliance_report(document_id):
     """Export compliance report as PDF"""
@@ -3,133 +3,626 @@
 """
 Bulk document processing service for handling multiple documents efficiently.
 This is especially useful for processing patient records or medical document sets.
+
+Each file of a bulk job is a task in the durable job queue, so jobs survive
+restarts and their status is visible from every process. A scheduler thread
+in each consuming process claims files round-robin across jobs, so a large
+job cannot starve a later one, runs them on a bounded pool of worker
+processes and writes the finished documents to MongoDB in batches.
+
+File contents are stored in GridFS with the queued files, so workers on
+other hosts can process them without a shared upload folder.
 """
 
 import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
 import threading
+import time
 import uuid
-from typing import Dict, List, Any
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Any, Tuple
 from datetime import datetime
 
+import gridfs
+from pymongo import DESCENDING
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from app.extensions import mongo
+from app.services.job_queue import COMPLETED, FAILED, RUNNING, get_job_queue, new_worker_id
+from app.utils.error_handler import ServiceUnavailableError, ValidationError
+
 logger = logging.getLogger(__name__)
 
-# Tracking for bulk processing jobs
-_active_jobs = {}  # job_id -> job_info
+# Task kind of bulk job files in the job queue
+BULK_FILE_TASK = "bulk_file"
+
+# GridFS bucket holding the content of queued files, keyed by task ID
+BULK_FILES_BUCKET = "bulk_files"
+
+# Compliance types checked when a file does not name any
+DEFAULT_COMPLIANCE_TYPES = ["GDPR", "HIPAA"]
+
+# Seconds after which finished documents are written even if the batch is not
+# full, and between checks for files of other jobs
+WRITE_INTERVAL = 1.0
+
+# MongoDB error code of a duplicate _id
+DUPLICATE_KEY_ERROR = 11000
+
+
+def _init_worker(settings: Dict[str, Any]) -> None:
+    """Configure the services of a worker process from the application settings"""
+    from app.services.extraction_service import init_extraction_service
+    from app.services.rule_pool import init_rule_pool
+    from app.services.verdict_cache import init_verdict_cache
+
+    # The init functions only read config and instance_path
+    app = SimpleNamespace(config=settings, instance_path=settings["INSTANCE_PATH"])
+    init_verdict_cache(app)
+    init_rule_pool(app)
+    init_extraction_service(app)
+
+
+def _process_file(task_id: str, file_info: Dict[str, Any], local_path: str, fingerprint: str,
+                  definitions: List[Dict], version: Any) -> Dict:
+    """Extract, split and check one file in a worker process, returning the document to insert"""
+    from app.services.document_service import build_document
+    from app.services.rule_engine import evaluate_document
+    from app.services.rule_pool import get_worker_rule_set
+
+    file_path = file_info.get("path") or local_path
+    document = build_document(local_path, file_info.get("filename") or os.path.basename(file_path)).to_dict()
+    # A retried file replaces nothing: its document was either never stored or
+    # is recognized by its ID
+    document["_id"] = task_id
+    # Recorded as uploaded, not as the temporary copy read on this host
+    document["file_path"] = file_path
+
+    rule_set = get_worker_rule_set(fingerprint, definitions, version)
+    _, update = evaluate_document(document, rule_set, incremental=False)
+    document.update(update)
+    return document
+
 
 class BulkProcessor:
     """Service for bulk processing of documents"""
-    
-    def __init__(self):
-        """Initialize bulk processor"""
-        self.max_workers = 2  # Maximum number of concurrent worker threads
-        self.workers = {}  # job_id -> worker thread
-    
-    def start_bulk_job(self, files: List[Dict[str, Any]], job_name: str = None) -> Dict[str, Any]:
+
+    def __init__(self, max_workers: int = None, write_batch_size: int = 100, store_files: bool = True,
+                 temp_folder: str = None):
+        """
+        Initialize bulk processor
+
+        Args:
+            max_workers: Worker processes running the files of all jobs
+                (defaults to the CPU count)
+            write_batch_size: Documents inserted per MongoDB write
+            store_files: Store file contents in GridFS for workers on other
+                hosts, instead of relying on a shared upload folder
+            temp_folder: Folder for copies of stored files (defaults to the
+                system temporary folder)
+        """
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.write_batch_size = write_batch_size
+        self.store_files = store_files
+        self.temp_folder = temp_folder
+        # Configuration the worker processes set up their services from
+        self.worker_settings = {}
+        self.worker_id = new_worker_id()
+        self._executor = None
+        self._scheduler = None
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._job_cycle = deque()  # IDs of jobs with files to claim, in round-robin order
+        self._jobs_checked_at = 0.0
+
+    def start_bulk_job(self, files: List[Dict[str, Any]], job_name: str = None,
+                       group_id: str = None) -> Dict[str, Any]:
         """
         Start a new bulk processing job
-        
+
         Args:
             files: List of file info dictionaries with path and metadata
             job_name: Optional name for the job
-            
+            group_id: Optional group or patient identifier the files belong to
+
         Returns:
             Job info dictionary with job_id
+
+        Raises:
+            ServiceUnavailableError: If no process runs bulk files
+            ValidationError: If a file cannot be read
         """
+        # Otherwise the job would be accepted and stay pending
+        if not get_job_queue().has_consumers(BULK_FILE_TASK):
+            raise ServiceUnavailableError(
+                "No bulk worker is running; start one with python -m app.worker or set BULK_WORKERS"
+            )
+
+        task_ids = [str(uuid.uuid4()) for _ in files]
+        self._store_files(files, task_ids)
+
         job_id = str(uuid.uuid4())
-        
-        # Create a job info record
-        job_info = {
-            "job_id": job_id,
+        job = {
+            "_id": job_id,
             "name": job_name or f"Bulk Job {job_id[:8]}",
-            "status": "pending",
+            "group_id": group_id,
             "created_at": datetime.now(),
-            "total_files": len(files),
-            "processed_files": 0,
-            "files": files,
-            "results": []
+            "total_files": len(files)
         }
-        
-        # Store job info
-        _active_jobs[job_id] = job_info
-        
-        # Start processing in a background thread
-        thread = threading.Thread(
-            target=self._process_job,
-            args=(job_id,),
-            daemon=True
-        )
-        self.workers[job_id] = thread
-        thread.start()
-        
+
+        # Store the job, then queue its files for any consuming process
+        mongo.db.bulk_jobs.insert_one(job)
+        get_job_queue().enqueue_many(BULK_FILE_TASK, files, group=job_id, task_ids=task_ids)
+
+        # Let a local scheduler pick the files up without waiting for its next check
+        self._jobs_checked_at = 0.0
+        self._wakeup.set()
+
+        job_info = self._job_info(job, {})
+        job_info.update(files=files, results=[])
         return job_info
-    
-    def _process_job(self, job_id: str) -> None:
+
+    def _store_files(self, files: List[Dict[str, Any]], task_ids: List[str]) -> None:
+        """Store the content of files to be queued, or check that workers can read them"""
+        bucket = self._bucket()
+        stored = []
+        try:
+            for file_info, task_id in zip(files, task_ids):
+                path = file_info["path"]
+                if not self.store_files:
+                    if not os.access(path, os.R_OK):
+                        raise ValidationError(f"Cannot read {file_info.get('filename') or path} at {path}")
+                    continue
+                try:
+                    with open(path, "rb") as f:
+                        bucket.put(f, _id=task_id, filename=file_info.get("filename") or os.path.basename(path))
+                except OSError as e:
+                    raise ValidationError(f"Cannot read {file_info.get('filename') or path}: {str(e)}")
+                stored.append(task_id)
+        except Exception:
+            for task_id in stored:
+                bucket.delete(task_id)
+            raise
+
+    def _local_copy(self, task: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Get a path this host can read a claimed file at
+
+        The stored content is preferred, since the file at the uploaded path
+        may have been replaced since the job was queued.
+
+        Returns:
+            The path, and whether it is a temporary copy of the stored content
+
+        Raises:
+            FileNotFoundError: If the file is neither readable nor stored
+        """
+        file_info = task["payload"]
+        path = file_info.get("path")
+        try:
+            content = self._bucket().get(task["_id"])
+        except gridfs.NoFile:
+            if path and os.access(path, os.R_OK):
+                return path, False
+            raise FileNotFoundError(
+                f"{file_info.get('filename') or path} is not readable at {path} on this host and its "
+                f"content is not stored with the job; workers need a shared upload folder or BULK_STORE_FILES"
+            )
+        suffix = os.path.splitext(file_info.get("filename") or path or "")[1]
+        fd, temp_path = tempfile.mkstemp(suffix=suffix, dir=self.temp_folder)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(content, f)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+        return temp_path, True
+
+    def _discard_content(self, task_ids: List[str]) -> None:
+        """Delete the stored content of files that are finished for good"""
+        bucket = self._bucket()
+        for task_id in task_ids:
+            try:
+                bucket.delete(task_id)
+            except PyMongoError as e:
+                logger.warning(f"Could not delete the stored content of bulk file {task_id}: {str(e)}")
+
+    @staticmethod
+    def _bucket() -> gridfs.GridFS:
+        return gridfs.GridFS(mongo.db, collection=BULK_FILES_BUCKET)
+
+    def start(self) -> None:
+        """Start claiming and processing queued files in a scheduler thread"""
+        if self._scheduler is not None and self._scheduler.is_alive():
+            return
+        self._stop.clear()
+        self._scheduler = threading.Thread(target=self._run_scheduler, name="bulk-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def stop(self, timeout: float = None) -> bool:
         """
-        Process all files in a job
-        
+        Stop claiming files, finish and store the claimed ones
+
         Args:
-            job_id: Job ID to process
+            timeout: Seconds to wait for the claimed files (None waits indefinitely)
+
+        Returns:
+            Whether all claimed files were finished in time
         """
-        logger.info(f"Starting job {job_id}")
-        
-        # Update job status
-        _active_jobs[job_id]["status"] = "processing"
-        
-        # Get files to process
-        files = _active_jobs[job_id]["files"]
-        
-        # Process each file
-        for file_info in files:
+        self._stop.set()
+        self._wakeup.set()
+        finished = True
+        if self._scheduler is not None:
+            self._scheduler.join(timeout)
+            finished = not self._scheduler.is_alive()
+            self._scheduler = None
+        return finished
+
+    def _run_scheduler(self) -> None:
+        """Feed claimed files to the worker pool and collect the finished documents"""
+        queue = get_job_queue()
+        in_flight = {}  # future -> task
+        pending_writes = []  # (document, task, result)
+        last_write = time.monotonic()
+        # Registers this process as a bulk consumer on the first pass
+        last_heartbeat = float("-inf")
+
+        while not self._stop.is_set() or in_flight:
+            try:
+                if not self._stop.is_set():
+                    self._submit_files(in_flight)
+
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=WRITE_INTERVAL, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._collect_result(future, in_flight.pop(future), pending_writes)
+                elif not pending_writes:
+                    self._wakeup.wait(WRITE_INTERVAL)
+                    self._wakeup.clear()
+
+                if pending_writes and (not in_flight or len(pending_writes) >= self.write_batch_size
+                                       or time.monotonic() - last_write >= WRITE_INTERVAL):
+                    self._write_documents(pending_writes)
+                    last_write = time.monotonic()
+
+                if time.monotonic() - last_heartbeat >= queue.lease_seconds / 3:
+                    task_ids = [task["_id"] for task in in_flight.values()]
+                    task_ids.extend(task["_id"] for _, task, _ in pending_writes)
+                    queue.heartbeat(task_ids, self.worker_id)
+                    if not self._stop.is_set():
+                        queue.register_consumer(self.worker_id, [BULK_FILE_TASK])
+                    last_heartbeat = time.monotonic()
+            except Exception:
+                # Files whose outcome is lost are run again once their leases expire
+                logger.exception("Bulk scheduler error")
+                self._stop.wait(WRITE_INTERVAL)
+
+        try:
+            queue.unregister_consumer(self.worker_id)
+        except PyMongoError as e:
+            logger.warning(f"Could not unregister the bulk consumer: {str(e)}")
+        self.shutdown()
+
+    def _submit_files(self, in_flight: Dict) -> None:
+        """Claim files round-robin across jobs, keeping each worker busy"""
+        from app.services.rule_engine import get_compiled_rule_set
+
+        while len(in_flight) < self.max_workers * 2:
+            try:
+                task = self._claim_file()
+            except PyMongoError as e:
+                logger.warning(f"Could not claim bulk files: {str(e)}")
+                return
+            if task is None:
+                return
+
+            file_info = task["payload"]
+            try:
+                local_path, temporary = self._local_copy(task)
+            except FileNotFoundError as e:
+                # Retrying on this or another host of the same setup cannot help
+                logger.error(str(e))
+                self._fail(task, e, retry=False)
+                continue
+            except Exception as e:
+                logger.error(f"Error fetching file {file_info.get('filename', 'unknown')}: {str(e)}")
+                self._fail(task, e)
+                continue
+            if temporary:
+                task["temp_path"] = local_path
+
             try:
-                # Process the file
-                logger.info(f"Processing file {file_info.get('filename', 'unknown')}")
-                
-                # In a real implementation, this would call document_service.process_document
-                # and then check_document_compliance
-                
-                # For this example, just simulate processing
-                import time
-                time.sleep(1)  # Simulate processing time
-                
-                # Add a mock result
-                _active_jobs[job_id]["results"].append({
-                    "filename": file_info.get("filename", "unknown"),
-                    "status": "success",
-                    "mock_result": True
-                })
-                
+                rule_set = get_compiled_rule_set(file_info.get("compliance_types") or DEFAULT_COMPLIANCE_TYPES)
+                future = self._get_executor().submit(
+                    _process_file, task["_id"], file_info, local_path, rule_set.fingerprint,
+                    rule_set.definitions, rule_set.version
+                )
             except Exception as e:
-                logger.error(f"Error processing file: {str(e)}")
-                
-                # Add error to results
-                _active_jobs[job_id]["results"].append({
-                    "filename": file_info.get("filename", "unknown"),
-                    "status": "error",
-                    "error": str(e)
-                })
-            
-            finally:
-                # Update processed count
-                _active_jobs[job_id]["processed_files"] += 1
-        
-        # Mark job as completed
-        _active_jobs[job_id]["status"] = "completed"
-        logger.info(f"Completed job {job_id}")
-    
-    def get_job_status(self, job_id: str) -> Dict[str, Any]:
+                logger.error(f"Error queueing file {file_info.get('filename', 'unknown')}: {str(e)}")
+                self._remove_copy(task)
+                self._fail(task, e)
+                continue
+            in_flight[future] = task
+
+    def _claim_file(self) -> Dict[str, Any]:
+        """Claim the next file of the job whose turn it is"""
+        queue = get_job_queue()
+        if not self._job_cycle or time.monotonic() - self._jobs_checked_at >= WRITE_INTERVAL:
+            # Add jobs started since the last check, including by other processes
+            self._job_cycle.extend(
+                job_id for job_id in queue.due_groups(BULK_FILE_TASK) if job_id not in self._job_cycle
+            )
+            self._jobs_checked_at = time.monotonic()
+
+        for _ in range(len(self._job_cycle)):
+            job_id = self._job_cycle.popleft()
+            task = queue.claim(self.worker_id, [BULK_FILE_TASK], {"group": job_id})
+            if task is not None:
+                self._job_cycle.append(job_id)
+                return task
+        return None
+
+    def _collect_result(self, future, task: Dict[str, Any], pending_writes: List) -> None:
+        """Queue a finished document for writing, or record why its file failed"""
+        self._remove_copy(task)
+        try:
+            document = future.result()
+        except Exception as e:
+            logger.error(f"Error processing file {task['payload'].get('filename', 'unknown')}: {str(e)}")
+            if isinstance(e, BrokenProcessPool):
+                # A worker died; later files get a fresh pool
+                self.shutdown()
+            self._fail(task, e)
+            return
+
+        result = {
+            "filename": task["payload"].get("filename", "unknown"),
+            "status": "success",
+            "document_id": document["_id"],
+            "compliance_score": document["compliance_score"],
+            "compliance_status": document["compliance_status"],
+            "issue_count": len(document["compliance_issues"])
+        }
+        pending_writes.append((document, task, result))
+
+    def _write_documents(self, pending_writes: List) -> None:
+        """Insert finished documents in unordered batch writes, then complete their files"""
+        queue = get_job_queue()
+        for start in range(0, len(pending_writes), self.write_batch_size):
+            batch = pending_writes[start:start + self.write_batch_size]
+            failed = {}
+            try:
+                mongo.db.documents.insert_many([document for document, _, _ in batch], ordered=False)
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    # A duplicate ID means an earlier attempt already stored the document
+                    if error.get("code") != DUPLICATE_KEY_ERROR:
+                        failed[error["index"]] = error.get("errmsg", "Write failed")
+            except PyMongoError as e:
+                logger.error(f"Error writing bulk documents: {str(e)}")
+                failed = {index: str(e) for index in range(len(batch))}
+
+            for index, error in failed.items():
+                self._fail(batch[index][1], error)
+            results = {
+                task["_id"]: result for index, (_, task, result) in enumerate(batch) if index not in failed
+            }
+            try:
+                queue.complete_many(results, self.worker_id)
+            except PyMongoError as e:
+                # The leases expire and the files are processed again
+                logger.error(f"Could not complete bulk files: {str(e)}")
+                continue
+            self._discard_content(list(results))
+        pending_writes.clear()
+
+    def _fail(self, task: Dict[str, Any], error, retry: bool = True) -> None:
+        try:
+            if not get_job_queue().fail(task, self.worker_id, str(error), retry=retry):
+                self._discard_content([task["_id"]])
+        except PyMongoError as e:
+            logger.error(f"Could not record a failed bulk file: {str(e)}")
+
+    @staticmethod
+    def _remove_copy(task: Dict[str, Any]) -> None:
+        temp_path = task.pop("temp_path", None)
+        if temp_path:
+            try:
+                os.unlink(temp_path)
+            except OSError as e:
+                logger.warning(f"Could not remove {temp_path}: {str(e)}")
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers start clean instead of inheriting the web
+            # process's database clients, locks and pools
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.worker_settings,)
+            )
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; they are restarted on next use"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_job_status(self, job_id: str, summary: bool = False) -> Dict[str, Any]:
         """
         Get status of a bulk processing job
-        
+
         Args:
             job_id: Job ID to check
-            
+            summary: Only return the counts, without the files and results
+
         Returns:
             Job info dictionary
         """
-        if job_id in _active_jobs:
-            return _active_jobs[job_id].copy()
-        else:
+        job = mongo.db.bulk_jobs.find_one({"_id": job_id})
+        if job is None:
             return {"error": "Job not found", "job_id": job_id}
+        if summary:
+            return self._job_info(job, get_job_queue().count_by_status(job_id))
+
+        files = []
+        results = []
+        counts = {}
+        for task in get_job_queue().find_group(job_id, {"payload": 1, "status": 1, "result": 1, "error": 1}):
+            files.append(task["payload"])
+            counts[task["status"]] = counts.get(task["status"], 0) + 1
+            if task["status"] in (COMPLETED, FAILED):
+                results.append(self._file_result(task))
+
+        job_info = self._job_info(job, counts)
+        job_info.update(files=files, results=results)
+        return job_info
+
+    def iter_job_events(self, job_id: str, after: int = 0, poll_interval: float = 1.0,
+                        max_seconds: float = None) -> Iterator[Tuple[str, int, Dict[str, Any]]]:
+        """
+        Follow the progress of a bulk processing job
+
+        Files are numbered in the order they finished. Each "file" event
+        carries the number up to which every file was sent, so a client that
+        reconnects resumes there: a file sent ahead of one that became
+        visible late may be sent again, but none is skipped. A number that
+        stays missing for a lease was never used and is passed over.
+
+        Args:
+            job_id: Job ID to follow
+            after: Number up to which files were already received
+            poll_interval: Seconds between checks for finished files
+            max_seconds: Optional seconds after which to stop following
+
+        Yields:
+            Tuples of event name, file number (None for other events) and data:
+                - "progress" with the job summary, first and after new files
+                - "file" with the result of each finished file
+                - "done" with the job summary once all files are finished
+                - None with no data when nothing changed during a poll
+                - "error" if the job does not exist
+        """
+        queue = get_job_queue()
+        job = mongo.db.bulk_jobs.find_one({"_id": job_id})
+        if job is None:
+            yield "error", None, {"error": "Job not found", "job_id": job_id}
+            return
+
+        deadline = None if max_seconds is None else time.monotonic() + max_seconds
+        projection = {"payload.filename": 1, "status": 1, "result": 1, "error": 1, "finish_seq": 1}
+        # Every file up to sent_through was sent; later ones sent so far are
+        # in ahead, and gap_since is when the file after sent_through was
+        # first found missing
+        sent_through = after
+        ahead = set()
+        gap_since = None
+
+        def catch_up():
+            nonlocal sent_through
+            while sent_through + 1 in ahead:
+                sent_through += 1
+                ahead.discard(sent_through)
+
+        def new_files():
+            nonlocal sent_through, gap_since
+            for task in queue.find_finished(job_id, sent_through, projection):
+                number = task["finish_seq"]
+                if number > sent_through and number not in ahead:
+                    ahead.add(number)
+                    catch_up()
+                    yield "file", sent_through, self._file_result(task)
+
+            if not ahead:
+                gap_since = None
+            elif gap_since is None:
+                gap_since = time.monotonic()
+            elif time.monotonic() - gap_since > queue.lease_seconds:
+                # The numbers were taken by finishes that did not apply
+                sent_through = min(ahead) - 1
+                catch_up()
+                gap_since = None
+
+        summary = self._job_info(job, queue.count_by_status(job_id))
+        yield "progress", None, summary
+
+        while True:
+            changed = False
+            for event in new_files():
+                changed = True
+                yield event
+
+            if changed or summary["status"] == "completed":
+                summary = self._job_info(job, queue.count_by_status(job_id))
+                if summary["status"] == "completed":
+                    # Files that finished after the query above
+                    yield from new_files()
+                    yield "done", None, summary
+                    return
+                yield "progress", None, summary
+            else:
+                yield None, None, None
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            time.sleep(poll_interval)
+
+    def list_jobs(self, limit: int = 10, skip: int = 0, group_id: str = None) -> List[Dict[str, Any]]:
+        """
+        List bulk processing jobs, newest first
+
+        Args:
+            limit: Maximum number of jobs to return
+            skip: Number of jobs to skip
+            group_id: Optional group or patient identifier to filter by
+
+        Returns:
+            Job info dictionaries without their files and results
+        """
+        query = {"group_id": group_id} if group_id else {}
+        jobs = mongo.db.bulk_jobs.find(query).sort("created_at", DESCENDING).skip(skip).limit(limit)
+        queue = get_job_queue()
+        return [self._job_info(job, queue.count_by_status(job["_id"])) for job in jobs]
+
+    @staticmethod
+    def _file_result(task: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the result of a finished file task"""
+        if task["status"] == COMPLETED:
+            return task["result"]
+        return {
+            "filename": task["payload"].get("filename", "unknown"),
+            "status": "error",
+            "error": task.get("error")
+        }
+
+    @staticmethod
+    def _job_info(job: Dict[str, Any], counts: Dict[str, int]) -> Dict[str, Any]:
+        """Build the job info of a stored job from the counts of its files by status"""
+        processed = counts.get(COMPLETED, 0) + counts.get(FAILED, 0)
+        if processed >= job["total_files"]:
+            status = "completed"
+        elif processed or counts.get(RUNNING):
+            status = "processing"
+        else:
+            status = "pending"
+        return {
+            "job_id": job["_id"],
+            "name": job["name"],
+            "group_id": job.get("group_id"),
+            "status": status,
+            "created_at": job["created_at"],
+            "total_files": job["total_files"],
+            "processed_files": processed,
+            "failed_files": counts.get(FAILED, 0)
+        }
 
 # Singleton instance
 _bulk_processor_instance = None
@@ -139,4 +632,39 @@ def get_bulk_processor():
     global _bulk_processor_instance
     if _bulk_processor_instance is None:
         _bulk_processor_instance = BulkProcessor()
-    return _bulk_processor_instance
\ No newline at end of file
+    return _bulk_processor_instance
+
+def init_bulk_processor(app) -> BulkProcessor:
+    """
+    Configure the bulk processor for the application
+
+    Args:
+        app: Flask application instance
+    """
+    processor = get_bulk_processor()
+    processor.stop()
+    processor.max_workers = app.config.get('BULK_WORKERS', processor.max_workers)
+    processor.write_batch_size = app.config.get('BULK_WRITE_BATCH_SIZE', 100)
+    processor.store_files = app.config.get('BULK_STORE_FILES', True)
+    processor.temp_folder = os.path.join(app.instance_path, 'temp')
+
+    settings = {
+        key: value for key, value in app.config.items()
+        if isinstance(value, (str, int, float, bool, type(None)))
+    }
+    settings.update(
+        INSTANCE_PATH=app.instance_path,
+        # Bulk workers already use every core; no nested pools inside them,
+        # OCR included, which runs tesseract in the worker itself
+        PDF_EXTRACTION_WORKERS=0,
+        PARALLEL_EVALUATION_WORKERS=0,
+        OCR_WORKERS=min(app.config.get('OCR_WORKERS', 2), 1),
+        OCR_IN_PROCESS=True,
+        # Verdicts are cached per worker; only the web process shares them
+        VERDICT_CACHE_PERSISTENT=False,
+    )
+    processor.worker_settings = settings
+
+    if app.config.get('QUEUE_CONSUMER_ENABLED', True) and processor.max_workers > 0:
+        processor.start()
+    return processor
@@ -0,0 +1,153 @@
+# app/services/extraction_cache.py
+
+"""
+Content-addressed cache of extraction results on local disk.
+
+Results are stored under the SHA-256 of the file bytes plus the extractor
+version, so uploading the same file again skips parsing entirely, whatever
+its name. Entries are JSON files (with MongoDB extended JSON for dates); the
+least recently used ones are evicted once the cache exceeds its size limit.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from bson import json_util
+
+logger = logging.getLogger(__name__)
+
+# Bytes read at a time when hashing files
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extraction results keyed by file content"""
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Initialize the extraction cache
+
+        Args:
+            directory: Directory holding the cached results
+            max_bytes: Total size of cached results above which the least
+                recently used ones are evicted
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def key_for(self, file_path: str, version: Any, file_content: bytes = None, variant: str = None) -> str:
+        """
+        Compute the cache key for a file
+
+        Args:
+            file_path: Path to the file, read when no content is given
+            version: Extractor version the result is produced by
+            file_content: Optional bytes content of the file
+            variant: Optional name of how the content is extracted (such as
+                the handler chosen for it), since the same bytes can be
+                extracted differently
+
+        Returns:
+            Hex digest identifying the file content and extractor version
+        """
+        digest = hashlib.sha256()
+        if file_content is not None:
+            digest.update(file_content)
+        else:
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                    digest.update(block)
+        if variant:
+            return f"{digest.hexdigest()}-{variant}-v{version}"
+        return f"{digest.hexdigest()}-v{version}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached extraction result
+
+        Args:
+            key: Cache key from key_for
+
+        Returns:
+            Extraction result, or None if not cached
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json_util.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {key}: {str(e)}")
+            self._remove(path)
+            return None
+
+        # Modification time records the last use for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """
+        Store an extraction result and evict old entries if over the size limit
+
+        Args:
+            key: Cache key from key_for
+            result: Extraction result
+        """
+        temp_path = None
+        try:
+            # Write to a temporary file first so readers never see partial entries
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json_util.dumps(result))
+            os.replace(temp_path, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache extraction result {key}: {str(e)}")
+            if temp_path:
+                self._remove(temp_path)
+            return
+
+        self._evict()
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    self._remove(entry.path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
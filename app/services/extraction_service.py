@@ -1,24 +1,174 @@
 # app/services/extraction_service.py
 
 import io
+import json
 import os
 import re
 import logging
 import csv
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Iterator, Tuple
 from datetime import datetime
 
-# Import existing dependencies
-from PyPDF2 import PdfReader
+from app.services.extraction_cache import ExtractionCache
+from app.services.ocr_service import OcrService, init_ocr_service
+from app.utils.file_types import resolve_extension, sniff_file
+from app.utils.pdf_utils import PdfDocument, PdfPagePool
+from app.utils.text_processing import normalize_text
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever extraction output changes so that cached results are not reused
+EXTRACTOR_VERSION = 6
+
+# Characters read at a time when streaming JSON files
+JSON_BLOCK_SIZE = 64 * 1024
+
+
+class _JsonStream:
+    """Reads JSON values one at a time from a text file"""
+
+    def __init__(self, f, block_size: int = JSON_BLOCK_SIZE):
+        self.f = f
+        self.block_size = block_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self, size: int) -> bool:
+        block = self.f.read(size)
+        if not block:
+            self.eof = True
+            return False
+        # Drop what has been consumed so the buffer only holds the current item
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ("" at the end)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read(self.block_size):
+                return ""
+
+    def take(self, expected: str) -> str:
+        """Consume the next character, which must be one of expected"""
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(f"Expected one of {expected!r} but found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        self.peek()
+        size = self.block_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                end = None
+            # A value reaching the end of the buffer may continue, and a
+            # number cut at "1." or "2e" decodes as 1 or 2, so numbers are only
+            # complete once a delimiter follows them
+            if end is not None and not self.eof and (
+                    end == len(self.buffer)
+                    or (self.buffer[self.pos] in "-0123456789" and self.buffer[end] not in " \t\n\r,]}")):
+                end = None
+            if end is not None:
+                self.pos = end
+                return value
+            # Read ever larger blocks so large items are not re-parsed too often
+            self._read(size)
+            size *= 2
+
+
+def _iter_json_top_level(f, block_size: int = JSON_BLOCK_SIZE) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Stream the top level of a JSON document
+
+    Args:
+        f: Text file positioned at the start of the document
+        block_size: Characters read at a time
+
+    Yields:
+        ("list", index, item) for top-level arrays, ("dict", key, value) for
+        top-level objects, or (None, None, value) for a scalar document
+    """
+    stream = _JsonStream(f, block_size)
+    char = stream.peek()
+    if char == "[":
+        stream.take("[")
+        if stream.peek() == "]":
+            stream.take("]")
+        else:
+            index = 0
+            while True:
+                yield "list", index, stream.value()
+                index += 1
+                if stream.take(",]") == "]":
+                    break
+    elif char == "{":
+        stream.take("{")
+        if stream.peek() == "}":
+            stream.take("}")
+        else:
+            while True:
+                if stream.peek() != '"':
+                    raise ValueError("Expected an object key")
+                key = stream.value()
+                stream.take(":")
+                yield "dict", key, stream.value()
+                if stream.take(",}") == "}":
+                    break
+    else:
+        yield None, None, stream.value()
+
+    if stream.peek():
+        raise ValueError("Extra data after the JSON document")
+
 
 class ExtractionService:
     """Service for extracting text from different document formats"""
 
-    def __init__(self):
-        """Initialize the extraction service"""
+    def __init__(self, pdf_workers: int = 0, pdf_parallel_min_pages: int = 100,
+                 cache: ExtractionCache = None, ocr: OcrService = None,
+                 table_chunk_rows: int = 1000, table_sample_rows: int = 100,
+                 xml_structure: bool = False, json_data: bool = False):
+        """
+        Initialize the extraction service
+
+        Args:
+            pdf_workers: Worker processes used to extract large PDFs (0 or 1
+                extracts in-process)
+            pdf_parallel_min_pages: Page count from which PDFs are extracted
+                across the workers
+            cache: Cache of extraction results keyed by file content
+            ocr: OCR service used for PDF pages without a text layer
+            table_chunk_rows: CSV or spreadsheet rows formatted into each
+                paragraph of text
+            table_sample_rows: Raw rows returned per CSV file or sheet (0
+                omits them)
+            xml_structure: Whether XML results include the nested element
+                structure, which is held in memory
+            json_data: Whether JSON results include the parsed data, which
+                is held in memory
+        """
+        self.pdf_pool = PdfPagePool(pdf_workers)
+        self.pdf_parallel_min_pages = pdf_parallel_min_pages
+        self.cache = cache
+        self.ocr = ocr
+        self.table_chunk_rows = table_chunk_rows
+        self.table_sample_rows = table_sample_rows
+        self.xml_structure = xml_structure
+        self.json_data = json_data
+
         # Load any necessary resources once at initialization
         self.supported_formats = {
             ".pdf": self.extract_from_pdf,
@@ -37,6 +187,17 @@ class ExtractionService:
             ".xml": self.extract_from_xml,
         }
 
+    @property
+    def pdf_workers(self) -> int:
+        """Worker processes used to extract large PDFs"""
+        return self.pdf_pool.max_workers
+
+    @pdf_workers.setter
+    def pdf_workers(self, value: int) -> None:
+        if value != self.pdf_pool.max_workers:
+            self.pdf_pool.shutdown()
+            self.pdf_pool.max_workers = value
+
     def extract_text(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
@@ -61,17 +222,59 @@ class ExtractionService:
             "extraction_time": datetime.now(),
         }
 
+        # Detect the actual format from the first bytes before any parsing
+        try:
+            detected = sniff_file(file_path, file_content)
+        except OSError as e:
+            logger.error(f"Error reading {file_path}: {str(e)}")
+            result["error"] = str(e)
+            return result
+        handled_ext = resolve_extension(detected, ext)
+        if handled_ext is None:
+            result["error"] = "File content is binary data in no supported format"
+            return result
+
+        cache_key = None
+        if self.cache is not None:
+            try:
+                # The same bytes give another result under another handler, and
+                # results of mislabelled or unsupported files mention the declared format
+                variant = handled_ext[1:] if handled_ext == ext else f"{handled_ext[1:]}.{ext[1:] or 'none'}"
+                cache_key = self.cache.key_for(file_path, EXTRACTOR_VERSION, file_content, variant=variant)
+            except OSError as e:
+                logger.warning(f"Could not hash {file_path} for the extraction cache: {str(e)}")
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    # Same bytes uploaded before, possibly under another name
+                    cached.update(
+                        filename=result["filename"],
+                        extraction_time=result["extraction_time"],
+                        cache_hit=True,
+                    )
+                    return cached
+
         try:
             # Check if we have a handler for this format
-            if ext in self.supported_formats:
-                handler = self.supported_formats[ext]
+            if handled_ext in self.supported_formats:
+                handler = self.supported_formats[handled_ext]
                 extracted_data = handler(file_path, file_content)
                 result.update(extracted_data)
+                if handled_ext != ext:
+                    # Mislabelled file, handled according to its content
+                    result["format"] = handled_ext[1:]
+                    result["metadata"]["declared_format"] = ext[1:]
+            elif detected != "text":
+                result["error"] = f"Unsupported file format: {ext}"
+                return result
             else:
                 # Try to read as text for unsupported formats
                 try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        text = f.read()
+                    if file_content:
+                        text = file_content.decode("utf-8", errors="ignore")
+                    else:
+                        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                            text = f.read()
                     result["text"] = text
                     result["metadata"][
                         "warning"
@@ -84,6 +287,9 @@ class ExtractionService:
             if "text" in result and result["text"]:
                 result["statistics"] = self._calculate_text_stats(result["text"])
 
+            if cache_key and "error" not in result:
+                self.cache.put(cache_key, result)
+
             return result
 
         except Exception as e:
@@ -105,98 +311,80 @@ class ExtractionService:
     ) -> Dict[str, Any]:
         """Extract text and metadata from PDF file"""
         try:
-            # Prepare file object
-            if file_content:
-                file_object = io.BytesIO(file_content)
-            else:
-                file_object = open(file_path, "rb")
+            with PdfDocument(file_path, file_content) as pdf:
+                metadata = pdf.metadata
 
-            # Try using PyMuPDF if available (better text extraction)
-            try:
-                import fitz  # PyMuPDF
-
-                doc = fitz.open(stream=file_object.read(), filetype="pdf")
-
-                # Extract text from each page
-                text = ""
+                # Pages are extracted one at a time and assembled once
                 page_texts = []
+                page_data = []
+                ocr_page_count = 0
+                for page in self._iter_pdf_pages(pdf, file_path, file_content):
+                    if page["text"]:
+                        page_texts.append(page["text"])
+                    if page["ocr"]:
+                        ocr_page_count += 1
+                    page_data.append(
+                        {
+                            "page_num": page["page_num"],
+                            "text_length": len(page["text"]),
+                            "start": page["start"],
+                            "end": page["end"],
+                            "ocr": page["ocr"],
+                        }
+                    )
+                if ocr_page_count:
+                    metadata["ocr_page_count"] = ocr_page_count
 
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    page_text = page.get_text()
-                    text += page_text + "\n\n"
-                    page_texts.append(page_text)
-
-                # Extract metadata
-                metadata = {
-                    "page_count": len(doc),
-                    "author": doc.metadata.get("author", ""),
-                    "title": doc.metadata.get("title", ""),
-                    "subject": doc.metadata.get("subject", ""),
-                    "creator": doc.metadata.get("creator", ""),
-                    "producer": doc.metadata.get("producer", ""),
-                    "creation_date": doc.metadata.get("creationDate", ""),
-                    "modification_date": doc.metadata.get("modDate", ""),
-                }
-
-                # Check for form fields (potential medical forms)
-                has_form = False
-                for page in doc:
-                    if page.widgets:
-                        has_form = True
-                        break
-                metadata["has_form"] = has_form
-
-                doc.close()
-
-                # Add page-level data
-                page_data = [
-                    {"page_num": i + 1, "text_length": len(page_text)}
-                    for i, page_text in enumerate(page_texts)
-                ]
-
-            except ImportError:
-                # Fallback to PyPDF2
-                file_object.seek(0)  # Reset file pointer
-
-                pdf_reader = PdfReader(file_object)
-
-                text = ""
-                page_texts = []
-
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    page_text = page.extract_text()
-                    text += page_text + "\n\n"
-                    page_texts.append(page_text)
-
-                # Extract metadata
-                metadata = {}
-                if pdf_reader.metadata:
-                    for key, value in pdf_reader.metadata.items():
-                        clean_key = key[1:] if key.startswith("/") else key
-                        metadata[clean_key] = value
-                metadata["page_count"] = len(pdf_reader.pages)
-
-                # Add page-level data
-                page_data = [
-                    {"page_num": i + 1, "text_length": len(page_text)}
-                    for i, page_text in enumerate(page_texts)
-                ]
-
-            # Close file if opened from path
-            if not file_content:
-                file_object.close()
-
-            # Clean up text
-            text = self._clean_text(text)
-
-            return {"text": text, "metadata": metadata, "pages": page_data}
+            return {"text": "\n\n".join(page_texts), "metadata": metadata, "pages": page_data}
 
         except Exception as e:
             logger.error(f"Error extracting from PDF: {str(e)}")
             raise
 
+    def iter_pdf_pages(
+        self, file_path: str, file_content: bytes = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Extract a PDF page by page
+
+        Args:
+            file_path: Path to the PDF file
+            file_content: Optional bytes content of the PDF file
+
+        Yields:
+            Dictionary per page with page_num, cleaned text, the start and
+            end character offsets of that text in the document text returned
+            by extract_from_pdf, and whether the text was recognized by OCR
+        """
+        with PdfDocument(file_path, file_content) as pdf:
+            yield from self._iter_pdf_pages(pdf, file_path, file_content)
+
+    def _iter_pdf_pages(
+        self, pdf: PdfDocument, file_path: str, file_content: bytes = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield cleaned pages of an open PDF with their offsets in the document text"""
+        page_count = pdf.page_count
+        if self.pdf_workers > 1 and page_count >= self.pdf_parallel_min_pages:
+            page_texts = self.pdf_pool.iter_page_texts(file_path, file_content, page_count)
+        else:
+            page_texts = pdf.iter_page_texts()
+
+        # Pages without a text layer are scanned images
+        if self.ocr is not None and self.ocr.enabled:
+            pages = self.ocr.fill_empty_pages(pdf, page_texts)
+        else:
+            pages = ((page_text, False) for page_text in page_texts)
+
+        offset = 0
+        for page_index, (page_text, ocr) in enumerate(pages):
+            page_text = self._clean_text(page_text)
+            if page_text and offset:
+                # Non-empty pages are separated by a blank line
+                offset += 2
+            start = offset
+            offset += len(page_text)
+            yield {"page_num": page_index + 1, "text": page_text, "start": start, "end": offset, "ocr": ocr}
+
     def extract_from_docx(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
@@ -443,100 +631,107 @@ class ExtractionService:
     def extract_from_csv(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
-        """Extract text from CSV file"""
+        """Extract text from CSV file, streaming rows into paragraphs"""
         try:
-            rows = []
-
-            if file_content:
-                content = file_content.decode("utf-8", errors="ignore")
-                rows = list(csv.reader(content.splitlines()))
-            else:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    reader = csv.reader(f)
-                    rows = list(reader)
-
-            # Convert CSV data to text
-            if rows:
-                headers = rows[0]
-
-                # Format as text
-                text = ""
-
-                # Add headers
-                text += ", ".join(headers) + "\n\n"
-
-                # Add rows
-                for row in rows[1:]:
-                    row_text = ""
-                    for i, cell in enumerate(row):
-                        if i < len(headers):
-                            row_text += f"{headers[i]}: {cell}, "
-                    text += row_text.rstrip(", ") + "\n"
-            else:
-                text = "Empty CSV file"
-
-            # Clean up text
-            text = self._clean_text(text)
-
-            return {
+            counts = {}
+            chunks = [
+                self._clean_text(chunk)
+                for chunk in self.iter_csv_chunks(file_path, file_content, counts=counts)
+            ]
+            text = "\n\n".join(chunk for chunk in chunks if chunk) or "Empty CSV file"
+
+            result = {
                 "text": text,
                 "metadata": {
                     "format": "csv",
-                    "row_count": len(rows) - 1 if rows else 0,
-                    "column_count": len(rows[0]) if rows else 0,
+                    "row_count": max(counts["rows"] - 1, 0),
+                    "column_count": counts["columns"],
                 },
-                "data": rows,
             }
+            if self.table_sample_rows:
+                # Only the first rows are kept raw; the text holds every row
+                result["data"] = counts["sample"]
+                result["metadata"]["data_sampled"] = counts["rows"] > len(counts["sample"])
+            return result
         except Exception as e:
             logger.error(f"Error extracting from CSV: {str(e)}")
             raise
 
+    def iter_csv_chunks(
+        self, file_path: str, file_content: bytes = None, counts: Dict[str, Any] = None
+    ) -> Iterator[str]:
+        """
+        Read a CSV file row by row and format it into text chunks
+
+        The header line is yielded first, then the rows formatted as
+        "header: value" pairs, table_chunk_rows rows per chunk.
+
+        Args:
+            file_path: Path to the CSV file
+            file_content: Optional bytes content of the file
+            counts: Optional dictionary filled with the number of rows
+                (including the header), the column count and a sample of
+                the first table_sample_rows raw rows
+
+        Yields:
+            Text of the header, then of each chunk of rows
+        """
+        if counts is None:
+            counts = {}
+        counts.update(rows=0, columns=0, sample=[])
+
+        if file_content:
+            f = io.TextIOWrapper(io.BytesIO(file_content), encoding="utf-8", errors="ignore", newline="")
+        else:
+            f = open(file_path, "r", encoding="utf-8", errors="ignore", newline="")
+
+        with f:
+            reader = csv.reader(f)
+            headers = next(reader, None)
+            if headers is None:
+                return
+            counts.update(rows=1, columns=len(headers))
+            if self.table_sample_rows:
+                counts["sample"].append(headers)
+            yield ", ".join(headers)
+
+            lines = []
+            for row in reader:
+                counts["rows"] += 1
+                if len(counts["sample"]) < self.table_sample_rows:
+                    counts["sample"].append(row)
+                lines.append(", ".join(f"{header}: {cell}" for header, cell in zip(headers, row)).rstrip(", "))
+                if len(lines) >= self.table_chunk_rows:
+                    yield "\n".join(lines)
+                    lines = []
+            if lines:
+                yield "\n".join(lines)
+
     def extract_from_xlsx(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
-        """Extract text from Excel XLSX file"""
+        """Extract text from Excel XLSX file, streaming rows into paragraphs"""
         try:
-            import openpyxl
-
-            # Load workbook
-            if file_content:
-                wb = openpyxl.load_workbook(
-                    io.BytesIO(file_content), read_only=True, data_only=True
-                )
-            else:
-                wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-
-            # Extract text from worksheets
-            text = ""
             sheet_data = {}
-
-            for sheet in wb:
-                sheet_text = f"Sheet: {sheet.title}\n\n"
-
-                # Extract cell values
-                rows = []
-                for row in sheet.iter_rows():
-                    row_values = [
-                        str(cell.value) if cell.value is not None else ""
-                        for cell in row
-                    ]
-                    rows.append(row_values)
-                    sheet_text += " | ".join(row_values) + "\n"
-
-                text += sheet_text + "\n\n"
-                sheet_data[sheet.title] = rows
+            counts = {}
+            text = "\n\n".join(
+                paragraph["text"]
+                for paragraph in self.iter_xlsx_paragraphs(file_path, file_content, sheet_data, counts)
+            )
 
             # Basic metadata
             metadata = {
                 "format": "xlsx",
-                "sheets": list(wb.sheetnames),
-                "sheet_count": len(wb.sheetnames),
+                "sheets": counts["sheets"],
+                "sheet_count": len(counts["sheets"]),
+                "row_count": counts["rows"],
             }
 
-            # Clean up text
-            text = self._clean_text(text)
-
-            return {"text": text, "metadata": metadata, "sheet_data": sheet_data}
+            result = {"text": text, "metadata": metadata}
+            if self.table_sample_rows:
+                # Only the first rows of each sheet are kept raw
+                result["sheet_data"] = sheet_data
+            return result
         except ImportError:
             # openpyxl not available
             return {
@@ -547,6 +742,70 @@ class ExtractionService:
             logger.error(f"Error processing Excel file: {str(e)}")
             raise
 
+    def iter_xlsx_paragraphs(
+        self, file_path: str, file_content: bytes = None,
+        sheet_data: Dict[str, List[List[str]]] = None, counts: Dict[str, Any] = None
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Read an Excel workbook row by row and emit paragraphs as it goes
+
+        Each sheet starts with a "Sheet: <title>" paragraph followed by
+        paragraphs of table_chunk_rows non-empty rows. The paragraphs can be
+        passed directly to stream_document_compliance.
+
+        Args:
+            file_path: Path to the Excel file
+            file_content: Optional bytes content of the file
+            sheet_data: Optional dictionary filled with the first
+                table_sample_rows raw rows of each sheet
+            counts: Optional dictionary filled with the sheet names and the
+                number of non-empty rows
+
+        Yields:
+            Paragraph dictionaries with id, text and sheet
+        """
+        import openpyxl
+
+        if sheet_data is None:
+            sheet_data = {}
+        if counts is None:
+            counts = {}
+        counts.update(sheets=[], rows=0)
+
+        wb = openpyxl.load_workbook(
+            io.BytesIO(file_content) if file_content else file_path, read_only=True, data_only=True
+        )
+        try:
+            paragraph_count = 0
+            for sheet in wb:
+                counts["sheets"].append(sheet.title)
+                sample = sheet_data[sheet.title] = []
+                paragraph_count += 1
+                yield {"id": f"p{paragraph_count}", "text": f"Sheet: {sheet.title}", "sheet": sheet.title}
+
+                lines = []
+                for values in sheet.iter_rows(values_only=True):
+                    # Read-only sheets often report trailing blank rows
+                    if all(value is None for value in values):
+                        continue
+                    row_values = ["" if value is None else str(value) for value in values]
+                    counts["rows"] += 1
+                    if len(sample) < self.table_sample_rows:
+                        sample.append(row_values)
+                    lines.append(" | ".join(row_values))
+                    if len(lines) >= self.table_chunk_rows:
+                        paragraph_count += 1
+                        yield {"id": f"p{paragraph_count}", "text": self._clean_text("\n".join(lines)),
+                               "sheet": sheet.title}
+                        lines = []
+                if lines:
+                    paragraph_count += 1
+                    yield {"id": f"p{paragraph_count}", "text": self._clean_text("\n".join(lines)),
+                           "sheet": sheet.title}
+        finally:
+            # Read-only workbooks keep the file open until closed
+            wb.close()
+
     def extract_from_pptx(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
@@ -699,45 +958,22 @@ class ExtractionService:
     def extract_from_json(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
-        """Extract text from JSON file"""
-        import json
-
+        """Extract text from JSON file, streaming top-level items"""
         try:
-            # Read content
-            if file_content:
-                data = json.loads(file_content.decode("utf-8", errors="ignore"))
-            else:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    data = json.load(f)
-
-            # Convert JSON to text
-            if isinstance(data, dict):
-                # Format dictionary as text
-                text = self._format_json_dict(data)
-            elif isinstance(data, list):
-                # Format list as text
-                text = ""
-                for i, item in enumerate(data):
-                    if isinstance(item, dict):
-                        text += f"Item {i+1}:\n{self._format_json_dict(item)}\n\n"
-                    else:
-                        text += f"Item {i+1}: {item}\n"
-            else:
-                # Just convert to string
-                text = str(data)
+            counts = {}
+            text = self._clean_text("\n\n".join(self.iter_json_paragraphs(file_path, file_content, counts)))
 
-            # Clean up text
-            text = self._clean_text(text)
-
-            return {
+            result = {
                 "text": text,
                 "metadata": {
                     "format": "json",
-                    "type": type(data).__name__,
-                    "data_size": len(json.dumps(data)),
+                    "type": counts["type"],
+                    "data_size": len(file_content) if file_content else os.path.getsize(file_path),
                 },
-                "data": data,  # Include the parsed JSON data
             }
+            if self.json_data:
+                result["data"] = counts["data"]  # Include the parsed JSON data
+            return result
         except Exception as e:
             logger.error(f"Error parsing JSON file: {str(e)}")
 
@@ -750,90 +986,95 @@ class ExtractionService:
 
             return {"text": content, "metadata": {"format": "json", "error": str(e)}}
 
+    def iter_json_paragraphs(
+        self, file_path: str, file_content: bytes = None, counts: Dict[str, Any] = None
+    ) -> Iterator[str]:
+        """
+        Parse a JSON file incrementally and emit a paragraph per top-level item
+
+        Items of a top-level array and keys of a top-level object are decoded
+        one at a time, so only the current item is held in memory.
+
+        Args:
+            file_path: Path to the JSON file
+            file_content: Optional bytes content of the file
+            counts: Optional dictionary filled with the type of the top-level
+                value and, if json_data is set, the parsed data
+
+        Yields:
+            Formatted text of each top-level item
+        """
+        if counts is None:
+            counts = {}
+        counts.update(type=None, data=None)
+
+        if file_content:
+            f = io.TextIOWrapper(io.BytesIO(file_content), encoding="utf-8", errors="ignore")
+        else:
+            f = open(file_path, "r", encoding="utf-8", errors="ignore")
+
+        with f:
+            for container, key, value in _iter_json_top_level(f):
+                if counts["type"] is None:
+                    counts["type"] = container or type(value).__name__
+                    if self.json_data:
+                        counts["data"] = {"list": [], "dict": {}}.get(container, value)
+                if self.json_data and container == "list":
+                    counts["data"].append(value)
+                elif self.json_data and container == "dict":
+                    counts["data"][key] = value
+
+                if container == "list":
+                    if isinstance(value, dict):
+                        yield f"Item {key + 1}:\n{self._format_json_dict(value)}"
+                    else:
+                        yield f"Item {key + 1}: {value}"
+                elif container == "dict":
+                    yield self._format_json_dict({key: value})
+                else:
+                    yield str(value)
+
     def _format_json_dict(self, data: Dict, prefix: str = "") -> str:
         """Helper to format JSON dictionary as readable text"""
-        text = ""
+        parts = []
+        self._append_json_dict(data, prefix, parts)
+        return "".join(parts)
+
+    def _append_json_dict(self, data: Dict, prefix: str, parts: List[str]) -> None:
         for key, value in data.items():
             if isinstance(value, dict):
-                text += (
-                    f"{prefix}{key}:\n{self._format_json_dict(value, prefix + '  ')}"
-                )
+                parts.append(f"{prefix}{key}:\n")
+                self._append_json_dict(value, prefix + "  ", parts)
             elif isinstance(value, list):
-                text += f"{prefix}{key}:\n"
+                parts.append(f"{prefix}{key}:\n")
                 for i, item in enumerate(value):
                     if isinstance(item, dict):
-                        text += f"{prefix}  Item {i+1}:\n{self._format_json_dict(item, prefix + '    ')}"
+                        parts.append(f"{prefix}  Item {i+1}:\n")
+                        self._append_json_dict(item, prefix + "    ", parts)
                     else:
-                        text += f"{prefix}  - {item}\n"
+                        parts.append(f"{prefix}  - {item}\n")
             else:
-                text += f"{prefix}{key}: {value}\n"
-        return text
+                parts.append(f"{prefix}{key}: {value}\n")
 
     def extract_from_xml(
         self, file_path: str, file_content: bytes = None
     ) -> Dict[str, Any]:
-        """Extract text from XML file"""
+        """Extract text from XML file, streaming elements as they close"""
         try:
-            import xml.etree.ElementTree as ET
-
-            # Parse XML
-            if file_content:
-                tree = ET.ElementTree(
-                    ET.fromstring(file_content.decode("utf-8", errors="ignore"))
-                )
-            else:
-                tree = ET.parse(file_path)
-
-            root = tree.getroot()
-
-            # Extract text by recursively processing elements
-            def extract_text_from_element(element, path=""):
-                current_path = path + "/" + element.tag
-                result = {
-                    "path": current_path,
-                    "text": element.text.strip() if element.text else "",
-                    "attributes": element.attrib,
-                    "children": [],
-                }
-
-                # Add children
-                for child in element:
-                    result["children"].append(
-                        extract_text_from_element(child, current_path)
-                    )
-
-                return result
-
-            # Build structured representation
-            xml_structure = extract_text_from_element(root)
-
-            # Convert to flat text
-            def structure_to_text(structure, indent=0):
-                text = " " * indent + structure["path"]
-                if structure["attributes"]:
-                    text += " " + str(structure["attributes"])
-                if structure["text"]:
-                    text += ": " + structure["text"]
-                text += "\n"
-
-                for child in structure["children"]:
-                    text += structure_to_text(child, indent + 2)
-
-                return text
-
-            text = structure_to_text(xml_structure)
-
-            # Clean up text
-            text = self._clean_text(text)
+            counts = {}
+            text = self._clean_text("\n".join(self.iter_xml_lines(file_path, file_content, counts)))
 
             # Extract basic metadata
             metadata = {
-                "root_tag": root.tag,
+                "root_tag": counts["root_tag"],
                 "format": "xml",
-                "element_count": len(root.findall(".//*")) + 1,  # +1 for root
+                "element_count": counts["elements"],
             }
 
-            return {"text": text, "metadata": metadata, "structure": xml_structure}
+            result = {"text": text, "metadata": metadata}
+            if self.xml_structure:
+                result["structure"] = counts["structure"]
+            return result
         except Exception as e:
             logger.error(f"Error parsing XML file: {str(e)}")
 
@@ -846,6 +1087,77 @@ class ExtractionService:
 
             return {"text": content, "metadata": {"format": "xml", "error": str(e)}}
 
+    def iter_xml_lines(
+        self, file_path: str, file_content: bytes = None, counts: Dict[str, Any] = None
+    ) -> Iterator[str]:
+        """
+        Parse an XML file incrementally and emit a line per element
+
+        Each line holds the element path, its attributes and its text, in
+        document order. Elements are cleared once processed, so memory does
+        not grow with the size of the file.
+
+        Args:
+            file_path: Path to the XML file
+            file_content: Optional bytes content of the file
+            counts: Optional dictionary filled with the root tag, the element
+                count and, if xml_structure is set, the nested structure
+
+        Yields:
+            Text line of each element
+        """
+        import xml.etree.ElementTree as ET
+
+        if counts is None:
+            counts = {}
+        counts.update(root_tag=None, elements=0, structure=None)
+
+        source = io.BytesIO(file_content) if file_content else file_path
+        # Open elements as (element, path, structure node, whether emitted)
+        stack = []
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if stack:
+                    parent = stack[-1]
+                    if not parent[3]:
+                        # The parent's text is complete once its first child starts
+                        yield self._xml_line(parent[0], parent[1], parent[2])
+                        parent[3] = True
+                    path = parent[1] + "/" + element.tag
+                else:
+                    path = "/" + element.tag
+                    counts["root_tag"] = element.tag
+
+                node = None
+                if self.xml_structure:
+                    node = {"path": path, "text": "", "attributes": dict(element.attrib), "children": []}
+                    if stack:
+                        stack[-1][2]["children"].append(node)
+                    else:
+                        counts["structure"] = node
+                stack.append([element, path, node, False])
+            else:
+                _, path, node, emitted = stack.pop()
+                if not emitted:
+                    yield self._xml_line(element, path, node)
+                counts["elements"] += 1
+                element.clear()
+                if stack:
+                    # Drop the processed child; the parent's line is already out
+                    stack[-1][0].clear()
+
+    def _xml_line(self, element, path: str, node: Dict[str, Any] = None) -> str:
+        """Format the line of an XML element, filling its structure node"""
+        text = element.text.strip() if element.text else ""
+        if node is not None:
+            node["text"] = text
+        line = path
+        if element.attrib:
+            line += " " + str(element.attrib)
+        if text:
+            line += ": " + text
+        return line
+
     def _clean_text(self, text: str) -> str:
         """
         Clean text with common processing steps
@@ -856,22 +1168,7 @@ class ExtractionService:
         Returns:
             Cleaned text
         """
-        if not text:
-            return ""
-
-        # Replace multiple newlines with a single one
-        text = re.sub(r"\n{3,}", "\n\n", text)
-
-        # Replace multiple spaces with a single one
-        text = re.sub(r" {2,}", " ", text)
-
-        # Remove null bytes
-        text = text.replace("\x00", "")
-
-        # Remove control characters (except newlines and tabs)
-        text = re.sub(r"[\x01-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
-
-        return text.strip()
+        return normalize_text(text)
 
 
 # Singleton instance
@@ -891,6 +1188,31 @@ def get_extraction_service() -> ExtractionService:
     return _extraction_service_instance
 
 
+def init_extraction_service(app) -> ExtractionService:
+    """
+    Configure the extraction service for the application
+
+    Args:
+        app: Flask application instance
+    """
+    service = get_extraction_service()
+    service.pdf_workers = app.config.get("PDF_EXTRACTION_WORKERS", 0)
+    service.pdf_parallel_min_pages = app.config.get("PDF_PARALLEL_MIN_PAGES", 100)
+    if app.config.get("EXTRACTION_CACHE_ENABLED", True):
+        service.cache = ExtractionCache(
+            app.config.get("EXTRACTION_CACHE_DIR") or os.path.join(app.instance_path, "extraction_cache"),
+            max_bytes=app.config.get("EXTRACTION_CACHE_MAX_BYTES", 512 * 1024 * 1024),
+        )
+    else:
+        service.cache = None
+    service.table_chunk_rows = app.config.get("TABLE_CHUNK_ROWS", 1000)
+    service.table_sample_rows = app.config.get("TABLE_DATA_SAMPLE_ROWS", 100)
+    service.xml_structure = app.config.get("XML_INCLUDE_STRUCTURE", False)
+    service.json_data = app.config.get("JSON_INCLUDE_DATA", False)
+    service.ocr = init_ocr_service(app) if app.config.get("OCR_ENABLED", True) else None
+    return service
+
+
 def extract_document_text(file_path: str, file_content: bytes = None) -> Tuple[str, List[Dict[str, str]]]:
     """
     Extract text content from a document file.
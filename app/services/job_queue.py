@@ -0,0 +1,721 @@
+# app/services/job_queue.py
+
+"""
+Durable task queue in the task_queue collection.
+
+Work that outlives a request (bulk ingestion files, background tasks) is
+stored as a task document, so it survives restarts and any process can
+report its status. Workers claim tasks atomically with find_one_and_update
+and hold them under a lease that they renew with heartbeats while the task
+runs. A task whose worker died is claimed again once its lease expires, and
+a failed task is retried with exponential backoff until it runs out of
+attempts. Adding worker processes or nodes adds throughput.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.extensions import mongo
+
+logger = logging.getLogger(__name__)
+
+# Task statuses
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Handlers run by QueueConsumer, by task kind
+_handlers = {}  # kind -> handler(task) -> result
+
+# The task run by the current consumer thread
+_context = threading.local()
+
+
+class TaskCancelled(Exception):
+    """Raised inside a task to stop it after cancellation or timeout"""
+
+
+def register_handler(kind: str, handler: Callable[[Dict[str, Any]], Any]) -> None:
+    """
+    Register the function that runs tasks of a kind
+
+    Args:
+        kind: Task kind
+        handler: Function called with the claimed task document, whose
+            return value is stored as the task result
+    """
+    _handlers[kind] = handler
+
+
+def new_worker_id() -> str:
+    """Get a worker ID that is unique across processes and hosts"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def is_cancelled() -> bool:
+    """Whether the task run by the current thread was cancelled or timed out"""
+    running = getattr(_context, "task", None)
+    return running is not None and running.cancelled.is_set()
+
+
+def raise_if_cancelled() -> None:
+    """
+    Stop the task run by the current thread if it was cancelled or timed out
+
+    Raises:
+        TaskCancelled: If the task should stop
+    """
+    if is_cancelled():
+        raise TaskCancelled("Task was cancelled")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueue:
+    """Task queue with atomic claims, leases and retries backed by MongoDB"""
+
+    def __init__(self, lease_seconds: float = 60, max_attempts: int = 3,
+                 retry_delay: float = 5, max_retry_delay: float = 300):
+        """
+        Initialize the job queue
+
+        Args:
+            lease_seconds: Seconds a claimed task stays owned without a heartbeat
+            max_attempts: Runs of a task before it is marked failed
+            retry_delay: Seconds before the first retry, doubled for each further one
+            max_retry_delay: Upper bound of the delay between retries
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+
+    @property
+    def collection(self):
+        return mongo.db.task_queue
+
+    @property
+    def consumers(self):
+        return mongo.db.queue_consumers
+
+    @property
+    def counters(self):
+        return mongo.db.task_queue_counters
+
+    def ensure_indexes(self) -> None:
+        """Create the indexes claims and status queries rely on"""
+        self.collection.create_index([("kind", ASCENDING), ("status", ASCENDING), ("run_at", ASCENDING)])
+        self.collection.create_index([("status", ASCENDING), ("lease_expires", ASCENDING)])
+        self.collection.create_index([("group", ASCENDING), ("position", ASCENDING)])
+        self.collection.create_index([("group", ASCENDING), ("finish_seq", ASCENDING)])
+        # Consumers that stopped without unregistering are dropped after a day
+        self.consumers.create_index("seen_at", expireAfterSeconds=86400)
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], group: str = None, task_id: str = None,
+                timeout: float = None) -> str:
+        """
+        Add a task to the queue
+
+        Args:
+            kind: Task kind, selecting what runs it
+            payload: BSON-serializable task arguments
+            group: Optional ID of the job the task belongs to
+            task_id: Optional task ID (generated when omitted)
+            timeout: Optional seconds a run may take before it is failed
+
+        Returns:
+            Task ID
+        """
+        return self.enqueue_many(kind, [payload], group, [task_id] if task_id else None, timeout)[0]
+
+    def enqueue_many(self, kind: str, payloads: List[Dict[str, Any]], group: str = None,
+                     task_ids: List[str] = None, timeout: float = None) -> List[str]:
+        """
+        Add tasks to the queue in one write
+
+        Args:
+            kind: Task kind, selecting what runs them
+            payloads: BSON-serializable arguments of each task
+            group: Optional ID of the job the tasks belong to
+            task_ids: Optional task IDs, one per payload
+            timeout: Optional seconds a run may take before it is failed
+
+        Returns:
+            Task IDs, in payload order
+        """
+        now = _now()
+        tasks = [
+            {
+                "_id": task_ids[position] if task_ids else str(uuid.uuid4()),
+                "kind": kind,
+                "group": group,
+                "position": position,
+                "payload": payload,
+                "status": PENDING,
+                "attempts": 0,
+                "max_attempts": self.max_attempts,
+                "timeout": timeout,
+                "run_at": now,
+                "created_at": now,
+                "progress": 0
+            }
+            for position, payload in enumerate(payloads)
+        ]
+        if tasks:
+            self.collection.insert_many(tasks, ordered=False)
+        return [task["_id"] for task in tasks]
+
+    def claim(self, worker_id: str, kinds: Iterable[str], query: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the next due task
+
+        Pending tasks whose retry time has come are claimed oldest first, as
+        are running tasks whose lease expired because their worker died.
+
+        Args:
+            worker_id: ID of the claiming worker
+            kinds: Task kinds the worker runs
+            query: Optional extra filter, e.g. on the task group
+
+        Returns:
+            The claimed task document, or None if no task is due
+        """
+        while True:
+            now = _now()
+            task = self.collection.find_one_and_update(
+                {
+                    "kind": {"$in": list(kinds)},
+                    "$or": [
+                        {"status": PENDING, "run_at": {"$lte": now}},
+                        {"status": RUNNING, "lease_expires": {"$lt": now}}
+                    ],
+                    **(query or {})
+                },
+                {
+                    "$set": {
+                        "status": RUNNING,
+                        "lease_owner": worker_id,
+                        "lease_expires": now + timedelta(seconds=self.lease_seconds),
+                        "started_at": now
+                    },
+                    "$inc": {"attempts": 1}
+                },
+                sort=[("run_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+            if task is None or task["attempts"] <= task["max_attempts"]:
+                return task
+
+            # The last attempt's worker died without reporting
+            self._finish(task["_id"], worker_id, FAILED, error="Worker lost while running the task")
+
+    def heartbeat(self, task_ids: Iterable[str], worker_id: str) -> None:
+        """
+        Extend the leases of running tasks
+
+        Args:
+            task_ids: IDs of tasks the worker is running
+            worker_id: ID of the worker holding the leases
+        """
+        task_ids = list(task_ids)
+        if task_ids:
+            self.collection.update_many(
+                {"_id": {"$in": task_ids}, "status": RUNNING, "lease_owner": worker_id},
+                {"$set": {"lease_expires": _now() + timedelta(seconds=self.lease_seconds)}}
+            )
+
+    def complete(self, task_id: str, worker_id: str, result: Any = None) -> bool:
+        """
+        Mark a task completed
+
+        Args:
+            task_id: Task ID
+            worker_id: ID of the worker holding the lease
+            result: BSON-serializable task result
+
+        Returns:
+            Whether the worker still held the task
+        """
+        return self._finish(task_id, worker_id, COMPLETED, result=result)
+
+    def complete_many(self, results: Dict[str, Any], worker_id: str) -> None:
+        """
+        Mark tasks completed in one write
+
+        Args:
+            results: Mapping of task ID to BSON-serializable task result
+            worker_id: ID of the worker holding the leases
+        """
+        if not results:
+            return
+        groups = {}
+        for task in self.collection.find(
+            {"_id": {"$in": list(results)}, "status": RUNNING, "lease_owner": worker_id}, {"group": 1}
+        ):
+            groups.setdefault(task.get("group"), []).append(task["_id"])
+
+        now = _now()
+        updates = []
+        for group, task_ids in groups.items():
+            first = self._reserve_finish_seqs(group, len(task_ids))
+            for offset, task_id in enumerate(task_ids):
+                update = {"status": COMPLETED, "result": results[task_id], "finished_at": now, "progress": 100}
+                if first is not None:
+                    update["finish_seq"] = first + offset
+                updates.append(UpdateOne(
+                    {"_id": task_id, "status": RUNNING, "lease_owner": worker_id},
+                    {"$set": update, "$unset": {"lease_owner": "", "lease_expires": ""}}
+                ))
+        if updates:
+            self.collection.bulk_write(updates, ordered=False)
+
+    def fail(self, task: Dict[str, Any], worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed run, scheduling a retry if attempts remain
+
+        Args:
+            task: Claimed task document
+            worker_id: ID of the worker holding the lease
+            error: Error message
+            retry: Whether another run could succeed
+
+        Returns:
+            True if the task will be retried, False if it failed for good
+        """
+        attempts = task.get("attempts", 1)
+        if not retry or attempts >= task.get("max_attempts", self.max_attempts):
+            self._finish(task["_id"], worker_id, FAILED, error=error)
+            return False
+
+        delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+        self.collection.update_one(
+            {"_id": task["_id"], "status": RUNNING, "lease_owner": worker_id},
+            {"$set": {"status": PENDING, "error": error, "run_at": _now() + timedelta(seconds=delay)},
+             "$unset": {"lease_owner": "", "lease_expires": ""}}
+        )
+        logger.warning(f"Task {task['_id']} failed (attempt {attempts}), retrying in {delay:g}s: {error}")
+        return True
+
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancel a task
+
+        A pending task is never run. A running task is asked to stop, which
+        takes effect when it next checks is_cancelled().
+
+        Args:
+            task_id: Task ID
+
+        Returns:
+            Whether the task was pending or running
+        """
+        task = self.collection.find_one({"_id": task_id, "status": PENDING}, {"group": 1})
+        if task is not None:
+            update = {"status": CANCELLED, "finished_at": _now()}
+            finish_seq = self._reserve_finish_seqs(task.get("group"))
+            if finish_seq is not None:
+                update["finish_seq"] = finish_seq
+            outcome = self.collection.update_one({"_id": task_id, "status": PENDING}, {"$set": update})
+            if outcome.modified_count:
+                return True
+        outcome = self.collection.update_one(
+            {"_id": task_id, "status": RUNNING},
+            {"$set": {"cancel_requested": True}}
+        )
+        return outcome.matched_count == 1
+
+    def cancelled(self, task_id: str, worker_id: str) -> bool:
+        """
+        Mark a running task cancelled once it stopped
+
+        Args:
+            task_id: Task ID
+            worker_id: ID of the worker holding the lease
+
+        Returns:
+            Whether the worker still held the task
+        """
+        return self._finish(task_id, worker_id, CANCELLED, error="Task was cancelled")
+
+    def cancel_requested(self, task_ids: Iterable[str]) -> List[str]:
+        """Get which of the given running tasks were asked to stop"""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        return [task["_id"] for task in self.collection.find(
+            {"_id": {"$in": task_ids}, "cancel_requested": True}, {"_id": 1}
+        )]
+
+    def count_pending(self, kind: str) -> int:
+        """Count the tasks of a kind waiting to be claimed"""
+        return self.collection.count_documents({"kind": kind, "status": PENDING})
+
+    def expire_finished(self, kind: str, ttl: float) -> None:
+        """
+        Let MongoDB delete finished tasks of a kind automatically
+
+        Args:
+            kind: Task kind
+            ttl: Seconds after which finished tasks are deleted (0 keeps them)
+        """
+        name = f"{kind}_ttl"
+        if not ttl:
+            if name in self.collection.index_information():
+                self.collection.drop_index(name)
+            return
+        options = {"expireAfterSeconds": int(ttl)}
+        try:
+            self.collection.create_index(
+                "finished_at", name=name, partialFilterExpression={"kind": kind}, **options
+            )
+        except OperationFailure:
+            # The index exists with another TTL
+            mongo.db.command("collMod", self.collection.name, index={"name": name, **options})
+
+    def set_progress(self, task_id: str, progress: float) -> None:
+        """
+        Record the progress of a running task
+
+        Args:
+            task_id: Task ID
+            progress: Progress value (0-100)
+        """
+        self.collection.update_one({"_id": task_id}, {"$set": {"progress": progress}})
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get a task document by ID"""
+        return self.collection.find_one({"_id": task_id})
+
+    def count_by_status(self, group: str) -> Dict[str, int]:
+        """
+        Count the tasks of a group by status
+
+        Args:
+            group: Job ID the tasks belong to
+
+        Returns:
+            Mapping of status to task count
+        """
+        return {
+            row["_id"]: row["count"]
+            for row in self.collection.aggregate([
+                {"$match": {"group": group}},
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+            ])
+        }
+
+    def find_group(self, group: str, projection: Dict[str, Any] = None):
+        """
+        Get the tasks of a group in the order they were enqueued
+
+        Args:
+            group: Job ID the tasks belong to
+            projection: Optional fields to return
+
+        Returns:
+            Cursor over the task documents
+        """
+        return self.collection.find({"group": group}, projection).sort("position", ASCENDING)
+
+    def find_finished(self, group: str, after: int = 0, projection: Dict[str, Any] = None):
+        """
+        Get the finished tasks of a group in the order they finished
+
+        Each task of a group is numbered from 1 in the update that finishes
+        it. Numbers are taken just before that update, so a task can become
+        visible shortly after one with a higher number, and a number whose
+        update did not apply (the lease was lost) is never used.
+
+        Args:
+            group: Job ID the tasks belong to
+            after: Finish number after which to return tasks
+            projection: Optional fields to return
+
+        Returns:
+            Cursor over the task documents, by finish number
+        """
+        query = {"group": group, "finish_seq": {"$gt": after}}
+        return self.collection.find(query, projection).sort("finish_seq", ASCENDING)
+
+    def due_groups(self, kind: str) -> List[str]:
+        """Get the groups that have tasks of a kind waiting to be claimed"""
+        now = _now()
+        return [group for group in self.collection.distinct("group", {
+            "kind": kind,
+            "$or": [
+                {"status": PENDING, "run_at": {"$lte": now}},
+                {"status": RUNNING, "lease_expires": {"$lt": now}}
+            ]
+        }) if group is not None]
+
+    def register_consumer(self, worker_id: str, kinds: Iterable[str]) -> None:
+        """
+        Record that a worker is consuming tasks of some kinds
+
+        Workers call this again at least once per lease to stay registered.
+
+        Args:
+            worker_id: ID of the worker
+            kinds: Task kinds the worker claims
+        """
+        self.consumers.update_one(
+            {"_id": worker_id},
+            {"$set": {"kinds": list(kinds), "seen_at": _now()}},
+            upsert=True
+        )
+
+    def unregister_consumer(self, worker_id: str) -> None:
+        """Record that a worker stopped consuming tasks"""
+        self.consumers.delete_one({"_id": worker_id})
+
+    def has_consumers(self, kind: str) -> bool:
+        """Whether a worker registered within the last lease consumes tasks of a kind"""
+        return self.consumers.find_one({
+            "kinds": kind,
+            "seen_at": {"$gte": _now() - timedelta(seconds=self.lease_seconds)}
+        }, {"_id": 1}) is not None
+
+    def purge(self, max_age: float, kind: str = None) -> int:
+        """
+        Delete finished tasks
+
+        Args:
+            max_age: Seconds after which finished tasks are deleted
+            kind: Optional task kind to restrict the deletion to
+
+        Returns:
+            Number of deleted tasks
+        """
+        query = {
+            "status": {"$in": [COMPLETED, FAILED, CANCELLED]},
+            "finished_at": {"$lt": _now() - timedelta(seconds=max_age)}
+        }
+        if kind is not None:
+            query["kind"] = kind
+        return self.collection.delete_many(query).deleted_count
+
+    def _finish(self, task_id: str, worker_id: str, status: str, result: Any = None, error: str = None) -> bool:
+        owned = {"_id": task_id, "status": RUNNING, "lease_owner": worker_id}
+        task = self.collection.find_one(owned, {"group": 1})
+        if task is None:
+            return False
+        update = {"status": status, "finished_at": _now()}
+        finish_seq = self._reserve_finish_seqs(task.get("group"))
+        if finish_seq is not None:
+            update["finish_seq"] = finish_seq
+        if status == COMPLETED:
+            update.update(result=result, progress=100)
+        else:
+            update["error"] = error
+        outcome = self.collection.update_one(
+            owned, {"$set": update, "$unset": {"lease_owner": "", "lease_expires": ""}}
+        )
+        return outcome.modified_count == 1
+
+    def _reserve_finish_seqs(self, group: Optional[str], count: int = 1) -> Optional[int]:
+        """Take the next finish numbers of a group, returning the first (None without a group)"""
+        if group is None:
+            return None
+        counter = self.counters.find_one_and_update(
+            {"_id": group}, {"$inc": {"finished": count}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return counter["finished"] - count + 1
+
+
+class _RunningTask:
+    """A task run by a consumer thread, with the signal asking it to stop"""
+
+    def __init__(self, task: Dict[str, Any]):
+        self.task = task
+        self.cancelled = threading.Event()
+        self.timed_out = False
+        timeout = task.get("timeout")
+        self.deadline = time.monotonic() + timeout if timeout else None
+
+
+class QueueConsumer:
+    """Threads that claim tasks of the registered kinds and run their handlers"""
+
+    def __init__(self, queue: JobQueue, threads: int = 4, poll_interval: float = 1.0):
+        """
+        Initialize the consumer
+
+        Args:
+            queue: Queue to claim tasks from
+            threads: Tasks run concurrently
+            poll_interval: Seconds to wait before polling an empty queue again,
+                and between checks for cancelled and timed out tasks
+        """
+        self.queue = queue
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.worker_id = new_worker_id()
+        self._running = {}  # task_id -> _RunningTask
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers = []
+        self._monitor_thread = None
+
+    def start(self) -> None:
+        """Start the consumer threads and the thread monitoring their tasks"""
+        if self._workers:
+            return
+        self._stop.clear()
+        for index in range(self.threads):
+            thread = threading.Thread(target=self._run, name=f"queue-consumer-{index}", daemon=True)
+            thread.start()
+            self._workers.append(thread)
+        self._monitor_thread = threading.Thread(target=self._monitor, name="queue-monitor", daemon=True)
+        self._monitor_thread.start()
+
+    def stop(self, timeout: float = None) -> bool:
+        """
+        Stop claiming tasks and wait for the running ones to finish
+
+        Args:
+            timeout: Seconds to wait in total (None waits indefinitely)
+
+        Returns:
+            Whether all running tasks finished in time
+        """
+        self._stop.set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._workers:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+        finished = not any(thread.is_alive() for thread in self._workers)
+        self._workers = []
+        if finished and self._monitor_thread is not None:
+            self._monitor_thread.join()
+        self._monitor_thread = None
+        return finished
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                task = self.queue.claim(self.worker_id, list(_handlers))
+            except PyMongoError as e:
+                logger.warning(f"Could not claim a task: {str(e)}")
+                task = None
+            if task is None:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            running = _RunningTask(task)
+            with self._lock:
+                self._running[task["_id"]] = running
+            _context.task = running
+            try:
+                result = _handlers[task["kind"]](task)
+            except TaskCancelled:
+                if not running.timed_out:
+                    self._report(self.queue.cancelled, task["_id"], self.worker_id)
+            except Exception as e:
+                logger.exception(f"Task {task['_id']} failed")
+                if not running.timed_out:
+                    self._report(self.queue.fail, task, self.worker_id, str(e))
+            else:
+                # A timed out task was already failed and may be running again
+                if not running.timed_out:
+                    self._report(self.queue.complete, task["_id"], self.worker_id, result)
+            finally:
+                _context.task = None
+                with self._lock:
+                    self._running.pop(task["_id"], None)
+
+    def _report(self, method, *args) -> None:
+        try:
+            method(*args)
+        except PyMongoError as e:
+            # The lease expires and the task is run again
+            logger.error(f"Could not record the outcome of a task: {str(e)}")
+
+    def _monitor(self) -> None:
+        """Time out tasks, pass on cancellations and renew leases until all tasks are done"""
+        last_heartbeat = time.monotonic()
+        workers = list(self._workers)
+        while not self._stop.is_set() or any(thread.is_alive() for thread in workers):
+            time.sleep(min(self.poll_interval, self.queue.lease_seconds / 3))
+            with self._lock:
+                running = {task_id: task for task_id, task in self._running.items() if not task.timed_out}
+
+            now = time.monotonic()
+            for task_id, task in list(running.items()):
+                if task.deadline is not None and now >= task.deadline:
+                    # Threads cannot be killed; the task is failed now and asked to stop
+                    task.timed_out = True
+                    task.cancelled.set()
+                    del running[task_id]
+                    logger.warning(f"Task {task_id} timed out after {task.task['timeout']:g}s")
+                    self._report(self.queue.fail, task.task, self.worker_id,
+                                 f"Timed out after {task.task['timeout']:g}s")
+
+            try:
+                for task_id in self.queue.cancel_requested(running):
+                    running[task_id].cancelled.set()
+                if now - last_heartbeat >= self.queue.lease_seconds / 3:
+                    self.queue.heartbeat(running, self.worker_id)
+                    last_heartbeat = now
+            except PyMongoError as e:
+                logger.warning(f"Could not renew task leases: {str(e)}")
+
+
+# Singleton instances
+_job_queue_instance = None
+_queue_consumer_instance = None
+
+
+def get_job_queue() -> JobQueue:
+    """Get or create the job queue singleton instance"""
+    global _job_queue_instance
+    if _job_queue_instance is None:
+        _job_queue_instance = JobQueue()
+    return _job_queue_instance
+
+
+def get_queue_consumer() -> QueueConsumer:
+    """Get or create the queue consumer singleton instance"""
+    global _queue_consumer_instance
+    if _queue_consumer_instance is None:
+        _queue_consumer_instance = QueueConsumer(get_job_queue())
+    return _queue_consumer_instance
+
+
+def init_job_queue(app) -> JobQueue:
+    """
+    Configure the job queue for the application
+
+    Args:
+        app: Flask application instance
+    """
+    queue = get_job_queue()
+    queue.lease_seconds = app.config.get('QUEUE_LEASE_SECONDS', 60)
+    queue.max_attempts = app.config.get('QUEUE_MAX_ATTEMPTS', 3)
+    queue.retry_delay = app.config.get('QUEUE_RETRY_DELAY', 5)
+    queue.max_retry_delay = app.config.get('QUEUE_MAX_RETRY_DELAY', 300)
+    try:
+        queue.ensure_indexes()
+    except PyMongoError as e:
+        logger.warning(f"Could not create task queue indexes: {str(e)}")
+
+    consumer = get_queue_consumer()
+    consumer.stop()
+    consumer.threads = app.config.get('QUEUE_CONSUMER_THREADS', 4)
+    consumer.poll_interval = app.config.get('QUEUE_POLL_INTERVAL', 1.0)
+    if app.config.get('QUEUE_CONSUMER_ENABLED', True) and consumer.threads > 0:
+        # Registers the background task handler
+        from app.utils import background_tasks  # noqa: F401
+        consumer.start()
+    return queue
@@ -0,0 +1,250 @@
+# app/services/ocr_service.py
+
+"""
+OCR for PDF pages without a text layer.
+
+Scanned documents (such as medical intake forms) have pages whose extracted
+text is empty. Those pages are rasterized and run through tesseract in a
+bounded process pool, with a timeout per page. Recognized text is cached by
+the hash of the page image, so the same scanned form is only read once.
+"""
+
+import hashlib
+import io
+import logging
+import multiprocessing
+import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _ocr_image(png_bytes: bytes, language: str, timeout: float) -> str:
+    """Recognize the text of a page image in a worker process"""
+    import pytesseract
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png_bytes))
+    try:
+        # Binarize scans for better recognition when OpenCV is available
+        import cv2
+        import numpy as np
+
+        gray = cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2GRAY)
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        image = Image.fromarray(binary)
+    except ImportError:
+        pass
+
+    # tesseract is killed once the timeout expires
+    return pytesseract.image_to_string(image, lang=language, timeout=timeout)
+
+
+class OcrService:
+    """Recognizes text on image-only PDF pages with a bounded worker pool"""
+
+    def __init__(self, max_workers: int = 2, page_timeout: float = 60, dpi: int = 300,
+                 language: str = "eng", cache_size: int = 1000, in_process: bool = False):
+        """
+        Initialize the OCR service
+
+        Args:
+            max_workers: Worker processes running tesseract (0 disables OCR)
+            page_timeout: Seconds allowed to rasterize or recognize a page
+            dpi: Resolution pages are rasterized at
+            language: Tesseract language code
+            cache_size: Recognized pages kept in memory, keyed by image hash
+            in_process: Run tesseract in this process instead of a pool, for
+                processes that are already pool workers
+        """
+        self.max_workers = max_workers
+        self.page_timeout = page_timeout
+        self.dpi = dpi
+        self.language = language
+        self.cache_size = cache_size
+        self.in_process = in_process
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether OCR is configured and pytesseract is installed"""
+        if self.max_workers < 1:
+            return False
+        try:
+            import pytesseract  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def fill_empty_pages(self, pdf, page_texts: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+        """
+        Replace the text of pages without a text layer by OCR results
+
+        Pages are read in windows of a few pages per worker, so that the pages
+        of a window are recognized concurrently while memory stays bounded.
+
+        Args:
+            pdf: Open PdfDocument the page texts come from
+            page_texts: Text of each page, in order
+
+        Yields:
+            Tuple of page text and whether it was recognized by OCR, in page order
+        """
+        window_size = max(1, self.max_workers * 2)
+        window = []
+        for page_index, page_text in enumerate(page_texts):
+            window.append((page_index, page_text))
+            if len(window) >= window_size:
+                yield from self._fill_window(pdf, window)
+                window = []
+        if window:
+            yield from self._fill_window(pdf, window)
+
+    def _fill_window(self, pdf, window) -> Iterator[Tuple[str, bool]]:
+        images = {}
+        for page_index, page_text in window:
+            if page_text and page_text.strip():
+                continue
+            try:
+                images[page_index] = pdf.render_page_png(page_index, dpi=self.dpi, timeout=self.page_timeout)
+            except (OSError, subprocess.SubprocessError, RuntimeError, ValueError) as e:
+                logger.warning(f"Could not rasterize page {page_index + 1} for OCR: {str(e)}")
+
+        recognized = self.recognize(images)
+        for page_index, page_text in window:
+            # Blank scans stay unflagged: OCR produced no text for them
+            if recognized.get(page_index):
+                yield recognized[page_index], True
+            else:
+                yield page_text, False
+
+    def recognize(self, images: Dict[int, bytes]) -> Dict[int, str]:
+        """
+        Recognize the text of page images
+
+        Args:
+            images: Mapping of page index to PNG image bytes
+
+        Returns:
+            Mapping of page index to recognized text, for the pages that
+            were recognized within the timeout
+        """
+        results = {}
+        pending = {}
+        for page_index, png_bytes in images.items():
+            image_hash = hashlib.sha256(png_bytes).hexdigest()
+            with self._lock:
+                text = self._cache.get(image_hash)
+                if text is not None:
+                    self._cache.move_to_end(image_hash)
+            if text is not None:
+                results[page_index] = text
+            else:
+                pending[page_index] = (image_hash, png_bytes)
+
+        if not pending:
+            return results
+
+        if self.in_process:
+            for page_index, (image_hash, png_bytes) in pending.items():
+                try:
+                    text = _ocr_image(png_bytes, self.language, self.page_timeout)
+                except Exception as e:
+                    # pytesseract raises RuntimeError on its own timeout
+                    logger.warning(f"OCR failed for page {page_index + 1}: {str(e)}")
+                    continue
+                results[page_index] = self._remember(image_hash, text)
+            return results
+
+        try:
+            executor = self._get_executor()
+            futures = {
+                page_index: (image_hash, executor.submit(_ocr_image, png_bytes, self.language, self.page_timeout))
+                for page_index, (image_hash, png_bytes) in pending.items()
+            }
+        except BrokenProcessPool as e:
+            logger.error(f"OCR pool failed: {str(e)}")
+            self.shutdown()
+            return results
+
+        for page_index, (image_hash, future) in futures.items():
+            try:
+                # Allow for queueing behind the other pages of the window
+                text = future.result(timeout=self.page_timeout * 2)
+            except FutureTimeoutError:
+                logger.warning(f"OCR timed out for page {page_index + 1}")
+                future.cancel()
+                continue
+            except BrokenProcessPool as e:
+                logger.error(f"OCR pool failed: {str(e)}")
+                self.shutdown()
+                break
+            except Exception as e:
+                # pytesseract raises RuntimeError on its own timeout
+                logger.warning(f"OCR failed for page {page_index + 1}: {str(e)}")
+                continue
+
+            results[page_index] = self._remember(image_hash, text)
+
+        return results
+
+    def _remember(self, image_hash: str, text: str) -> str:
+        """Cache the recognized text of a page image and return it stripped"""
+        text = text.strip()
+        with self._lock:
+            self._cache[image_hash] = text
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return text
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; they are restarted on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers start clean instead of forking a process
+                # that runs database monitor and queue consumer threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
+# Singleton instance
+_ocr_service_instance = None
+
+
+def get_ocr_service() -> OcrService:
+    """Get or create the OCR service singleton instance"""
+    global _ocr_service_instance
+    if _ocr_service_instance is None:
+        _ocr_service_instance = OcrService()
+    return _ocr_service_instance
+
+
+def init_ocr_service(app) -> OcrService:
+    """
+    Configure the OCR service for the application
+
+    Args:
+        app: Flask application instance
+    """
+    service = get_ocr_service()
+    service.shutdown()
+    service.max_workers = app.config.get('OCR_WORKERS', 2)
+    service.page_timeout = app.config.get('OCR_PAGE_TIMEOUT', 60)
+    service.dpi = app.config.get('OCR_DPI', 300)
+    service.language = app.config.get('OCR_LANGUAGE', 'eng')
+    service.in_process = app.config.get('OCR_IN_PROCESS', False)
+    return service
@@ -1,13 +1,39 @@
 import uuid
 import re
 import json
+import hashlib
 import logging
-from typing import Dict, List, Any
+import threading
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
 from enum import Enum
+from pymongo import UpdateOne
 from app.extensions import mongo
+from app.services.rule_pool import RulePool, get_rule_pool
+from app.services.rule_store import get_rule_store
+from app.services.verdict_cache import VerdictCache, get_verdict_cache
+from app.utils.matchers import KeywordMatcher, RegexSetMatcher
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the built-in rule definitions below change so that
+# memoized rule sets are rebuilt
+RULES_VERSION = 1
+
+# Below this many keywords per-rule substring scans beat the automaton
+# (see benchmarks/keyword_matching.py)
+KEYWORD_AUTOMATON_MIN_KEYWORDS = 64
+
+# Decide REGEX rules with a single prefilter scan from this many rules up
+# (see benchmarks/regex_matching.py)
+REGEX_SET_MIN_RULES = 6
+
+# Documents updated per bulk_write when checking documents in batch
+BULK_WRITE_BATCH_SIZE = 1000
+
+# Paragraphs evaluated together when streaming a document
+STREAM_CHUNK_SIZE = 500
+
 class RuleType(Enum):
     REGEX = "regex"
     KEYWORD = "keyword"
@@ -35,9 +61,192 @@ class ComplianceIssue:
             "suggestions": self.suggestions
         }
 
-def get_compliance_rules(compliance_types: List[str]) -> List[Dict]:
+class CompiledRule:
+    """Compliance rule with its matching data prepared once for repeated scans"""
+    def __init__(self, definition: Dict):
+        self.rule_id = definition["rule_id"]
+        self.rule_type = RuleType(definition["rule_type"])
+        self.compliance_type = definition.get("compliance_type")
+        self.description = definition.get("description", "")
+        self.severity = definition.get("severity", "medium")
+        self.suggestion_template = definition.get("suggestion_template")
+        self.pattern = definition.get("pattern")
+        self.keywords = tuple(keyword.lower() for keyword in _get_rule_keywords(definition))
+        self.fingerprint = _definition_fingerprint(definition)
+        self.compiled_pattern = None
+        
+        if self.rule_type == RuleType.REGEX and self.pattern:
+            try:
+                self.compiled_pattern = re.compile(self.pattern, re.IGNORECASE)
+            except re.error as e:
+                # Invalid patterns never report issues, same as check_regex_rule
+                logger.error(f"Invalid regex pattern in rule {self.rule_id}: {str(e)}")
+    
+    def is_violated_by(self, text: str, text_lower: str) -> bool:
+        """Check whether a non-empty paragraph text violates this rule"""
+        if self.rule_type == RuleType.REGEX:
+            if self.compiled_pattern is None:
+                return False
+            return not self.compiled_pattern.search(text)
+        if self.rule_type == RuleType.KEYWORD:
+            return not any(keyword in text_lower for keyword in self.keywords)
+        return False
+
+class CompiledRuleSet:
+    """
+    Immutable set of compiled rules for a combination of compliance types.
+    
+    Regex patterns are compiled and keyword lists lowercased once when the set
+    is built, so evaluating a paragraph only scans its text.
+    """
+    def __init__(self, definitions: List[Dict], version: Any = RULES_VERSION,
+                 use_keyword_automaton: bool = None, use_regex_set: bool = None):
+        self.version = version
+        self.definitions = definitions
+        self.rules = [CompiledRule(definition) for definition in definitions]
+        self.fingerprint = hashlib.sha256(
+            "".join(rule.fingerprint for rule in self.rules).encode("utf-8")
+        ).hexdigest()[:16]
+        self._subsets = {}
+        self._subsets_lock = threading.Lock()
+        
+        # One automaton for the keywords of all KEYWORD rules, keyed by rule index
+        keywords_by_rule = {
+            index: rule.keywords
+            for index, rule in enumerate(self.rules)
+            if rule.rule_type == RuleType.KEYWORD
+        }
+        if use_keyword_automaton is None:
+            keyword_count = sum(len(keywords) for keywords in keywords_by_rule.values())
+            use_keyword_automaton = keyword_count >= KEYWORD_AUTOMATON_MIN_KEYWORDS
+        self.keyword_matcher = KeywordMatcher(keywords_by_rule) if use_keyword_automaton else None
+        
+        # One scan tells which REGEX rules can match, keyed by rule index. Rules
+        # with invalid patterns never match and are left out.
+        patterns_by_rule = {
+            index: rule.compiled_pattern
+            for index, rule in enumerate(self.rules)
+            if rule.rule_type == RuleType.REGEX and rule.compiled_pattern is not None
+        }
+        if use_regex_set is None:
+            use_regex_set = len(patterns_by_rule) >= REGEX_SET_MIN_RULES
+        self.regex_matcher = RegexSetMatcher(patterns_by_rule) if use_regex_set else None
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def subset(self, rule_ids: Iterable[str]) -> "CompiledRuleSet":
+        """
+        Get the memoized rule set holding only the given rules
+        
+        Args:
+            rule_ids: IDs of the rules to keep
+            
+        Returns:
+            CompiledRuleSet with the same version and the selected rules in rule order
+        """
+        key = frozenset(rule_ids)
+        rule_set = self._subsets.get(key)
+        if rule_set is None:
+            with self._subsets_lock:
+                rule_set = self._subsets.get(key)
+                if rule_set is None:
+                    definitions = [
+                        definition for definition, rule in zip(self.definitions, self.rules)
+                        if rule.rule_id in key
+                    ]
+                    rule_set = CompiledRuleSet(definitions, version=self.version)
+                    self._subsets[key] = rule_set
+        return rule_set
+    
+    def evaluate(self, text: str) -> List[CompiledRule]:
+        """
+        Evaluate paragraph text against every rule in the set
+        
+        Args:
+            text: Paragraph text
+            
+        Returns:
+            Rules violated by the text, in rule order
+        """
+        if not text:
+            return []
+        text_lower = text.lower()
+        
+        if self.keyword_matcher is None and self.regex_matcher is None:
+            return [rule for rule in self.rules if rule.is_violated_by(text, text_lower)]
+        
+        # KEYWORD rules are decided by a single automaton pass and REGEX rules
+        # by a single prefilter scan plus searches for the candidates only
+        keywords_found = self.keyword_matcher.matches(text_lower) if self.keyword_matcher else None
+        patterns_found = self.regex_matcher.matches(text, text_lower) if self.regex_matcher else None
+        violated = []
+        for index, rule in enumerate(self.rules):
+            if rule.rule_type == RuleType.KEYWORD and keywords_found is not None:
+                if index not in keywords_found:
+                    violated.append(rule)
+            elif rule.rule_type == RuleType.REGEX and patterns_found is not None:
+                if rule.compiled_pattern is not None and index not in patterns_found:
+                    violated.append(rule)
+            elif rule.is_violated_by(text, text_lower):
+                violated.append(rule)
+        return violated
+
+# Memoized rule sets keyed by (compliance types, rule version)
+_compiled_rule_sets: Dict[Tuple[frozenset, Any], CompiledRuleSet] = {}
+_compiled_rule_sets_lock = threading.Lock()
+
+_SUPPORTED_RULE_TYPES = {rule_type.value for rule_type in RuleType}
+
+def get_compiled_rule_set(compliance_types: Iterable[str]) -> CompiledRuleSet:
+    """
+    Get the compiled rule set for the specified compliance types
+    
+    Rules come from the cached compliance_rules collection, falling back to the
+    built-in definitions when no rules are stored.
+    
+    Args:
+        compliance_types: List of compliance types to check
+        
+    Returns:
+        Memoized CompiledRuleSet shared by all checks with the same types and rule version
+    """
+    stored_version, stored_rules = get_rule_store().get_rules()
+    version = stored_version if stored_rules else f"builtin-{RULES_VERSION}"
+    key = (frozenset(compliance_types), version)
+    
+    rule_set = _compiled_rule_sets.get(key)
+    if rule_set is None:
+        with _compiled_rule_sets_lock:
+            rule_set = _compiled_rule_sets.get(key)
+            if rule_set is None:
+                if stored_rules:
+                    definitions = [
+                        definition for definition in stored_rules
+                        if definition["compliance_type"] in key[0]
+                        and definition["rule_type"] in _SUPPORTED_RULE_TYPES
+                    ]
+                else:
+                    definitions = _get_rule_definitions(key[0])
+                # Rule sets built from older rule versions are no longer used
+                for stale_key in [k for k in _compiled_rule_sets if k[1] != version]:
+                    del _compiled_rule_sets[stale_key]
+                rule_set = CompiledRuleSet(definitions, version=version)
+                _compiled_rule_sets[key] = rule_set
+    return rule_set
+
+def clear_compiled_rule_sets():
+    """Drop all memoized rule sets so they are rebuilt on next use"""
+    with _compiled_rule_sets_lock:
+        _compiled_rule_sets.clear()
+
+def get_compliance_rules(compliance_types: List[str]) -> List[CompiledRule]:
     """Get compliance rules for specified compliance types"""
-    # In a real application, these would come from a database
+    return get_compiled_rule_set(compliance_types).rules
+
+def _get_rule_definitions(compliance_types: Iterable[str]) -> List[Dict]:
+    """Get the raw rule definitions for specified compliance types"""
+    # Used when the compliance_rules collection has no rules
     rules = []
     
     if "GDPR" in compliance_types:
@@ -104,13 +313,36 @@ def get_compliance_rules(compliance_types: List[str]) -> List[Dict]:
     
     # FIXME: Need to add more CCPA rules here when we implement that standard
     
-    # Convert dictionaries to objects
-    rule_objects = []
-    for rule_dict in rules:
-        rule = type('Rule', (), rule_dict)
-        rule_objects.append(rule)
+    return rules
+
+def _get_rule_keywords(definition: Dict) -> List[str]:
+    """Get keywords from a rule, accepting the comma-separated pattern used by stored rules"""
+    keywords = definition.get("keywords")
+    if keywords:
+        return list(keywords)
+    if definition.get("pattern") and RuleType(definition["rule_type"]) == RuleType.KEYWORD:
+        return [keyword.strip() for keyword in definition["pattern"].split(",") if keyword.strip()]
+    return []
+
+def _definition_fingerprint(definition: Dict) -> str:
+    """Content hash of a rule definition, used to tell which rules changed between audits"""
+    canonical = json.dumps(definition, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+def paragraph_hash(text: Any) -> str:
+    """
+    Content hash of a paragraph's text
     
-    return rule_objects
+    The raw text is hashed, not a whitespace-normalized form: keywords and
+    patterns match literal spacing ("privacy notice" is not found in
+    "privacy\nnotice", and "$" anchors fail before a trailing space), so
+    texts differing only in whitespace can have different verdicts.
+    """
+    return hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()[:16]
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str):
+    return re.compile(pattern, re.IGNORECASE)
 
 def check_regex_rule(rule, paragraph):
     # Check if paragraph matches a regex rule
@@ -126,7 +358,7 @@ def check_regex_rule(rule, paragraph):
     # Rule matches if regex pattern is NOT found
     # (meaning there's a compliance issue)
     try:
-        pattern = re.compile(rule.pattern, re.IGNORECASE)
+        pattern = getattr(rule, "compiled_pattern", None) or _compile_pattern(rule.pattern)
         return not bool(pattern.search(text))
     except Exception as e:
         # Just log and return False if regex is invalid
@@ -149,27 +381,8 @@ def check_keyword_rule(rule, paragraph):
     text = text.lower()
     return not any(keyword.lower() in text for keyword in rule.keywords)
 
-def check_document_compliance(document: Dict, compliance_types: List[str]) -> Dict[str, Any]:
-    """
-    Check a document for compliance issues
-    
-    Args:
-        document: Document data
-        compliance_types: List of compliance types to check
-        
-    Returns:
-        Dictionary with compliance issues and score
-    """
-    # Get compliance rules
-    rules = get_compliance_rules(compliance_types)
-    
-    # Initialize results
-    issues = []
-    paragraphs_with_issues = set()
-    
-    # Ensure we have valid paragraphs to work with
-    paragraphs = document.get("paragraphs", [])
-    
+def _normalize_paragraphs(paragraphs: Any) -> List[Dict]:
+    """Ensure paragraphs are a list of dicts with id and text fields"""
     # Handle case where paragraphs might be a string instead of a list
     if isinstance(paragraphs, str):
         try:
@@ -180,8 +393,6 @@ def check_document_compliance(document: Dict, compliance_types: List[str]) -> Di
             logger.warning(f"Failed to parse paragraphs as JSON: {str(e)}")
             paragraphs = [{"id": "p1", "text": paragraphs}]
     
-    # TODO: Refactor this paragraph normalization logic into a separate function
-    # Ensure each paragraph has an id and text field
     valid_paragraphs = []
     for i, p in enumerate(paragraphs):
         if isinstance(p, str):
@@ -195,34 +406,301 @@ def check_document_compliance(document: Dict, compliance_types: List[str]) -> Di
                 p["text"] = p["content"]
             valid_paragraphs.append(p)
     
-    # Check each paragraph against each rule
-    for paragraph in valid_paragraphs:
-        for rule in rules:
-            # Skip if already found an issue for this rule in this paragraph
-            if any(issue.get("rule_id") == rule.rule_id and issue.get("paragraph_id") == paragraph.get("id") for issue in issues):
+    return valid_paragraphs
+
+def audit_paragraphs(paragraphs: List[Dict], rule_set: CompiledRuleSet, previous_audit: Dict = None,
+                     previous_issues: List[Dict] = None,
+                     verdict_cache: VerdictCache = None,
+                     rule_pool: RulePool = None) -> Tuple[List[Dict], set, Dict]:
+    """
+    Evaluate normalized paragraphs, reusing findings from an earlier audit
+    
+    A paragraph whose id and content hash appear in the previous audit is only
+    evaluated against rules that were added or changed since then; findings
+    for the unchanged rules are taken from the audit. Other paragraphs are
+    evaluated against every rule. Issues that carry over keep their issue ID
+    and suggestions.
+    
+    Args:
+        paragraphs: Paragraph dicts with id and text fields
+        rule_set: Compiled rules to apply
+        previous_audit: Audit record returned by an earlier call, if any
+        previous_issues: Issue dicts returned by that earlier call
+        verdict_cache: Cache of verdicts for paragraph texts seen in any
+            document, consulted before evaluating a rule
+        rule_pool: Process pool used to evaluate documents with many
+            paragraphs left to evaluate
+        
+    Returns:
+        Tuple containing:
+            - List of compliance issue dicts, in paragraph then rule order
+            - Set of paragraph IDs with at least one issue
+            - Audit record to pass to the next call
+    """
+    previous_audit = previous_audit or {}
+    previous_fingerprints = previous_audit.get("rules", {})
+    unchanged_rule_ids = {
+        rule.rule_id for rule in rule_set.rules
+        if previous_fingerprints.get(rule.rule_id) == rule.fingerprint
+    }
+    if unchanged_rule_ids:
+        changed_rule_set = rule_set.subset(
+            rule.rule_id for rule in rule_set.rules if rule.rule_id not in unchanged_rule_ids
+        )
+    else:
+        changed_rule_set = rule_set
+    previous_findings = {
+        (entry["id"], entry["content_hash"]): entry["violations"]
+        for entry in previous_audit.get("paragraphs", [])
+    }
+    previous_issues_by_key = {
+        (issue.get("rule_id"), issue.get("paragraph_id")): issue
+        for issue in previous_issues or []
+    }
+    rules_by_id = {rule.rule_id: rule for rule in rule_set.rules}
+    rule_order = {rule.rule_id: index for index, rule in enumerate(rule_set.rules)}
+    
+    # Work out which rules each paragraph still has to be evaluated against
+    plan = []
+    for paragraph in paragraphs:
+        paragraph_id = paragraph.get("id", "unknown")
+        text = paragraph.get("text", "")
+        content_hash = paragraph_hash(text)
+        reused_rule_ids = previous_findings.get((paragraph_id, content_hash))
+        if reused_rule_ids is None:
+            pending = rule_set
+        else:
+            reused_rule_ids = [rule_id for rule_id in reused_rule_ids if rule_id in unchanged_rule_ids]
+            pending = changed_rule_set
+        plan.append((paragraph_id, text, content_hash, reused_rule_ids, pending))
+    
+    # Verdicts for paragraph texts already evaluated in this or any other document
+    verdicts = {}
+    if verdict_cache is not None:
+        verdicts = verdict_cache.get_many({
+            (content_hash, rule.rule_id, rule.fingerprint)
+            for _, _, content_hash, _, pending in plan
+            for rule in pending.rules
+        })
+    new_verdicts = {}
+    
+    # Rules each paragraph still has to be evaluated against, evaluating
+    # repeated paragraph texts once
+    states = []
+    work = []
+    work_indexes = {}
+    for paragraph_id, text, content_hash, reused_rule_ids, pending in plan:
+        violated = [rules_by_id[rule_id] for rule_id in reused_rule_ids] if reused_rule_ids else []
+        evaluated = pending
+        if verdict_cache is not None and len(pending):
+            missing = []
+            for rule in pending.rules:
+                verdict = verdicts.get((content_hash, rule.rule_id, rule.fingerprint))
+                if verdict is None:
+                    missing.append(rule)
+                elif verdict:
+                    violated.append(rule)
+            if len(missing) < len(pending):
+                evaluated = pending.subset(rule.rule_id for rule in missing)
+        
+        work_index = None
+        if len(evaluated):
+            work_key = (content_hash, id(evaluated))
+            work_index = work_indexes.get(work_key)
+            if work_index is None:
+                work_index = work_indexes[work_key] = len(work)
+                work.append((text, evaluated))
+        reused = reused_rule_ids is not None
+        states.append((paragraph_id, content_hash, reused, violated, evaluated, work_index,
+                       bool(reused_rule_ids) or len(evaluated) < len(pending)))
+    
+    if rule_pool is not None and rule_pool.should_use(len(work)):
+        fired_by_work = rule_pool.evaluate(rule_set, work)
+    else:
+        fired_by_work = [evaluated.evaluate(text) for text, evaluated in work]
+    
+    # At most one issue per (rule, paragraph) pair, even if paragraph IDs repeat
+    seen = set()
+    issues = []
+    paragraphs_with_issues = set()
+    entries = []
+    for paragraph_id, content_hash, reused, violated, evaluated, work_index, needs_sort in states:
+        if work_index is not None:
+            fired = fired_by_work[work_index]
+            violated.extend(fired)
+            if verdict_cache is not None:
+                fired_ids = {rule.rule_id for rule in fired}
+                for rule in evaluated.rules:
+                    new_verdicts[(content_hash, rule.rule_id, rule.fingerprint)] = rule.rule_id in fired_ids
+        # Reused findings and cached verdicts are also merged out of rule order
+        if needs_sort:
+            violated.sort(key=lambda rule: rule_order[rule.rule_id])
+        
+        entries.append({
+            "id": paragraph_id,
+            "content_hash": content_hash,
+            "rule_version": rule_set.version,
+            "violations": [rule.rule_id for rule in violated]
+        })
+        
+        for rule in violated:
+            key = (rule.rule_id, paragraph_id)
+            if key in seen:
                 continue
+            seen.add(key)
+            paragraphs_with_issues.add(paragraph_id)
             
-            # Check if paragraph matches rule
-            matches = False
-            if rule.rule_type == RuleType.REGEX:
-                matches = check_regex_rule(rule, paragraph)
-            elif rule.rule_type == RuleType.KEYWORD:
-                matches = check_keyword_rule(rule, paragraph)
-            
-            # If matches, create issue
-            if matches:
-                issue_id = str(uuid.uuid4())
-                issue = ComplianceIssue(
-                    issue_id=issue_id,
-                    rule_id=rule.rule_id,
-                    paragraph_id=paragraph.get("id", "unknown"),
-                    description=rule.description,
-                    severity=rule.severity,
-                    compliance_type=rule.compliance_type,
-                    suggestions=[]  # Initialize with empty list to ensure the button appears
-                )
-                issues.append(issue.to_dict())
-                paragraphs_with_issues.add(paragraph.get("id", "unknown"))
+            previous_issue = None
+            if reused and rule.rule_id in unchanged_rule_ids:
+                previous_issue = previous_issues_by_key.get(key)
+            issues.append({
+                "issue_id": previous_issue["issue_id"] if previous_issue else str(uuid.uuid4()),
+                "rule_id": rule.rule_id,
+                "paragraph_id": paragraph_id,
+                "description": rule.description,
+                "severity": rule.severity,
+                "compliance_type": rule.compliance_type,
+                # Initialize with empty list to ensure the button appears
+                "suggestions": list(previous_issue.get("suggestions", [])) if previous_issue else []
+            })
+    
+    if verdict_cache is not None:
+        verdict_cache.put_many(new_verdicts)
+    
+    audit = {
+        "rule_version": rule_set.version,
+        "rules": {rule.rule_id: rule.fingerprint for rule in rule_set.rules},
+        "paragraphs": entries
+    }
+    return issues, paragraphs_with_issues, audit
+
+def _normalize_paragraph(paragraph: Any, index: int) -> Dict:
+    """Get a paragraph as a new dict with id and text fields, or None if unusable"""
+    if isinstance(paragraph, str):
+        return {"id": f"p{index+1}", "text": paragraph}
+    if isinstance(paragraph, dict):
+        return {
+            "id": paragraph.get("id", f"p{index+1}"),
+            "text": paragraph.get("text", paragraph.get("content", ""))
+        }
+    return None
+
+def evaluate_paragraphs(paragraphs: List[Dict], rule_set: CompiledRuleSet) -> Tuple[List[Dict], set]:
+    """
+    Evaluate normalized paragraphs against a compiled rule set
+    
+    Args:
+        paragraphs: Paragraph dicts with id and text fields
+        rule_set: Compiled rules to apply
+        
+    Returns:
+        Tuple containing:
+            - List of compliance issue dicts, in paragraph then rule order
+            - Set of paragraph IDs with at least one issue
+    """
+    issues, paragraphs_with_issues, _ = audit_paragraphs(paragraphs, rule_set)
+    return issues, paragraphs_with_issues
+
+def _compliance_status(issue_count: int, compliance_score: float) -> str:
+    """Determine the compliance status for a check"""
+    if not issue_count:
+        return "compliant"
+    elif compliance_score < 50:
+        return "non_compliant"
+    return "partially_compliant"
+
+class ComplianceStream:
+    """
+    Streaming compliance check over an iterable of paragraphs
+    
+    Iterating yields issues as they are found while paragraphs are consumed in
+    small chunks, so peak memory does not grow with the document. Only the
+    running counters behind the score are kept; they are final once the
+    iteration is exhausted. Paragraph IDs are assumed to be unique.
+    
+    Paragraphs may be strings or dicts with id and text (or content) fields,
+    for example straight from extraction or a MongoDB cursor. Input dicts are
+    not modified.
+    """
+    def __init__(self, paragraphs: Iterable[Any], compliance_types: List[str], chunk_size: int = STREAM_CHUNK_SIZE):
+        self.paragraphs = paragraphs
+        self.rule_set = get_compiled_rule_set(compliance_types)
+        self.chunk_size = chunk_size
+        self.paragraph_count = 0
+        self.paragraphs_with_issues = 0
+        self.issue_count = 0
+    
+    def __iter__(self) -> Iterator[Dict]:
+        verdict_cache = get_verdict_cache()
+        chunk = []
+        for index, paragraph in enumerate(self.paragraphs):
+            paragraph = _normalize_paragraph(paragraph, index)
+            if paragraph is None:
+                continue
+            chunk.append(paragraph)
+            if len(chunk) >= self.chunk_size:
+                yield from self._evaluate_chunk(chunk, verdict_cache)
+                chunk = []
+        if chunk:
+            yield from self._evaluate_chunk(chunk, verdict_cache)
+    
+    def _evaluate_chunk(self, chunk: List[Dict], verdict_cache: VerdictCache) -> List[Dict]:
+        issues, paragraphs_with_issues, _ = audit_paragraphs(chunk, self.rule_set, verdict_cache=verdict_cache)
+        self.paragraph_count += len(chunk)
+        self.paragraphs_with_issues += len(paragraphs_with_issues)
+        self.issue_count += len(issues)
+        return issues
+    
+    @property
+    def score(self) -> float:
+        """Compliance score of the paragraphs consumed so far"""
+        if self.paragraph_count > 0:
+            return 100 * (1 - self.paragraphs_with_issues / self.paragraph_count)
+        return 100
+    
+    @property
+    def status(self) -> str:
+        """Compliance status of the paragraphs consumed so far"""
+        return _compliance_status(self.issue_count, self.score)
+
+def stream_document_compliance(paragraphs: Iterable[Any], compliance_types: List[str]) -> ComplianceStream:
+    """
+    Check a stream of paragraphs for compliance issues without loading them all
+    
+    Args:
+        paragraphs: Iterable of paragraph strings or dicts
+        compliance_types: List of compliance types to check
+        
+    Returns:
+        ComplianceStream yielding issue dicts, with score and status once exhausted
+    """
+    return ComplianceStream(paragraphs, compliance_types)
+
+def evaluate_document(document: Dict, rule_set: CompiledRuleSet, incremental: bool) -> Tuple[Dict[str, Any], Dict]:
+    """
+    Evaluate a document against a compiled rule set without saving the results
+    
+    Args:
+        document: Document data with its paragraphs
+        rule_set: Compiled rules to check
+        incremental: Reuse findings from the document's last audit
+    
+    Returns:
+        Tuple containing:
+            - Dictionary with compliance issues and score
+            - Document fields to $set with the results
+    """
+    # Ensure we have valid paragraphs to work with
+    valid_paragraphs = _normalize_paragraphs(document.get("paragraphs", []))
+    
+    # Check each paragraph against each rule, skipping unchanged paragraph/rule pairs
+    previous_audit = document.get("compliance_audit") if incremental else None
+    issues, paragraphs_with_issues, audit = audit_paragraphs(
+        valid_paragraphs, rule_set, previous_audit,
+        previous_issues=document.get("compliance_issues") if previous_audit else None,
+        verdict_cache=get_verdict_cache(),
+        rule_pool=get_rule_pool()
+    )
     
     # Calculate compliance score
     total_paragraphs = len(valid_paragraphs)
@@ -232,25 +710,84 @@ def check_document_compliance(document: Dict, compliance_types: List[str]) -> Di
         compliance_score = 100
     
     # Determine compliance status
-    if not issues:
-        compliance_status = "compliant"
-    elif compliance_score < 50:
-        compliance_status = "non_compliant"
-    else:
-        compliance_status = "partially_compliant"
-    
-    # Update document with compliance results
-    mongo.db.documents.update_one(
-        {"_id": document["_id"]},
-        {"$set": {
-            "compliance_issues": issues,
-            "compliance_score": compliance_score,
-            "compliance_status": compliance_status
-        }}
-    )
+    compliance_status = _compliance_status(len(issues), compliance_score)
     
-    return {
+    results = {
         "issues": issues,
         "score": compliance_score,
         "status": compliance_status
-    }
\ No newline at end of file
+    }
+    update = {
+        "compliance_issues": issues,
+        "compliance_score": compliance_score,
+        "compliance_status": compliance_status,
+        "compliance_audit": audit
+    }
+    return results, update
+
+def check_document_compliance(document: Dict, compliance_types: List[str], incremental: bool = True) -> Dict[str, Any]:
+    """
+    Check a document for compliance issues
+    
+    Args:
+        document: Document data
+        compliance_types: List of compliance types to check
+        incremental: Reuse findings from the document's last audit for
+            paragraphs and rules that have not changed since
+        
+    Returns:
+        Dictionary with compliance issues and score
+    """
+    # Get compiled compliance rules
+    rule_set = get_compiled_rule_set(compliance_types)
+    
+    results, update = evaluate_document(document, rule_set, incremental)
+    
+    # Update document with compliance results
+    mongo.db.documents.update_one({"_id": document["_id"]}, {"$set": update})
+    
+    return results
+
+def check_documents_compliance(compliance_types: List[str], document_ids: Iterable[str] = None,
+                               query: Dict = None, incremental: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Check many documents for compliance issues in one pass
+    
+    Documents are read through a single projected cursor, evaluated against
+    one compiled rule set and updated with batched bulk writes.
+    
+    Args:
+        compliance_types: List of compliance types to check
+        document_ids: IDs of the documents to check
+        query: Filter selecting the documents to check, used when no IDs are given
+        incremental: Reuse findings from each document's last audit
+        
+    Returns:
+        Dictionary mapping document ID to its score, status and issue count
+    """
+    rule_set = get_compiled_rule_set(compliance_types)
+    
+    if document_ids is not None:
+        query = {"_id": {"$in": list(document_ids)}}
+    projection = {"paragraphs": 1}
+    if incremental:
+        projection.update({"compliance_audit": 1, "compliance_issues": 1})
+    
+    summaries = {}
+    operations = []
+    for document in mongo.db.documents.find(query or {}, projection):
+        results, update = evaluate_document(document, rule_set, incremental)
+        summaries[document["_id"]] = {
+            "score": results["score"],
+            "status": results["status"],
+            "issue_count": len(results["issues"])
+        }
+        operations.append(UpdateOne({"_id": document["_id"]}, {"$set": update}))
+        if len(operations) >= BULK_WRITE_BATCH_SIZE:
+            mongo.db.documents.bulk_write(operations, ordered=False)
+            operations = []
+    
+    if operations:
+        mongo.db.documents.bulk_write(operations, ordered=False)
+    
+    return summaries
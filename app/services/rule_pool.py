@@ -0,0 +1,163 @@
+# app/services/rule_pool.py
+
+"""
+Process pool for evaluating rules over very large documents.
+
+Documents with tens of thousands of paragraphs are split into chunks that are
+evaluated in worker processes, so a single check can use every core. Each
+worker compiles a rule set once and keeps it for later chunks; only the
+paragraph texts and the IDs of the violated rules cross process boundaries.
+Smaller documents are evaluated in-process, where IPC overhead would
+outweigh the gain.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Compiled rule sets kept by each worker process
+WORKER_RULE_SETS = 8
+
+# Worker-side cache of compiled rule sets keyed by rule set fingerprint
+_worker_rule_sets = OrderedDict()
+
+
+def get_worker_rule_set(fingerprint: str, definitions: List[Dict], version: Any):
+    """Get a compiled rule set in a worker process, compiling it on first use"""
+    from app.services.rule_engine import CompiledRuleSet
+
+    rule_set = _worker_rule_sets.get(fingerprint)
+    if rule_set is None:
+        rule_set = CompiledRuleSet(definitions, version=version)
+        _worker_rule_sets[fingerprint] = rule_set
+        while len(_worker_rule_sets) > WORKER_RULE_SETS:
+            _worker_rule_sets.popitem(last=False)
+    else:
+        _worker_rule_sets.move_to_end(fingerprint)
+    return rule_set
+
+
+def _init_worker(fingerprint: str, definitions: List[Dict], version: Any) -> None:
+    """Pre-warm a worker with the rule set the pool was started for"""
+    get_worker_rule_set(fingerprint, definitions, version)
+
+
+def _evaluate_chunk(fingerprint: str, definitions: List[Dict], version: Any,
+                    items: List[Tuple[str, Optional[Tuple[str, ...]]]]) -> List[List[str]]:
+    """Evaluate (text, rule IDs) items in a worker, returning violated rule IDs per item"""
+    rule_set = get_worker_rule_set(fingerprint, definitions, version)
+    results = []
+    for text, rule_ids in items:
+        evaluated = rule_set if rule_ids is None else rule_set.subset(rule_ids)
+        results.append([rule.rule_id for rule in evaluated.evaluate(text)])
+    return results
+
+
+class RulePool:
+    """Lazily started process pool that evaluates paragraphs in chunks"""
+
+    def __init__(self, max_workers: int = None, min_paragraphs: int = 20000, chunk_size: int = 2000):
+        """
+        Initialize the rule pool
+
+        Args:
+            max_workers: Number of worker processes (defaults to the CPU count,
+                0 disables the pool)
+            min_paragraphs: Paragraphs to evaluate below which documents stay in-process
+            chunk_size: Paragraphs sent to a worker per task
+        """
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.min_paragraphs = min_paragraphs
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def should_use(self, paragraph_count: int) -> bool:
+        """Check whether evaluating this many paragraphs is worth the IPC overhead"""
+        return self.max_workers > 1 and paragraph_count >= self.min_paragraphs
+
+    def evaluate(self, rule_set, work: Sequence[Tuple[str, Any]]) -> List[List[Any]]:
+        """
+        Evaluate paragraph texts in worker processes
+
+        Args:
+            rule_set: CompiledRuleSet the work items were planned against
+            work: (text, rule set to evaluate) pairs, where the rule set is
+                rule_set itself or one of its subsets
+
+        Returns:
+            Violated rules for each work item, in rule order
+        """
+        rules_by_id = {rule.rule_id: rule for rule in rule_set.rules}
+        items = [
+            (text, None if evaluated is rule_set else tuple(rule.rule_id for rule in evaluated.rules))
+            for text, evaluated in work
+        ]
+        chunks = [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+
+        try:
+            executor = self._get_executor(rule_set)
+            futures = [
+                executor.submit(_evaluate_chunk, rule_set.fingerprint, rule_set.definitions, rule_set.version, chunk)
+                for chunk in chunks
+            ]
+            results = [rule_ids for future in futures for rule_ids in future.result()]
+        except BrokenProcessPool as e:
+            logger.error(f"Rule evaluation pool failed, evaluating in-process: {str(e)}")
+            self.shutdown()
+            return [evaluated.evaluate(text) for text, evaluated in work]
+
+        return [[rules_by_id[rule_id] for rule_id in rule_ids] for rule_ids in results]
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; they are restarted on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self, rule_set) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers start clean instead of forking a process
+                # that runs database monitor and queue consumer threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(rule_set.fingerprint, rule_set.definitions, rule_set.version)
+                )
+            return self._executor
+
+
+# Singleton instance
+_rule_pool_instance = None
+
+
+def get_rule_pool() -> RulePool:
+    """Get or create the rule pool singleton instance"""
+    global _rule_pool_instance
+    if _rule_pool_instance is None:
+        _rule_pool_instance = RulePool()
+    return _rule_pool_instance
+
+
+def init_rule_pool(app) -> RulePool:
+    """
+    Configure the rule pool for the application
+
+    Args:
+        app: Flask application instance
+    """
+    pool = get_rule_pool()
+    pool.shutdown()
+    pool.max_workers = app.config.get('PARALLEL_EVALUATION_WORKERS', pool.max_workers)
+    pool.min_paragraphs = app.config.get('PARALLEL_EVALUATION_MIN_PARAGRAPHS', 20000)
+    return pool
@@ -0,0 +1,201 @@
+# app/services/rule_store.py
+
+"""
+Per-process cache of the compliance rules stored in MongoDB.
+
+Rules are read from the compliance_rules collection and kept in memory, so
+compliance checks never pay a database round-trip. The cache is invalidated
+through a version counter in the rule_versions collection, which writers bump
+with bump_rule_version(). Each process polls that counter at most once per
+refresh interval, or reacts immediately to a change stream on
+compliance_rules when MongoDB runs as a replica set.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.extensions import mongo
+
+logger = logging.getLogger(__name__)
+
+RULE_VERSION_ID = "compliance_rules"
+
+
+class RuleStore:
+    """In-process cache of active compliance rules with versioned invalidation"""
+
+    def __init__(self, refresh_interval: float = 30):
+        """
+        Initialize the rule store
+
+        Args:
+            refresh_interval: Seconds between checks of the stored rule version
+        """
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._changed = threading.Event()
+        self._rules = None
+        self._version = None
+        self._counter = None
+        self._checked_at = 0.0
+        self._watcher = None
+        self._watching = False
+
+    def get_rules(self) -> Tuple[Any, List[Dict]]:
+        """
+        Get the active rule definitions
+
+        Returns:
+            Tuple containing:
+                - Version identifying this exact set of definitions, or None
+                  if no stored rules are available
+                - List of rule definition dicts
+        """
+        if self._is_fresh():
+            return self._version, self._rules
+
+        with self._lock:
+            if not self._is_fresh():
+                self._refresh()
+            return self._version, self._rules
+
+    def invalidate(self) -> None:
+        """Force a reload on the next get_rules call"""
+        self._changed.set()
+
+    def start_change_stream(self) -> None:
+        """Watch compliance_rules for changes in a background thread"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watcher = threading.Thread(target=self._watch_changes, name="rule-store-watcher", daemon=True)
+        self._watcher.start()
+
+    def _is_fresh(self) -> bool:
+        if self._rules is None or self._changed.is_set():
+            return False
+        return self._watching or time.monotonic() - self._checked_at < self.refresh_interval
+
+    def _refresh(self) -> None:
+        forced = self._changed.is_set()
+        self._changed.clear()
+        self._checked_at = time.monotonic()
+
+        if mongo.db is None:
+            # No database configured (e.g. offline scripts)
+            self._rules, self._version = [], None
+            return
+
+        try:
+            version_doc = mongo.db.rule_versions.find_one({"_id": RULE_VERSION_ID}) or {}
+            counter = version_doc.get("version", 0)
+            if self._rules is not None and not forced and counter == self._counter:
+                return
+
+            rules = [
+                _definition_from_document(doc)
+                for doc in mongo.db.compliance_rules.find({"is_active": {"$ne": False}})
+            ]
+        except PyMongoError as e:
+            logger.warning(f"Could not load compliance rules, keeping cached rules: {str(e)}")
+            if self._rules is None:
+                self._rules, self._version = [], None
+            return
+
+        self._counter = counter
+        self._rules = rules
+        self._version = _rules_version(rules) if rules else None
+        logger.info(f"Loaded {len(rules)} compliance rules (version {self._version})")
+
+    def _watch_changes(self) -> None:
+        try:
+            with mongo.db.compliance_rules.watch() as stream:
+                self._watching = True
+                # Reload in case rules changed before the stream was opened
+                self.invalidate()
+                for _ in stream:
+                    self.invalidate()
+        except PyMongoError as e:
+            logger.info(f"Change streams unavailable for compliance rules, polling the rule version instead: {str(e)}")
+        except Exception as e:
+            logger.error(f"Compliance rule change stream stopped: {str(e)}")
+        finally:
+            self._watching = False
+
+
+def _definition_from_document(doc: Dict) -> Dict:
+    """Convert a compliance_rules document into a rule engine definition"""
+    definition = {
+        "rule_id": str(doc.get("rule_id") or doc["_id"]),
+        "rule_type": str(doc.get("rule_type", "")).lower(),
+        "compliance_type": str(doc.get("compliance_type", "")),
+        "name": doc.get("name"),
+        "description": doc.get("description", ""),
+        "severity": str(doc.get("severity", "medium")),
+        "pattern": doc.get("pattern"),
+        "suggestion_template": doc.get("suggestion_template"),
+    }
+    if doc.get("keywords"):
+        definition["keywords"] = list(doc["keywords"])
+    return definition
+
+
+def _rules_version(rules: List[Dict]) -> str:
+    """Content hash identifying a set of rule definitions across processes"""
+    canonical = json.dumps(rules, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def bump_rule_version() -> int:
+    """
+    Record a change to the stored compliance rules
+
+    Call this after inserting, updating or deleting compliance rules so that
+    every process reloads them.
+
+    Returns:
+        New rule version counter
+    """
+    version_doc = mongo.db.rule_versions.find_one_and_update(
+        {"_id": RULE_VERSION_ID},
+        {"$inc": {"version": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    get_rule_store().invalidate()
+    return version_doc["version"]
+
+
+# Singleton instance
+_rule_store_instance = None
+
+
+def get_rule_store() -> RuleStore:
+    """Get or create the rule store singleton instance"""
+    global _rule_store_instance
+    if _rule_store_instance is None:
+        _rule_store_instance = RuleStore()
+    return _rule_store_instance
+
+
+def init_rule_store(app) -> RuleStore:
+    """
+    Configure the rule store for the application
+
+    Args:
+        app: Flask application instance
+    """
+    store = get_rule_store()
+    store.refresh_interval = app.config.get('RULE_CACHE_REFRESH_SECONDS', 30)
+    store.invalidate()
+
+    if app.config.get('RULE_CHANGE_STREAM_ENABLED', True):
+        store.start_change_stream()
+
+    return store
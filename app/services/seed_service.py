@@ -5,6 +5,7 @@ from app.models.compliance import ComplianceRule, ComplianceType, RuleType, Seve
 def seed_compliance_rules():
     """Seed the database with sample compliance rules"""
     from app.extensions import mongo
+    from app.services.rule_store import bump_rule_version
     
     # Check if rules already exist
     if mongo.db.compliance_rules.count_documents({}) > 0:
@@ -81,4 +82,5 @@ def seed_compliance_rules():
     # Insert rules into MongoDB
     all_rules = gdpr_rules + hipaa_rules
     rules_dicts = [rule.to_dict() for rule in all_rules]
-    mongo.db.compliance_rules.insert_many(rules_dicts)
\ No newline at end of file
+    mongo.db.compliance_rules.insert_many(rules_dicts)
+    bump_rule_version()
\ No newline at end of file
@@ -0,0 +1,175 @@
+# app/services/verdict_cache.py
+
+"""
+Cache of rule verdicts for paragraph texts, shared across documents.
+
+Documents often repeat boilerplate paragraphs, so the verdict of a rule on a
+paragraph is cached under (paragraph hash, rule ID, rule fingerprint). A rule
+fingerprint is a content hash of its definition, so editing a rule never
+reuses verdicts of its old version. Verdicts are kept in a bounded in-memory
+LRU tier and, when enabled, in the paragraph_verdicts collection so that they
+survive restarts and are shared between processes.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import PyMongoError
+
+from app.extensions import mongo
+
+logger = logging.getLogger(__name__)
+
+# (paragraph hash, rule ID, rule fingerprint)
+VerdictKey = Tuple[str, str, str]
+
+
+class VerdictCache:
+    """Two-tier LRU cache of rule verdicts keyed by paragraph hash and rule version"""
+
+    def __init__(self, max_size: int = 100000, persistent: bool = False):
+        """
+        Initialize the verdict cache
+
+        Args:
+            max_size: Maximum number of verdicts kept in memory
+            persistent: Also store verdicts in the paragraph_verdicts collection
+        """
+        self.max_size = max_size
+        self.persistent = persistent
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: Iterable[VerdictKey]) -> Dict[VerdictKey, bool]:
+        """
+        Look up cached verdicts
+
+        Args:
+            keys: Verdict keys to look up
+
+        Returns:
+            Mapping of key to verdict (True if the rule is violated) for the
+            keys found in either tier
+        """
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                verdict = self._entries.get(key)
+                if verdict is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = verdict
+            self.hits += len(found)
+
+        if missing and self.persistent:
+            stored = self._load(missing)
+            if stored:
+                found.update(stored)
+                self._remember(stored)
+                missing = [key for key in missing if key not in stored]
+            with self._lock:
+                self.persistent_hits += len(stored)
+
+        with self._lock:
+            self.misses += len(missing)
+        return found
+
+    def put_many(self, verdicts: Dict[VerdictKey, bool]) -> None:
+        """
+        Store verdicts in both tiers
+
+        Args:
+            verdicts: Mapping of key to verdict (True if the rule is violated)
+        """
+        if not verdicts:
+            return
+        self._remember(verdicts)
+        if self.persistent:
+            self._store(verdicts)
+
+    def stats(self) -> Dict:
+        """Get hit and miss counters"""
+        with self._lock:
+            lookups = self.hits + self.persistent_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "persistent": self.persistent,
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.persistent_hits) / lookups if lookups else 0.0
+            }
+
+    def clear(self) -> None:
+        """Drop the in-memory verdicts and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.persistent_hits = self.misses = 0
+
+    def _remember(self, verdicts: Dict[VerdictKey, bool]) -> None:
+        with self._lock:
+            for key, verdict in verdicts.items():
+                self._entries[key] = verdict
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _load(self, keys: Iterable[VerdictKey]) -> Dict[VerdictKey, bool]:
+        keys_by_id = {_document_id(key): key for key in keys}
+        try:
+            cursor = mongo.db.paragraph_verdicts.find({"_id": {"$in": list(keys_by_id)}}, {"verdict": 1})
+            return {keys_by_id[doc["_id"]]: bool(doc["verdict"]) for doc in cursor}
+        except PyMongoError as e:
+            logger.warning(f"Could not load paragraph verdicts: {str(e)}")
+            return {}
+
+    def _store(self, verdicts: Dict[VerdictKey, bool]) -> None:
+        operations = [
+            UpdateOne({"_id": _document_id(key)}, {"$setOnInsert": {"verdict": verdict}}, upsert=True)
+            for key, verdict in verdicts.items()
+        ]
+        try:
+            mongo.db.paragraph_verdicts.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            logger.warning(f"Could not store paragraph verdicts: {str(e)}")
+
+
+def _document_id(key: VerdictKey) -> str:
+    """Get the paragraph_verdicts _id for a key, with the rule ID last since it may contain ':'"""
+    paragraph_hash, rule_id, fingerprint = key
+    return f"{paragraph_hash}:{fingerprint}:{rule_id}"
+
+
+# Singleton instance
+_verdict_cache_instance = None
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Get or create the verdict cache singleton instance"""
+    global _verdict_cache_instance
+    if _verdict_cache_instance is None:
+        _verdict_cache_instance = VerdictCache()
+    return _verdict_cache_instance
+
+
+def init_verdict_cache(app) -> VerdictCache:
+    """
+    Configure the verdict cache for the application
+
+    Args:
+        app: Flask application instance
+    """
+    cache = get_verdict_cache()
+    cache.max_size = app.config.get('VERDICT_CACHE_SIZE', 100000)
+    cache.persistent = app.config.get('VERDICT_CACHE_PERSISTENT', False)
+    cache.clear()
+    return cache
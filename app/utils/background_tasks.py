@@ -1,16 +1,54 @@
 """
 Background task processing utilities.
+
+Tasks are stored in the durable job queue, so their status is visible from
+every process and they survive restarts. A fixed number of queue consumer
+threads, in the web processes or in separate worker processes, run them.
+Enqueuing is refused or waits while too many tasks are queued, and finished
+tasks expire after a TTL.
+
+Cancellation and timeouts are cooperative: a long-running task should call
+raise_if_cancelled() (or check is_cancelled()) between steps.
 """
-import threading
-import uuid
-import time
+import importlib
 import logging
+import time
+from datetime import timezone
 from functools import wraps
 
+from pymongo.errors import PyMongoError
+
+from app.services.job_queue import (
+    TaskCancelled,
+    get_job_queue,
+    is_cancelled,
+    raise_if_cancelled,
+    register_handler
+)
+from app.utils.error_handler import QueueFullError
+
+# Public API, including the cancellation helpers re-exported for tasks
+__all__ = [
+    'TaskStatus', 'BackgroundTask', 'run_in_background', 'get_task', 'get_task_status',
+    'cancel_task', 'update_task_progress', 'clean_old_tasks', 'init_background_tasks',
+    'TaskCancelled', 'is_cancelled', 'raise_if_cancelled'
+]
+
 logger = logging.getLogger(__name__)
 
-# Store for background tasks
-_tasks = {}
+# Task kind of background function calls in the job queue
+TASK_KIND = "background_task"
+
+# Functions decorated with run_in_background, by "module:qualname"
+_functions = {}
+
+# Limits set by init_background_tasks
+_settings = {
+    "max_queued": 1000,  # queued tasks from which enqueuing is refused or waits (0 for no limit)
+    "queue_full": "reject",  # "reject" or "wait" when the queue is full
+    "enqueue_timeout": 10,  # seconds to wait for room in the queue
+    "timeout": 3600,  # default seconds a task may run (0 for no limit)
+}
 
 class TaskStatus:
     """Task status constants."""
@@ -18,6 +56,7 @@ class TaskStatus:
     RUNNING = "running"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 class BackgroundTask:
     """Background task representation."""
@@ -30,7 +69,19 @@ class BackgroundTask:
         self.progress = 0
         self.start_time = None
         self.end_time = None
-        self.created_at = time.time()
+        self.created_at = None
+
+    @classmethod
+    def from_queue(cls, document):
+        """Create a task from its job queue document."""
+        task = cls(document["_id"], document["payload"].get("name"), document["status"])
+        task.result = document.get("result")
+        task.error = document.get("error")
+        task.progress = document.get("progress", 0)
+        task.start_time = _timestamp(document.get("started_at"))
+        task.end_time = _timestamp(document.get("finished_at"))
+        task.created_at = _timestamp(document.get("created_at"))
+        return task
 
     def to_dict(self):
         """Convert task to dictionary."""
@@ -47,102 +98,151 @@ class BackgroundTask:
             "duration": (self.end_time - self.start_time) if self.end_time and self.start_time else None
         }
 
-def run_in_background(name):
+def _timestamp(value):
+    """Convert a stored UTC datetime to a Unix timestamp."""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+def run_in_background(name, timeout=None):
     """
     Decorator to run a function in the background.
-    
+
+    The decorated function must be defined at module level, and its
+    arguments and return value must be BSON-serializable, since they are
+    stored in the job queue and the call may run in another process.
+    Calling it returns the task ID, or raises QueueFullError when too many
+    tasks are queued.
+
     Args:
         name: Name of the task
-    
+        timeout: Seconds a run may take before it is failed and asked to
+            stop (defaults to BACKGROUND_TASK_TIMEOUT)
+
     Returns:
         Decorator function
     """
     def decorator(func):
+        function_key = f"{func.__module__}:{func.__qualname__}"
+        _functions[function_key] = func
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            task_id = str(uuid.uuid4())
-            task = BackgroundTask(task_id, name)
-            _tasks[task_id] = task
-            
-            def target():
-                task.status = TaskStatus.RUNNING
-                task.start_time = time.time()
-                try:
-                    # Run the function
-                    result = func(*args, **kwargs)
-                    task.result = result
-                    task.status = TaskStatus.COMPLETED
-                except Exception as e:
-                    logger.exception(f"Background task {task_id} failed")
-                    task.error = str(e)
-                    task.status = TaskStatus.FAILED
-                finally:
-                    task.end_time = time.time()
-            
-            # Start the thread
-            thread = threading.Thread(target=target)
-            thread.daemon = True
-            thread.start()
-            
-            return task_id
+            queue = get_job_queue()
+            _wait_for_room(queue)
+            return queue.enqueue(TASK_KIND, {
+                "name": name,
+                "function": function_key,
+                "args": list(args),
+                "kwargs": kwargs
+            }, timeout=timeout if timeout is not None else (_settings["timeout"] or None))
         return wrapper
     return decorator
 
+def _wait_for_room(queue):
+    """Apply backpressure while the queue holds too many tasks."""
+    max_queued = _settings["max_queued"]
+    if not max_queued:
+        return
+    deadline = time.monotonic() + _settings["enqueue_timeout"]
+    delay = 0.05
+    # A soft limit: concurrent callers may overshoot it slightly
+    while queue.count_pending(TASK_KIND) >= max_queued:
+        if _settings["queue_full"] != "wait" or time.monotonic() >= deadline:
+            raise QueueFullError(f"Too many queued tasks ({max_queued}), try again later")
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
+
+def _run_task(task):
+    """Run a queued background call in a queue consumer."""
+    payload = task["payload"]
+    function_key = payload["function"]
+    if function_key not in _functions:
+        # Importing the module applies its run_in_background decorators
+        importlib.import_module(function_key.split(":", 1)[0])
+    return _functions[function_key](*payload["args"], **payload["kwargs"])
+
+register_handler(TASK_KIND, _run_task)
+
 def get_task(task_id):
     """
     Get a task by ID.
-    
+
     Args:
         task_id: ID of the task
-    
+
     Returns:
         Task object or None if not found
     """
-    return _tasks.get(task_id)
+    document = get_job_queue().get(task_id)
+    if document is None or document["kind"] != TASK_KIND:
+        return None
+    return BackgroundTask.from_queue(document)
 
 def get_task_status(task_id):
     """
     Get the status of a task.
-    
+
     Args:
         task_id: ID of the task
-    
+
     Returns:
         Task status dictionary or None if not found
     """
-    task = _tasks.get(task_id)
+    task = get_task(task_id)
     if task:
         return task.to_dict()
     return None
 
+def cancel_task(task_id):
+    """
+    Cancel a task.
+
+    A queued task never runs; a running task stops at its next
+    cancellation check.
+
+    Args:
+        task_id: ID of the task
+
+    Returns:
+        True if the task was queued or running
+    """
+    return get_job_queue().cancel(task_id)
+
 def update_task_progress(task_id, progress):
     """
     Update the progress of a task.
-    
+
     Args:
         task_id: ID of the task
         progress: Progress value (0-100)
     """
-    task = _tasks.get(task_id)
-    if task:
-        task.progress = progress
+    get_job_queue().set_progress(task_id, progress)
 
 def clean_old_tasks(max_age=86400):  # Default: 24 hours
     """
     Clean up old completed tasks.
-    
+
     Args:
         max_age: Maximum age in seconds
     """
-    current_time = time.time()
-    to_remove = []
-    
-    for task_id, task in _tasks.items():
-        if task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
-            if current_time - task.created_at > max_age:
-                to_remove.append(task_id)
-    
-    for task_id in to_remove:
-        del _tasks[task_id]
-    
-    logger.info(f"Cleaned up {len(to_remove)} old tasks")
+    removed = get_job_queue().purge(max_age, kind=TASK_KIND)
+    logger.info(f"Cleaned up {removed} old tasks")
+
+def init_background_tasks(app):
+    """
+    Configure background task limits for the application.
+
+    Args:
+        app: Flask application instance
+    """
+    _settings.update(
+        max_queued=app.config.get('BACKGROUND_TASK_MAX_QUEUED', 1000),
+        queue_full=app.config.get('BACKGROUND_TASK_QUEUE_FULL', 'reject'),
+        enqueue_timeout=app.config.get('BACKGROUND_TASK_ENQUEUE_TIMEOUT', 10),
+        timeout=app.config.get('BACKGROUND_TASK_TIMEOUT', 3600)
+    )
+    try:
+        get_job_queue().expire_finished(TASK_KIND, app.config.get('BACKGROUND_TASK_TTL', 86400))
+    except PyMongoError as e:
+        logger.warning(f"Could not set up expiry of finished background tasks: {str(e)}")
@@ -83,3 +83,13 @@ class AuthorizationError(AppError):
     """Authorization error."""
     def __init__(self, message="Not authorized", payload=None):
         super().__init__(message, 403, payload)
+
+class ServiceUnavailableError(AppError):
+    """A service the request needs is not running."""
+    def __init__(self, message="Service unavailable, try again later", payload=None):
+        super().__init__(message, 503, payload)
+
+class QueueFullError(AppError):
+    """Too much queued work to accept more."""
+    def __init__(self, message="Too many queued tasks, try again later", payload=None):
+        super().__init__(message, 503, payload)
@@ -0,0 +1,175 @@
+"""
+File format detection from the leading bytes of a file.
+
+Uploads are often mislabelled, so the extension alone cannot pick the parser.
+Only the first few KB are read: binary formats are recognized by their magic
+bytes, text formats by how their content starts, and anything else that is
+not text is rejected before any parser runs.
+"""
+import os
+import re
+from typing import Optional
+
+# Bytes read from the start of a file to detect its format
+SNIFF_BYTES = 8192
+
+# Extensions handled as text, which a text-like file may carry whatever it holds
+TEXT_EXTENSIONS = ('.txt', '.csv', '.html', '.htm', '.xml', '.json', '.eml')
+
+# Extensions of binary formats, whose parsers fail on plain text
+BINARY_EXTENSIONS = ('.pdf', '.docx', '.xlsx', '.xls', '.pptx', '.ppt', '.doc')
+
+# Extensions each detected format may carry; the first is used for dispatch
+# when the declared extension does not fit the content
+FORMAT_EXTENSIONS = {
+    'pdf': ('.pdf',),
+    'docx': ('.docx',),
+    'xlsx': ('.xlsx', '.xls'),
+    'pptx': ('.pptx', '.ppt'),
+    # ZIP archives whose OOXML part names lie beyond the sniffed bytes
+    'zip': ('.docx', '.xlsx', '.xls', '.pptx', '.ppt'),
+    # Legacy Office documents
+    'ole': ('.doc', '.xls', '.ppt'),
+    'rtf': ('.rtf',),
+    'html': ('.html',) + TEXT_EXTENSIONS,
+    'xml': ('.xml',) + TEXT_EXTENSIONS,
+    'json': ('.json',) + TEXT_EXTENSIONS,
+    'eml': ('.eml',) + TEXT_EXTENSIONS,
+    'text': TEXT_EXTENSIONS,
+}
+
+_OOXML_PARTS = ((b'word/', 'docx'), (b'xl/', 'xlsx'), (b'ppt/', 'pptx'))
+
+_EMAIL_HEADERS = re.compile(
+    r'^(?:[A-Za-z][A-Za-z0-9-]*:[^\n]*\n(?:[ \t][^\n]*\n)*){2,}', re.ASCII
+)
+_KNOWN_EMAIL_HEADER = re.compile(
+    r'^(?:from|to|subject|date|received|return-path|message-id|mime-version|delivered-to):',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Share of undecodable or control characters above which content is binary
+_BINARY_THRESHOLD = 0.1
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """
+    Detect the format of a file from its first bytes
+
+    Args:
+        head: Leading bytes of the file (SNIFF_BYTES is enough)
+
+    Returns:
+        Format name (a key of FORMAT_EXTENSIONS), or None for binary content
+        that no extractor handles
+    """
+    # PDF readers accept a header within the first KB
+    if b'%PDF-' in head[:1024]:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        for part, name in _OOXML_PARTS:
+            if part in head:
+                return name
+        return 'zip'
+    if head.startswith(b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'):
+        return 'ole'
+
+    text = _decode_text(head)
+    if text is None:
+        return None
+
+    start = text.lstrip()
+    if start.startswith('{\\rtf'):
+        return 'rtf'
+    lowered = start[:1024].lower()
+    if lowered.startswith(('<!doctype html', '<html')) or (
+        lowered.startswith('<') and re.search(r'<(?:html|head|body)[\s>]', lowered)
+    ):
+        return 'html'
+    if lowered.startswith('<'):
+        return 'xml'
+    if start.startswith(('{', '[')):
+        return 'json'
+    if _EMAIL_HEADERS.match(text.replace('\r\n', '\n')) and _KNOWN_EMAIL_HEADER.search(text):
+        return 'eml'
+    return 'text'
+
+
+def sniff_file(file_path: str, file_content: bytes = None) -> Optional[str]:
+    """
+    Detect the format of a file, reading only its first SNIFF_BYTES
+
+    Args:
+        file_path: Path to the file, read when no content is given
+        file_content: Optional bytes content of the file
+
+    Returns:
+        Format name, or None for unsupported binary content
+    """
+    if file_content is not None:
+        return sniff_format(file_content[:SNIFF_BYTES])
+    with open(file_path, 'rb') as f:
+        return sniff_format(f.read(SNIFF_BYTES))
+
+
+def resolve_extension(detected: Optional[str], extension: str) -> Optional[str]:
+    """
+    Pick the extension a file should be handled as
+
+    Args:
+        detected: Format returned by sniff_format
+        extension: Declared extension, lower case with the leading dot
+
+    Returns:
+        The declared extension if it fits the content, otherwise the
+        extension of the detected format; None for unsupported binary content
+    """
+    if detected is None:
+        return None
+    extensions = FORMAT_EXTENSIONS[detected]
+    if extension in extensions:
+        return extension
+    if detected == 'text':
+        # Plain text is read as text unless labelled as a binary format
+        return '.txt' if extension in BINARY_EXTENSIONS else extension
+    return extensions[0]
+
+
+def detect_extension(filename: str, head: bytes) -> Optional[str]:
+    """
+    Sniff a file's leading bytes and pick the extension to handle it as
+
+    Args:
+        filename: Declared file name
+        head: Leading bytes of the file
+
+    Returns:
+        Extension with the leading dot, or None for unsupported binary content
+    """
+    _, extension = os.path.splitext(filename)
+    return resolve_extension(sniff_format(head), extension.lower())
+
+
+def _decode_text(head: bytes) -> Optional[str]:
+    """Decode leading bytes as text, or return None if they look binary"""
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return head.decode('utf-16', errors='replace')
+    if head.startswith(b'\xef\xbb\xbf'):
+        head = head[3:]
+    if b'\x00' in head:
+        return None
+
+    # The sniffed bytes may end inside a multi-byte character
+    text = head.decode('utf-8', errors='replace')
+    if not text:
+        return text
+    suspicious = text.count('\ufffd') + sum(
+        1 for char in text if char < ' ' and char not in '\t\n\r\x0c'
+    )
+    if suspicious / len(text) > _BINARY_THRESHOLD:
+        # Latin-1 text decodes with replacements but has no control characters
+        latin = head.decode('latin-1')
+        if sum(1 for char in latin if char < ' ' and char not in '\t\n\r\x0c') / len(latin) > _BINARY_THRESHOLD:
+            return None
+        return latin
+    return text
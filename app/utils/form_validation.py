@@ -5,6 +5,7 @@ import re
 from functools import wraps
 from flask import request, flash, redirect, current_app
 from app.utils.error_handler import ValidationError
+from app.utils.file_types import SNIFF_BYTES, detect_extension
 
 def validate_document_upload(f):
     """Decorator to validate document uploads."""
@@ -35,6 +36,14 @@ def validate_document_upload(f):
                 flash(f'File too large. Maximum size: {max_size / (1024 * 1024):.1f}MB', 'error')
                 return redirect(request.url)
             
+            # Check that the content matches an allowed format, from its first bytes only
+            head = file.stream.read(SNIFF_BYTES)
+            file.stream.seek(0)
+            handled_ext = detect_extension(file.filename, head)
+            if handled_ext is None or handled_ext[1:] not in allowed_extensions:
+                flash('File content does not match an allowed document type', 'error')
+                return redirect(request.url)
+            
         return f(*args, **kwargs)
     return decorated_function
 
@@ -0,0 +1,248 @@
+"""
+Multi-pattern text matchers used by the rule engine.
+"""
+import logging
+from collections import deque
+from typing import Dict, Hashable, Iterable, Pattern, Set
+
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parser
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parser
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over the keywords of many rules.
+
+    A single pass over the text reports every key (typically a rule index)
+    with at least one keyword occurring as a substring, which is equivalent to
+    running ``keyword in text`` for each keyword separately.
+    """
+
+    def __init__(self, keywords_by_key: Dict[Hashable, Iterable[str]]):
+        """
+        Build the automaton
+
+        Args:
+            keywords_by_key: Mapping of key to the keywords that satisfy it.
+                Keywords are matched verbatim, so lowercase them beforehand
+                for case-insensitive matching.
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        # Keys with an empty keyword are satisfied by any text
+        self._always = set()
+
+        for key, keywords in keywords_by_key.items():
+            for keyword in keywords:
+                if keyword:
+                    self._add(keyword, key)
+                else:
+                    self._always.add(key)
+
+        self._build_failure_links()
+        self._output = [frozenset(keys) for keys in self._output]
+        self.keyword_count = sum(1 for keys in self._output if keys)
+
+    def _add(self, keyword: str, key: Hashable) -> None:
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._goto[state][ch] = next_state
+            state = next_state
+        self._output[state].add(key)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit matches that end at the same position
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def matches(self, text: str) -> Set[Hashable]:
+        """
+        Find the keys with at least one keyword present in the text
+
+        Args:
+            text: Text to scan (lowercased if keywords were lowercased)
+
+        Returns:
+            Set of matched keys
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set(self._always)
+        state = 0
+
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found |= output[state]
+
+        return found
+
+
+class RegexSetMatcher:
+    """
+    Find which of many regex patterns occur in a text with a single scan.
+
+    Every pattern is parsed once into a requirement on the literal strings a
+    match must contain (all literals of a sequence, any branch of an
+    alternation), kept as a short list of literal sets of which at least one
+    must be fully present. One KeywordMatcher pass over the lowercased text finds the
+    literals present, and only patterns whose requirement holds are searched.
+    Patterns without usable literals are always searched, as are all patterns
+    when the text contains characters that case-fold onto ASCII letters.
+    """
+
+    def __init__(self, patterns_by_key: Dict[Hashable, Pattern]):
+        """
+        Build the prefilter
+
+        Args:
+            patterns_by_key: Mapping of key to compiled pattern
+        """
+        self._patterns = dict(patterns_by_key)
+        self._requirements = {}
+        self._keys_by_literal = {}
+        self._always = []
+
+        for key, pattern in self._patterns.items():
+            requirement = _pattern_requirement(pattern)
+            if requirement is None:
+                self._always.append(key)
+                continue
+            self._requirements[key] = requirement
+            for literal in frozenset().union(*requirement):
+                self._keys_by_literal.setdefault(literal, set()).add(key)
+
+        self._prefilter = None
+        if self._keys_by_literal:
+            self._prefilter = KeywordMatcher({literal: (literal,) for literal in self._keys_by_literal})
+        self.prefiltered_count = len(self._requirements)
+
+    def matches(self, text: str, text_lower: str = None) -> Set[Hashable]:
+        """
+        Find the keys whose pattern occurs in the text
+
+        Args:
+            text: Text to scan
+            text_lower: ``text.lower()``, if the caller already has it
+
+        Returns:
+            Set of matched keys
+        """
+        if self._prefilter is None or not _FOLDS_TO_ASCII.isdisjoint(text):
+            candidates = self._patterns.keys()
+        else:
+            if text_lower is None:
+                text_lower = text.lower()
+            found = self._prefilter.matches(text_lower)
+            candidates = set(self._always)
+            for literal in found:
+                candidates |= self._keys_by_literal[literal]
+            requirements = self._requirements
+            candidates = [
+                key for key in candidates
+                if key not in requirements or any(term <= found for term in requirements[key])
+            ]
+
+        patterns = self._patterns
+        return {key for key in candidates if patterns[key].search(text)}
+
+
+# Non-ASCII characters that match ASCII letters case-insensitively
+_FOLDS_TO_ASCII = frozenset("\u0130\u0131\u017f\u212a")
+
+# Shorter literals are too common to rule anything out
+_MIN_LITERAL_LENGTH = 3
+
+# Cap on the literal sets kept per pattern requirement
+_MAX_REQUIREMENT_TERMS = 32
+
+_REPEATS = tuple(
+    op for op in (
+        _sre_constants.MAX_REPEAT,
+        _sre_constants.MIN_REPEAT,
+        getattr(_sre_constants, "POSSESSIVE_REPEAT", None),
+    ) if op is not None
+)
+
+
+def _pattern_requirement(pattern: Pattern):
+    """
+    Get the literal requirement every match of a pattern satisfies
+
+    Returns:
+        List of frozensets of lowercase literals, at least one of which is
+        fully contained in any text the pattern matches, or None if no
+        literal is required
+    """
+    try:
+        parsed = _sre_parser.parse(pattern.pattern, pattern.flags)
+    except Exception as e:
+        logger.debug(f"Could not parse pattern for prefiltering: {str(e)}")
+        return None
+    return _sequence_requirement(parsed)
+
+
+def _sequence_requirement(items):
+    """Requirement of a sequence of parsed regex items, or None"""
+    terms = [frozenset()]
+    run = []
+
+    def require(alternatives):
+        nonlocal terms
+        combined = {term | alternative for term in terms for alternative in alternatives}
+        # Leaving out a part of a sequence only weakens the requirement,
+        # so parts that would blow up the term list are skipped
+        if len(combined) <= _MAX_REQUIREMENT_TERMS:
+            terms = list(combined)
+
+    def end_run():
+        if len(run) >= _MIN_LITERAL_LENGTH:
+            require([frozenset(["".join(run)])])
+        run.clear()
+
+    for op, av in items:
+        if op is _sre_constants.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+
+        end_run()
+        requirement = None
+        if op is _sre_constants.SUBPATTERN:
+            requirement = _sequence_requirement(av[-1])
+        elif op is _sre_constants.BRANCH:
+            branches = [_sequence_requirement(branch) for branch in av[1]]
+            if all(branches):
+                requirement = [term for branch in branches for term in branch]
+        elif op in _REPEATS and av[0] >= 1:
+            requirement = _sequence_requirement(av[2])
+        if requirement is not None and len(requirement) <= _MAX_REQUIREMENT_TERMS:
+            require(requirement)
+
+    end_run()
+    if terms == [frozenset()]:
+        return None
+    return terms
@@ -7,46 +7,251 @@ Tailored for processing healthcare-related documents with a focus on compliance
 
 import io
 import logging
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List
 
 # Common libraries for PDF processing
 from PyPDF2 import PdfReader
 
 logger = logging.getLogger(__name__)
 
+
+class PdfDocument:
+    """
+    PDF opened for page-by-page text extraction.
+
+    Uses PyMuPDF when available (better text extraction) and falls back to
+    PyPDF2. Pages are only extracted when iterated, so a single page's text is
+    held at a time.
+    """
+
+    def __init__(self, file_path: str, file_content: bytes = None):
+        """
+        Open a PDF file
+
+        Args:
+            file_path: Path to the PDF file
+            file_content: Optional bytes content of the PDF file
+        """
+        self._file_path = file_path
+        self._file_content = file_content
+        self._temp_path = None
+        self._file_object = None
+        try:
+            import fitz  # PyMuPDF
+
+            if file_content:
+                self._doc = fitz.open(stream=file_content, filetype="pdf")
+            else:
+                self._doc = fitz.open(file_path)
+            self.engine = "pymupdf"
+        except ImportError:
+            if file_content:
+                self._file_object = io.BytesIO(file_content)
+            else:
+                self._file_object = open(file_path, "rb")
+            self._doc = PdfReader(self._file_object)
+            self.engine = "pypdf2"
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the document"""
+        if self.engine == "pymupdf":
+            return len(self._doc)
+        return len(self._doc.pages)
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Document information and page count"""
+        if self.engine == "pymupdf":
+            info = self._doc.metadata or {}
+            return {
+                "page_count": len(self._doc),
+                "author": info.get("author", ""),
+                "title": info.get("title", ""),
+                "subject": info.get("subject", ""),
+                "creator": info.get("creator", ""),
+                "producer": info.get("producer", ""),
+                "creation_date": info.get("creationDate", ""),
+                "modification_date": info.get("modDate", ""),
+                # Form fields suggest medical forms
+                "has_form": any(next(page.widgets(), None) is not None for page in self._doc),
+            }
+
+        metadata = {}
+        if self._doc.metadata:
+            for key, value in self._doc.metadata.items():
+                clean_key = key[1:] if key.startswith("/") else key
+                metadata[clean_key] = value
+        metadata["page_count"] = len(self._doc.pages)
+        return metadata
+
+    def page_text(self, page_index: int) -> str:
+        """Extract the text of a single page (0-based index)"""
+        if self.engine == "pymupdf":
+            return self._doc[page_index].get_text()
+        return self._doc.pages[page_index].extract_text() or ""
+
+    def iter_page_texts(self, start: int = 0, stop: int = None) -> Iterator[str]:
+        """Yield the text of each page in order, one page at a time"""
+        stop = self.page_count if stop is None else min(stop, self.page_count)
+        for page_index in range(start, stop):
+            yield self.page_text(page_index)
+
+    def render_page_png(self, page_index: int, dpi: int = 300, timeout: float = 60) -> bytes:
+        """
+        Rasterize a single page (0-based index) to PNG
+
+        Uses PyMuPDF when available, otherwise poppler's pdftoppm.
+
+        Args:
+            page_index: Page to render
+            dpi: Resolution of the image
+            timeout: Seconds after which pdftoppm is stopped
+
+        Returns:
+            PNG image bytes
+        """
+        if self.engine == "pymupdf":
+            return self._doc[page_index].get_pixmap(dpi=dpi).tobytes("png")
+
+        if self._file_content and self._temp_path is None:
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                f.write(self._file_content)
+                self._temp_path = f.name
+        page_num = str(page_index + 1)
+        completed = subprocess.run(
+            ["pdftoppm", "-f", page_num, "-l", page_num, "-r", str(dpi), "-png", "-singlefile",
+             self._temp_path or self._file_path],
+            capture_output=True, timeout=timeout, check=True
+        )
+        return completed.stdout
+
+    def close(self) -> None:
+        """Release the document and its file"""
+        if self.engine == "pymupdf":
+            self._doc.close()
+        if self._file_object is not None:
+            self._file_object.close()
+        if self._temp_path is not None:
+            os.unlink(self._temp_path)
+            self._temp_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the texts of a range of pages in a worker process"""
+    with PdfDocument(file_path) as pdf:
+        return list(pdf.iter_page_texts(start, stop))
+
+
+class PdfPagePool:
+    """Lazily started process pool, shared across documents, that extracts PDF pages"""
+
+    def __init__(self, max_workers: int = 0):
+        """
+        Initialize the page pool
+
+        Args:
+            max_workers: Number of worker processes (0 or 1 disables the pool)
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def iter_page_texts(
+        self, file_path: str, file_content: bytes, page_count: int, pages_per_task: int = None
+    ) -> Iterator[str]:
+        """
+        Extract page texts across the worker processes, yielding them in page order.
+
+        Each worker opens the file itself, so no PDF objects cross processes.
+
+        Args:
+            file_path: Path to the PDF file
+            file_content: Optional bytes content of the PDF file
+            page_count: Number of pages in the document
+            pages_per_task: Pages extracted per task (defaults to a quarter of
+                each worker's share)
+
+        Yields:
+            Text of each page, in order
+        """
+        if not pages_per_task:
+            pages_per_task = max(1, -(-page_count // (self.max_workers * 4)))
+
+        temp_path = None
+        if file_content:
+            # Workers read the file from disk rather than receiving the bytes per task
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                f.write(file_content)
+                temp_path = file_path = f.name
+
+        futures = []
+        try:
+            executor = self._get_executor()
+            futures = [
+                executor.submit(_extract_page_range, file_path, start, min(start + pages_per_task, page_count))
+                for start in range(0, page_count, pages_per_task)
+            ]
+            for future in futures:
+                yield from future.result()
+        except BrokenProcessPool:
+            # A worker died; the next document gets a fresh pool
+            self.shutdown()
+            raise
+        finally:
+            # Tasks of an abandoned or failed document must not outlive its file
+            for future in futures:
+                future.cancel()
+            if temp_path:
+                os.unlink(temp_path)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; they are restarted on next use"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawned workers start clean instead of forking a process
+                # that runs database monitor and queue consumer threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+
 def extract_text_from_pdf(file_path: str, file_content: bytes = None) -> str:
     """
     Extract full text content from a PDF file with enhanced handling for medical documents.
-    
+
     Args:
         file_path: Path to the PDF file
         file_content: Optional bytes content of the PDF file
-        
+
     Returns:
         Extracted text as a string
     """
     try:
-        if file_content:
-            # Use bytes content if provided
-            file_object = io.BytesIO(file_content)
-        else:
-            # Otherwise open file from path
-            file_object = open(file_path, 'rb')
-        
-        # Create PDF reader object
-        pdf_reader = PdfReader(file_object)
-        
-        # Extract text from each page
-        text = ""
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text() + "\n\n"
-        
-        # Close file if it was opened from path
-        if not file_content:
-            file_object.close()
-            
-        return text
-    
+        with PdfDocument(file_path, file_content) as pdf:
+            # Assemble once instead of re-copying the text for every page
+            return "".join(page_text + "\n\n" for page_text in pdf.iter_page_texts())
+
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
-        raise Exception(f"Failed to extract text from PDF: {str(e)}")
\ No newline at end of file
+        raise Exception(f"Failed to extract text from PDF: {str(e)}")
@@ -11,7 +11,7 @@ from functools import wraps
 csrf = CSRFProtect()
 
 # Export csrf for use in other modules
-__all__ = ['csrf', 'init_security', 'sanitize_input', 'validate_id', 'require_api_key']
+__all__ = ['csrf', 'init_security', 'sanitize_input', 'validate_id', 'validate_query_filter', 'require_api_key']
 
 def init_security(app):
     """
@@ -23,8 +23,10 @@ def init_security(app):
     # Enable CSRF protection
     csrf.init_app(app)
     
-    # Exempt API routes from CSRF protection
-    csrf.exempt("api_bp")
+    # Exempt API routes from CSRF protection (they authenticate with API keys);
+    # the blueprint object is needed, a string is taken as a view name
+    from app.routes.api import api_bp
+    csrf.exempt(api_bp)
     
     # Set secure headers
     @app.after_request
@@ -94,6 +96,28 @@ def validate_id(id_string):
     # Basic validation for MongoDB ObjectId or UUID
     return bool(re.match(r'^[a-zA-Z0-9\-_]{3,64}$', str(id_string)))
 
+# Query operators that run server-side JavaScript
+_UNSAFE_QUERY_OPERATORS = {'$where', '$function', '$accumulator'}
+
+def validate_query_filter(query):
+    """
+    Validate that a client-supplied MongoDB filter is safe to run.
+    
+    Args:
+        query: Filter document to validate
+        
+    Returns:
+        True if valid, False otherwise
+    """
+    if isinstance(query, dict):
+        return all(
+            isinstance(key, str) and key not in _UNSAFE_QUERY_OPERATORS and validate_query_filter(value)
+            for key, value in query.items()
+        )
+    if isinstance(query, list):
+        return all(validate_query_filter(value) for value in query)
+    return True
+
 def require_api_key(f):
     """
     Decorator to require an API key for a route.
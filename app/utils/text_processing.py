@@ -7,7 +7,7 @@ Focused on extracting structured information from healthcare and compliance docu
 
 import logging
 import re
-from typing import Any, Dict, List  # noqa: F401
+from typing import Any, Dict, Iterable, List, Tuple  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +27,146 @@ def split_into_paragraphs(text: str) -> List[str]:  # noqa: D212, D400, D415
     clean_paragraphs = []
     for para in paragraphs:
         # Remove excessive whitespace and join lines within paragraphs
-        cleaned = re.sub(r'\s+', ' ', para).strip()
+        cleaned = ' '.join(para.split())
         if cleaned:  # Skip empty paragraphs
             clean_paragraphs.append(cleaned)
 
     return clean_paragraphs  # noqa: W293
 
+
+# Runs that cleaning collapses; the literal prefixes let re scan for them quickly
+_NEWLINE_RUN = re.compile(r'\n\n\n+')
+_SPACE_RUN = re.compile(r'  +')
+
+# NULs and control characters other than tabs, newlines and carriage returns
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]+')
+_CONTROL_DELETIONS = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+
+# Whitespace and control characters; trailing ones may continue in the next chunk
+_SOFT_CHARS = (
+    ''.join(map(chr, range(0x20))) + ' \x7f\x85\xa0\u1680' + ''.join(map(chr, range(0x2000, 0x200b)))
+    + '\u2028\u2029\u202f\u205f\u3000'
+)
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+def _clean(text: str) -> str:
+    """Collapse newline and space runs, then drop control characters"""
+    if '\n\n\n' in text:
+        text = _NEWLINE_RUN.sub('\n\n', text)
+    if '  ' in text:
+        text = _SPACE_RUN.sub(' ', text)
+    # translate is fastest for ASCII text but slow for anything else
+    if text.isascii():
+        return text.translate(_CONTROL_DELETIONS)
+    return _CONTROL_CHARS.sub('', text)
+
+
+def normalize_text(text: str) -> str:
+    """Clean extracted text.
+
+    Collapses runs of three or more newlines to a blank line and runs of
+    spaces to one space, removes NULs and control characters (except tabs,
+    newlines and carriage returns) and strips the result. Steps with nothing
+    to do are skipped.
+
+    Args:
+        text: Raw text to clean
+
+    Returns:
+        Cleaned text
+    """
+    if not text:
+        return ''
+    return _clean(text).strip()
+
+
+class TextNormalizer:
+    """Normalizer for text arriving in chunks.
+
+    Produces the text of normalize_text() and the paragraphs of
+    split_into_paragraphs() on that text in one pass over the chunks, while
+    only holding the current paragraph. Chunks are cut after the last
+    character that is neither whitespace nor a control character, so no run
+    or paragraph break straddles a cut.
+    """
+
+    def __init__(self):
+        self._pending = ''
+        self._started = False
+        self._paragraph = []
+
+    def feed(self, chunk: str) -> Tuple[str, List[str]]:
+        """Normalize the next chunk of text.
+
+        Args:
+            chunk: Next piece of the raw text
+
+        Returns:
+            Tuple containing:
+                - Cleaned text that is final so far
+                - Paragraphs completed by this chunk
+        """
+        text = self._pending + chunk
+        cut = len(text.rstrip(_SOFT_CHARS))
+        self._pending = text[cut:]
+        if not cut:
+            return '', []
+
+        cleaned = _clean(text[:cut])
+        if not self._started:
+            # Only the start of the whole text is stripped
+            cleaned = cleaned.lstrip()
+            self._started = bool(cleaned)
+
+        paragraphs = []
+        parts = _PARAGRAPH_BREAK.split(cleaned)
+        self._paragraph.append(parts[0])
+        for part in parts[1:]:
+            paragraphs.extend(self._end_paragraph())
+            self._paragraph.append(part)
+        return cleaned, paragraphs
+
+    def close(self) -> List[str]:
+        """Finish the text.
+
+        The remaining input is whitespace, which cleaning strips, so only the
+        last paragraph is left.
+
+        Returns:
+            The last paragraph, if any
+        """
+        self._pending = ''
+        return self._end_paragraph()
+
+    def _end_paragraph(self) -> List[str]:
+        paragraph = ' '.join(''.join(self._paragraph).split())
+        self._paragraph = []
+        return [paragraph] if paragraph else []
+
+
+def normalize_chunks(chunks: Iterable[str]) -> Tuple[str, List[str]]:
+    """Clean text arriving in chunks and split it into paragraphs.
+
+    Args:
+        chunks: Pieces of the raw text, in order
+
+    Returns:
+        Tuple containing:
+            - Cleaned text, as normalize_text() returns it
+            - Paragraphs, as split_into_paragraphs() returns them for that text
+    """
+    normalizer = TextNormalizer()
+    texts = []
+    paragraphs = []
+    for chunk in chunks:
+        text, completed = normalizer.feed(chunk)
+        texts.append(text)
+        paragraphs.extend(completed)
+    paragraphs.extend(normalizer.close())
+    return ''.join(texts), paragraphs
+
 def extract_paragraphs_with_ids(text: str) -> List[Dict[str, str]]:  # noqa: D212, D400, D415
     """Split text into paragraphs and assign unique IDs.
     
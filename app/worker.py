@@ -0,0 +1,110 @@
+"""
+Standalone worker for the durable job queue.
+
+Runs bulk ingestion and background tasks outside the web processes, so
+heavy extraction does not compete with request latency:
+
+    python -m app.worker --threads 4 --bulk-workers 8
+
+Web processes then set QUEUE_CONSUMER_ENABLED=False and only enqueue work.
+Bulk files are read from the upload folder if it is shared, and otherwise
+from their copy in MongoDB (BULK_STORE_FILES). On SIGTERM or SIGINT the
+worker stops claiming tasks and finishes the running ones; tasks
+still running when the shutdown timeout expires are claimed again by
+another worker once their leases expire. A second signal exits at once.
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run bulk ingestion and background tasks from the job queue")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="Background tasks run at once (default: QUEUE_CONSUMER_THREADS, 0 disables)")
+    parser.add_argument("--bulk-workers", type=int, default=None,
+                        help="Processes running bulk job files (default: BULK_WORKERS if set, "
+                             "else one per CPU; 0 disables)")
+    parser.add_argument("--shutdown-timeout", type=float, default=None,
+                        help="Seconds to let running tasks finish on shutdown (default: WORKER_SHUTDOWN_TIMEOUT)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+    config = {'QUEUE_CONSUMER_ENABLED': True}
+    if args.threads is not None:
+        config['QUEUE_CONSUMER_THREADS'] = args.threads
+    if args.bulk_workers is not None:
+        config['BULK_WORKERS'] = args.bulk_workers
+    elif 'BULK_WORKERS' not in os.environ:
+        # Web processes default to no bulk pool; a worker uses the whole host
+        config['BULK_WORKERS'] = os.cpu_count() or 1
+
+    # Creating the app starts the queue consumers
+    from app import create_app
+    from app.services.bulk_processor import get_bulk_processor
+    from app.services.job_queue import get_queue_consumer
+
+    app = create_app(config)
+    consumer = get_queue_consumer()
+    processor = get_bulk_processor()
+    shutdown_timeout = args.shutdown_timeout
+    if shutdown_timeout is None:
+        shutdown_timeout = app.config.get('WORKER_SHUTDOWN_TIMEOUT', 300)
+
+    stopping = threading.Event()
+
+    def request_stop(signum, frame):
+        if stopping.is_set():
+            logger.warning("Second signal received, exiting without waiting for running tasks")
+            _exit_now()
+        logger.info(f"Received signal {signum}, finishing running tasks")
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    logger.info(
+        f"Worker {consumer.worker_id} consuming the job queue with {app.config['QUEUE_CONSUMER_THREADS']} "
+        f"task threads and {processor.max_workers} bulk processes"
+    )
+    while not stopping.wait(1):
+        pass
+
+    # Both stop claiming at once, then wait for their running tasks in parallel
+    finished = {}
+    stoppers = [
+        threading.Thread(target=lambda: finished.update(tasks=consumer.stop(shutdown_timeout))),
+        threading.Thread(target=lambda: finished.update(bulk=processor.stop(shutdown_timeout)))
+    ]
+    for thread in stoppers:
+        thread.start()
+    for thread in stoppers:
+        thread.join()
+
+    if not all(finished.values()):
+        # Their leases expire and other workers run them again
+        logger.warning("Shutdown timeout expired with tasks still running")
+        _exit_now()
+    logger.info("Worker stopped")
+
+
+def _exit_now():
+    """Exit without waiting for worker threads and processes"""
+    logging.shutdown()
+    os._exit(1)
+
+
+if __name__ == "__main__":
+    main()
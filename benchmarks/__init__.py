@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# This file ensures that benchmarks is recognized as a Python package
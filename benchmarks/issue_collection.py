@@ -0,0 +1,38 @@
+"""
+Regression benchmark for issue collection on fully non-compliant documents.
+
+Every rule fires on every paragraph, so the number of issues grows with the
+document. Time per paragraph should stay flat as the document grows; a
+quadratic de-duplication shows up as a per-paragraph cost that grows with
+the paragraph count.
+
+Run from the project root:
+
+    python -m benchmarks.issue_collection
+"""
+import time
+
+from app.services.rule_engine import evaluate_paragraphs, get_compiled_rule_set
+
+TEXT = "This paragraph mentions none of the required clauses."
+
+
+def main():
+    rule_set = get_compiled_rule_set(["GDPR", "HIPAA"])
+
+    print(f"{'paragraphs':>10} {'issues':>8} {'time':>8} {'per paragraph':>14}")
+    for paragraph_count in (1000, 2500, 5000, 10000):
+        paragraphs = [{"id": f"p{i+1}", "text": TEXT} for i in range(paragraph_count)]
+
+        start = time.perf_counter()
+        issues, paragraphs_with_issues = evaluate_paragraphs(paragraphs, rule_set)
+        elapsed = time.perf_counter() - start
+
+        assert len(issues) == paragraph_count * len(rule_set)
+        assert len(paragraphs_with_issues) == paragraph_count
+        print(f"{paragraph_count:>10} {len(issues):>8} {elapsed:>7.3f}s "
+              f"{elapsed / paragraph_count * 1e6:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
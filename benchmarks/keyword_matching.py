@@ -0,0 +1,74 @@
+"""
+Benchmark KEYWORD rule evaluation: the per-rule loop vs. the Aho-Corasick matcher.
+
+Run from the project root:
+
+    python -m benchmarks.keyword_matching
+"""
+import random
+import time
+
+from app.services.rule_engine import CompiledRuleSet, RuleType, check_keyword_rule
+
+WORDS = (
+    "data personal information privacy access right erasure processing purpose "
+    "consent notice health record disclosure amend request contact officer policy "
+    "third party transfer retention security breach patient treatment payment"
+).split()
+
+
+def make_rules(count, rng):
+    """Create KEYWORD rules with three two-word keywords each"""
+    return [
+        {
+            "rule_id": f"bench-{i:04d}",
+            "rule_type": RuleType.KEYWORD,
+            "compliance_type": "BENCH",
+            "description": f"Benchmark rule {i}",
+            "severity": "medium",
+            "keywords": [f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}" for _ in range(3)],
+        }
+        for i in range(count)
+    ]
+
+
+def make_paragraphs(count, rng):
+    """Create paragraphs of roughly 60 words"""
+    return [" ".join(rng.choice(WORDS) for _ in range(60)) for _ in range(count)]
+
+
+def time_it(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    rng = random.Random(42)
+    paragraphs = make_paragraphs(2000, rng)
+
+    print(f"{'rules':>6} {'per-rule loop':>15} {'compiled loop':>15} {'automaton':>12} {'speedup':>8}")
+    for rule_count in (5, 50, 500):
+        definitions = make_rules(rule_count, rng)
+        loop_set = CompiledRuleSet(definitions, use_keyword_automaton=False)
+        automaton_set = CompiledRuleSet(definitions, use_keyword_automaton=True)
+
+        # The engine before compiled rule sets: lowercase per rule, scan per keyword
+        legacy_time, legacy = time_it(lambda: [
+            [rule.rule_id for rule in loop_set.rules if check_keyword_rule(rule, text)]
+            for text in paragraphs
+        ])
+        loop_time, loop = time_it(lambda: [
+            [rule.rule_id for rule in loop_set.evaluate(text)] for text in paragraphs
+        ])
+        automaton_time, automaton = time_it(lambda: [
+            [rule.rule_id for rule in automaton_set.evaluate(text)] for text in paragraphs
+        ])
+        assert legacy == loop == automaton
+
+        print(f"{rule_count:>6} {legacy_time:>14.3f}s {loop_time:>14.3f}s "
+              f"{automaton_time:>11.3f}s {legacy_time / automaton_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark text cleaning and paragraph splitting: chained passes vs. the single-pass normalizer.
+
+Run from the project root:
+
+    python -m benchmarks.text_normalization
+"""
+import random
+import re
+import time
+
+from app.utils.text_processing import normalize_chunks, normalize_text
+
+WORDS = (
+    "patient consent treatment record disclosure privacy notice health plan "
+    "payment operations minimum necessary authorization access amend request"
+).split()
+
+# Noise seen in extracted text: double spaces, stray blank lines, NULs, form feeds
+NOISE = ["  ", "   ", "\n\n\n", "\x00", "\x0c", "\t"]
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def make_text(size, rng):
+    """Create about size characters of paragraphs with extraction noise"""
+    parts = []
+    length = 0
+    while length < size:
+        words = []
+        for _ in range(rng.randint(40, 120)):
+            words.append(rng.choice(WORDS))
+            if rng.random() < 0.05:
+                words.append(rng.choice(NOISE))
+            if rng.random() < 0.08:
+                words.append("\n")
+        paragraph = " ".join(words)
+        parts.append(paragraph + rng.choice(["\n\n", "\n\n\n", "\n \n", "\n\x0c\n"]))
+        length += len(parts[-1])
+    return "".join(parts)
+
+
+def legacy_clean(text):
+    """ExtractionService._clean_text before the normalizer"""
+    if not text:
+        return ""
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub(r" {2,}", " ", text)
+    text = text.replace("\x00", "")
+    text = re.sub(r"[\x01-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text)
+    return text.strip()
+
+
+def legacy_split(text):
+    """split_into_paragraphs before the normalizer"""
+    paragraphs = []
+    for para in re.split(r"\n\s*\n", text):
+        cleaned = re.sub(r"\s+", " ", para).strip()
+        if cleaned:
+            paragraphs.append(cleaned)
+    return paragraphs
+
+
+def time_it(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    rng = random.Random(42)
+    text = make_text(50 * 1024 * 1024, rng)
+    chunks = [text[start:start + CHUNK_SIZE] for start in range(0, len(text), CHUNK_SIZE)]
+    print(f"{len(text) / 1024 / 1024:.0f}MB of text in {len(chunks)} chunks")
+
+    legacy_clean_time, legacy_text = time_it(lambda: legacy_clean(text))
+    clean_time, cleaned = time_it(lambda: normalize_text(text))
+    assert cleaned == legacy_text
+    print(f"{'clean':<22} {legacy_clean_time:>8.3f}s -> {clean_time:>7.3f}s "
+          f"{legacy_clean_time / clean_time:>6.1f}x")
+
+    legacy_time, legacy_paragraphs = time_it(lambda: legacy_split(legacy_clean(text)))
+    stream_time, (streamed_text, paragraphs) = time_it(lambda: normalize_chunks(chunks))
+    assert streamed_text == legacy_text
+    assert paragraphs == legacy_paragraphs
+    print(f"{'clean + paragraphs':<22} {legacy_time:>8.3f}s -> {stream_time:>7.3f}s "
+          f"{legacy_time / stream_time:>6.1f}x ({len(paragraphs)} paragraphs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app import create_app
 from app.extensions import mongo
+from app.services.rule_store import bump_rule_version  # noqa: E402 - needs the sys.path entry above
 
 @pytest.fixture
 def app():
@@ -30,7 +31,9 @@ def app():
         'USE_MOCK_LLM': True,  # Use mock LLM for testing
         'UPLOAD_FOLDER': tempfile.mkdtemp(),
         'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,  # 16MB max upload
-        'ALLOWED_EXTENSIONS': {'pdf', 'docx', 'txt'}
+        'ALLOWED_EXTENSIONS': {'pdf', 'docx', 'txt'},
+        'RULE_CHANGE_STREAM_ENABLED': False,  # Rule cache is invalidated by version bumps only
+        'QUEUE_CONSUMER_ENABLED': False  # Tests claim queued tasks themselves
     })
     
     # Setup application context
@@ -44,6 +47,12 @@ def app():
             # Clear test database before tests
             mongo.db.documents.delete_many({})
             mongo.db.compliance_rules.delete_many({})
+            mongo.db.task_queue.delete_many({})
+            mongo.db.bulk_jobs.delete_many({})
+            mongo.db.bulk_files.files.delete_many({})
+            mongo.db.bulk_files.chunks.delete_many({})
+            mongo.db.queue_consumers.delete_many({})
+            mongo.db.task_queue_counters.delete_many({})
             
             # Insert test data
             insert_test_data()
@@ -95,6 +104,7 @@ def insert_test_data():
     ]
     
     mongo.db.compliance_rules.insert_many(rules)
+    bump_rule_version()
     
     # Insert a test document
     test_document = {
@@ -64,6 +64,39 @@ class TestAPIEndpoints:
         # but the actual implementation is in app.services.rule_engine
         pytest.skip("API endpoint for document compliance check has implementation mismatch")
     
+    def test_check_documents_compliance_batch(self, client, app):
+        """Test checking many documents in one call via the API."""
+        headers = {'X-API-Key': 'test_api_key'}
+        with app.app_context():
+            mongo.db.documents.insert_one({
+                '_id': 'test-batch-document-id',
+                'filename': 'batch.txt',
+                'paragraphs': [{'id': 'p1', 'text': 'You have the right to access your data.'}]
+            })
+        
+        response = client.post('/api/documents/check', headers=headers, json={
+            'document_ids': ['test-document-id', 'test-batch-document-id', 'missing-document-id'],
+            'compliance_types': ['GDPR']
+        })
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['checked'] == 2
+        assert data['not_found'] == ['missing-document-id']
+        assert data['results']['test-batch-document-id']['issue_count'] == 0
+        assert data['results']['test-document-id']['issue_count'] > 0
+        
+        # Results are written back to the documents
+        with app.app_context():
+            document = mongo.db.documents.find_one({'_id': 'test-document-id'})
+            assert document['compliance_status'] == data['results']['test-document-id']['status']
+            assert len(document['compliance_issues']) == data['results']['test-document-id']['issue_count']
+        
+        # Documents can be selected by filter, but not with server-side JavaScript
+        response = client.post('/api/documents/check', headers=headers, json={'filter': {'filename': 'batch.txt'}})
+        assert json.loads(response.data)['checked'] == 1
+        response = client.post('/api/documents/check', headers=headers, json={'filter': {'$where': 'true'}})
+        assert response.status_code == 400
+    
     def test_get_compliance_rules(self, client):
         """Test getting compliance rules via the API."""
         # Make a request to the API endpoint
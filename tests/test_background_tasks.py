@@ -0,0 +1,123 @@
+"""
+Tests for the background task utilities.
+"""
+import time
+import pytest
+from app.services.job_queue import QueueConsumer, get_job_queue
+from app.utils import background_tasks
+from app.utils.background_tasks import (
+    TaskStatus,
+    get_task_status,
+    init_background_tasks,
+    is_cancelled,
+    run_in_background
+)
+from app.utils.error_handler import QueueFullError
+
+
+@run_in_background('Add numbers')
+def add(a, b):
+    return a + b
+
+
+@run_in_background('Slow task', timeout=0.2)
+def wait_until_stopped():
+    while not is_cancelled():
+        time.sleep(0.01)
+    return 'stopped'
+
+
+def wait_for_status(task_id, statuses, timeout=10):
+    """Wait until a task has one of the given statuses."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = get_task_status(task_id)
+        if status['status'] in statuses:
+            return status
+        assert time.monotonic() < deadline, f"Task is still {status['status']}"
+        time.sleep(0.05)
+
+
+class TestBackgroundTasks:
+    """Tests for the background task utilities."""
+
+    def test_task_runs_in_consumer(self, app):
+        """Test that a decorated call is queued and run by a queue consumer."""
+        with app.app_context():
+            task_id = add(2, 3)
+            assert get_task_status(task_id)['status'] == TaskStatus.PENDING
+
+            consumer = QueueConsumer(get_job_queue(), threads=1, poll_interval=0.05)
+            consumer.start()
+            try:
+                status = wait_for_status(task_id, [TaskStatus.COMPLETED, TaskStatus.FAILED])
+            finally:
+                assert consumer.stop(10)
+            assert status['status'] == TaskStatus.COMPLETED
+            assert status['name'] == 'Add numbers'
+            assert status['result'] == 5
+            assert status['duration'] is not None
+
+    def test_full_queue_is_refused(self, app, client, monkeypatch):
+        """Test that enqueuing into a full queue raises QueueFullError, answered with 503."""
+        monkeypatch.setitem(background_tasks._settings, 'max_queued', 1)
+        monkeypatch.setitem(background_tasks._settings, 'queue_full', 'reject')
+
+        @app.route('/test/add')
+        def enqueue_add():
+            return {'task_id': add(1, 1)}
+
+        with app.app_context():
+            add(1, 2)
+            with pytest.raises(QueueFullError):
+                add(3, 4)
+
+        response = client.get('/test/add', headers={'Accept': 'application/json'})
+        assert response.status_code == 503
+        assert 'Too many queued tasks' in response.get_json()['message']
+
+    @pytest.mark.parametrize('max_attempts, expected', [
+        (2, TaskStatus.PENDING),  # retried after the delay
+        (1, TaskStatus.FAILED)  # no attempts left
+    ])
+    def test_timed_out_task_is_failed(self, app, monkeypatch, max_attempts, expected):
+        """Test that a task running past its timeout is failed, then retried or failed for good."""
+        with app.app_context():
+            queue = get_job_queue()
+            monkeypatch.setattr(queue, 'max_attempts', max_attempts)
+            task_id = wait_until_stopped()
+
+            consumer = QueueConsumer(queue, threads=1, poll_interval=0.05)
+            consumer.start()
+            try:
+                deadline = time.monotonic() + 10
+                while queue.get(task_id)['attempts'] == 0 or get_task_status(task_id)['status'] == TaskStatus.RUNNING:
+                    assert time.monotonic() < deadline, 'Task did not time out'
+                    time.sleep(0.05)
+            finally:
+                # The task stops once asked to
+                assert consumer.stop(10)
+
+            status = get_task_status(task_id)
+            assert status['status'] == expected
+            assert status['error'] == 'Timed out after 0.2s'
+            assert status['result'] is None
+            assert queue.get(task_id)['attempts'] == 1
+
+    def test_finished_tasks_expire(self, app):
+        """Test that the TTL index of finished tasks is created and follows the configured TTL."""
+        with app.app_context():
+            collection = get_job_queue().collection
+            app.config['BACKGROUND_TASK_TTL'] = 3600
+            init_background_tasks(app)
+            index = collection.index_information()['background_task_ttl']
+            assert index['expireAfterSeconds'] == 3600
+            assert index['key'] == [('finished_at', 1)]
+
+            app.config['BACKGROUND_TASK_TTL'] = 60
+            init_background_tasks(app)
+            assert collection.index_information()['background_task_ttl']['expireAfterSeconds'] == 60
+
+            app.config['BACKGROUND_TASK_TTL'] = 0
+            init_background_tasks(app)
+            assert 'background_task_ttl' not in collection.index_information()
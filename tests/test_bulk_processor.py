@@ -0,0 +1,176 @@
+"""
+Tests for the bulk processor.
+"""
+import io
+import os
+import time
+import pytest
+from app.extensions import mongo
+from app.services.bulk_processor import BulkProcessor, BULK_FILE_TASK, init_bulk_processor
+from app.services.job_queue import FAILED, get_job_queue
+from app.utils.error_handler import ServiceUnavailableError
+
+
+def wait_for(condition, timeout=60):
+    """Wait until condition() is true, failing after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'Timed out'
+        time.sleep(0.1)
+
+
+class TestBulkProcessor:
+    """Tests for the bulk processor."""
+
+    def test_bulk_job_end_to_end(self, app, tmp_path):
+        """Test that a queued file is claimed, processed in a worker process and stored."""
+        upload = tmp_path / 'notice.txt'
+        upload.write_bytes(b'We collect your health information.\n\nYou have the right to access your data.')
+        app.config['BULK_WORKERS'] = 1
+        processor = init_bulk_processor(app)
+        processor.start()
+        try:
+            with app.app_context():
+                queue = get_job_queue()
+                wait_for(lambda: queue.has_consumers(BULK_FILE_TASK))
+                job = processor.start_bulk_job([
+                    {'filename': 'notice.txt', 'path': str(upload), 'compliance_types': ['GDPR', 'HIPAA']}
+                ])
+                wait_for(lambda: processor.get_job_status(job['job_id'], summary=True)['status'] == 'completed')
+
+                status = processor.get_job_status(job['job_id'])
+                assert status['processed_files'] == 1 and status['failed_files'] == 0
+                result = status['results'][0]
+                assert result['status'] == 'success'
+                document = mongo.db.documents.find_one({'_id': result['document_id']})
+                assert document['filename'] == 'notice.txt'
+                assert document['file_path'] == str(upload)
+                assert document['compliance_score'] == result['compliance_score']
+                assert len(document['compliance_issues']) == result['issue_count']
+                # The stored copy is dropped once the file is done
+                assert mongo.db.bulk_files.files.count_documents({}) == 0
+        finally:
+            assert processor.stop(30)
+        with app.app_context():
+            assert not get_job_queue().has_consumers(BULK_FILE_TASK)
+
+    def test_upload_refused_without_worker(self, app, client, tmp_path):
+        """Test that bulk jobs are refused while no process runs bulk files."""
+        upload = tmp_path / 'notice.txt'
+        upload.write_bytes(b'Text.')
+        with app.app_context():
+            with pytest.raises(ServiceUnavailableError):
+                BulkProcessor().start_bulk_job([{'filename': 'notice.txt', 'path': str(upload)}])
+            assert mongo.db.bulk_jobs.count_documents({}) == 0
+
+        app.config['WTF_CSRF_ENABLED'] = False
+        response = client.post('/compliance/bulk/upload', data={'files[]': (io.BytesIO(b'Text.'), 'notice.txt')},
+                               content_type='multipart/form-data')
+        assert response.status_code == 503
+        assert 'No bulk worker' in response.get_json()['error']
+
+    def test_file_content_travels_with_the_job(self, app, tmp_path):
+        """Test that a worker without the upload folder processes the stored copy."""
+        upload = tmp_path / 'notice.txt'
+        upload.write_bytes(b'You have the right to access your data.')
+        processor = BulkProcessor(max_workers=0, temp_folder=str(tmp_path))
+        with app.app_context():
+            get_job_queue().register_consumer('other-host', [BULK_FILE_TASK])
+            processor.start_bulk_job([{'filename': 'notice.txt', 'path': str(upload)}])
+            # Replaced by a later upload of the same name
+            upload.write_bytes(b'Another notice.')
+
+            task = get_job_queue().claim(processor.worker_id, [BULK_FILE_TASK])
+            local_path, temporary = processor._local_copy(task)
+            assert temporary
+            assert local_path.endswith('.txt')
+            with open(local_path, 'rb') as f:
+                assert f.read() == b'You have the right to access your data.'
+            os.unlink(local_path)
+
+            # As seen from another host
+            os.unlink(upload)
+            local_path, _ = processor._local_copy(task)
+            os.unlink(local_path)
+
+            # Finished files no longer keep their content
+            processor._discard_content([task['_id']])
+            with pytest.raises(FileNotFoundError, match='not readable'):
+                processor._local_copy(task)
+
+    def test_unreadable_file_fails_at_once(self, app, tmp_path):
+        """Test that a file no worker can read is rejected or failed with a clear error."""
+        missing = str(tmp_path / 'missing.txt')
+        processor = BulkProcessor(max_workers=1, store_files=False)
+        with app.app_context():
+            get_job_queue().register_consumer('other-host', [BULK_FILE_TASK])
+            from app.utils.error_handler import ValidationError
+            with pytest.raises(ValidationError, match='Cannot read'):
+                processor.start_bulk_job([{'filename': 'missing.txt', 'path': missing}])
+
+            # Queued while readable, but not on the host claiming it
+            get_job_queue().enqueue(BULK_FILE_TASK, {'filename': 'missing.txt', 'path': missing}, group='test-job')
+            in_flight = {}
+            processor._submit_files(in_flight)
+            assert not in_flight
+            task = get_job_queue().collection.find_one({'kind': BULK_FILE_TASK})
+            assert task['status'] == FAILED
+            assert 'not readable' in task['error']
+
+    def _event_job(self, files=2):
+        """Queue a job of files and claim them all."""
+        from datetime import datetime
+        queue = get_job_queue()
+        mongo.db.bulk_jobs.insert_one({
+            '_id': 'test-job', 'name': 'Test job', 'group_id': None,
+            'created_at': datetime.utcnow(), 'total_files': files
+        })
+        queue.enqueue_many(BULK_FILE_TASK, [{'filename': f'{n}.txt'} for n in range(files)], group='test-job')
+        return [queue.claim('worker-1', [BULK_FILE_TASK]) for _ in range(files)]
+
+    def test_events_include_file_finished_before_done(self, app, monkeypatch):
+        """Test that a file finishing after the last poll is sent before "done"."""
+        with app.app_context():
+            queue = get_job_queue()
+            first, last = self._event_job()
+            queue.complete(first['_id'], 'worker-1', {'filename': '0.txt'})
+
+            count_by_status = queue.count_by_status
+            counts = []
+
+            def finish_last(group):
+                # The last file finishes between the first poll and the count after it
+                counts.append(group)
+                if len(counts) == 2:
+                    queue.complete(last['_id'], 'worker-1', {'filename': '1.txt'})
+                return count_by_status(group)
+
+            monkeypatch.setattr(queue, 'count_by_status', finish_last)
+            events = list(BulkProcessor().iter_job_events('test-job', poll_interval=0, max_seconds=5))
+            assert [(event, number) for event, number, _ in events] == [
+                ('progress', None), ('file', 1), ('file', 2), ('done', None)
+            ]
+
+    def test_events_resume_without_missing_a_late_file(self, app):
+        """Test that a file becoming visible after a later-numbered one is still sent."""
+        with app.app_context():
+            queue = get_job_queue()
+            slow, fast = self._event_job()
+            # The slow finish took its number first, but writes it last
+            slow_number = queue._reserve_finish_seqs('test-job')
+            queue.complete(fast['_id'], 'worker-1', {'filename': '1.txt'})
+
+            events = BulkProcessor().iter_job_events('test-job', poll_interval=0)
+            assert next(events)[0] == 'progress'
+            event, number, data = next(events)
+            assert (event, number, data['filename']) == ('file', 0, '1.txt')
+            assert next(events)[0] == 'progress'
+            # A client reconnecting now would resume after 0 and get the file again
+            assert next(events) == (None, None, None)
+
+            queue.collection.update_one({'_id': slow['_id']}, {'$set': {
+                'status': 'completed', 'result': {'filename': '0.txt'}, 'finish_seq': slow_number
+            }})
+            event, number, data = next(events)
+            assert (event, number, data['filename']) == ('file', 2, '0.txt')
+            assert next(events)[0] == 'done'
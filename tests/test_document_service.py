@@ -5,7 +5,7 @@ import os
 import tempfile
 import pytest
 from unittest.mock import patch, MagicMock
-from app.services.document_service import process_document
+from app.services.document_service import build_document, process_document
 from app.models.document import DocumentType, ComplianceStatus
 from app.extensions import mongo
 
@@ -103,3 +103,20 @@ class TestDocumentService:
                 # Clean up the temporary file
                 if os.path.exists(file_path):
                     os.unlink(file_path)
+
+    def test_build_document_without_app_context(self):
+        """Test building a document outside the application, as bulk workers do."""
+        mock_extraction_service = MagicMock()
+        mock_extraction_service.extract_text.return_value = {
+            'text': 'First paragraph.\n\nSecond paragraph.',
+            'paragraphs': [],
+            'metadata': {'format': 'txt', 'file_size': 35},
+            'statistics': {'char_count': 35, 'word_count': 4, 'line_count': 3}
+        }
+
+        document = build_document('/tmp/notes.txt', 'notes.txt', mock_extraction_service)
+
+        mock_extraction_service.extract_text.assert_called_once_with('/tmp/notes.txt')
+        assert document.filename == 'notes.txt'
+        assert document.document_type == DocumentType.OTHER
+        assert len(document.paragraphs) == 2
@@ -1,9 +1,15 @@
 """
 Tests for the extraction service.
 """
+import io
 import os
 import tempfile
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.services import extraction_service, ocr_service
+from app.services.extraction_cache import ExtractionCache
 from app.services.extraction_service import (
+    ExtractionService,
     get_extraction_service,
     extract_document_text
 )
@@ -113,3 +119,274 @@ class TestExtractionService:
         
         # Verify the result
         assert 'error' in result
+    
+    def test_extract_pdf_pages(self):
+        """Test that PDF pages are reported with their offsets in the document text."""
+        from reportlab.pdfgen import canvas
+        
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            file_path = f.name
+        pdf = canvas.Canvas(file_path)
+        for page_text in ['First page text.', 'Second page text.', 'Third page text.']:
+            pdf.drawString(72, 720, page_text)
+            pdf.showPage()
+        pdf.save()
+        
+        try:
+            service = get_extraction_service()
+            result = service.extract_text(file_path)
+            pages = list(service.iter_pdf_pages(file_path))
+            
+            assert [page['page_num'] for page in pages] == [1, 2, 3]
+            assert result['metadata']['page_count'] == 3
+            for page, page_data in zip(pages, result['pages']):
+                assert result['text'][page['start']:page['end']] == page['text']
+                assert page_data['start'] == page['start'] and page_data['end'] == page['end']
+            assert 'Second page text.' in pages[1]['text']
+        finally:
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+    
+    def test_extract_pdf_in_parallel(self):
+        """Test that extracting a PDF across worker processes keeps the page order."""
+        from reportlab.pdfgen import canvas
+        
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            file_path = f.name
+        pdf = canvas.Canvas(file_path)
+        for page_num in range(1, 10):
+            pdf.drawString(72, 720, f'Text of page {page_num}.')
+            pdf.showPage()
+        pdf.save()
+        
+        parallel_service = ExtractionService(pdf_workers=2, pdf_parallel_min_pages=5)
+        try:
+            sequential = ExtractionService().extract_text(file_path)
+            parallel = parallel_service.extract_text(file_path)
+            executor = parallel_service.pdf_pool._executor
+            with open(file_path, 'rb') as f:
+                from_content = parallel_service.extract_text(file_path, f.read())
+            # The worker processes are kept for later documents
+            assert executor is not None and parallel_service.pdf_pool._executor is executor
+            
+            assert parallel['text'] == sequential['text'] == from_content['text']
+            assert parallel['pages'] == sequential['pages']
+            assert parallel['text'].index('page 2.') < parallel['text'].index('page 9.')
+        finally:
+            parallel_service.pdf_pool.shutdown()
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+    
+    def test_extraction_cache(self):
+        """Test that uploading the same bytes again reuses the cached extraction result."""
+        cache = ExtractionCache(tempfile.mkdtemp(), max_bytes=10 ** 6)
+        service = ExtractionService(cache=cache)
+        paths = []
+        for name in ('first', 'second'):
+            with tempfile.NamedTemporaryFile(prefix=name, suffix='.txt', delete=False) as f:
+                f.write(b'Standard privacy clause.\n\nSignature block.')
+                paths.append(f.name)
+        
+        try:
+            first = service.extract_text(paths[0])
+            assert 'cache_hit' not in first
+            
+            service.extract_from_txt = None  # Parsing must be skipped entirely
+            service.supported_formats = {}
+            second = service.extract_text(paths[1])
+            assert second['cache_hit'] is True
+            assert second['text'] == first['text']
+            assert second['statistics'] == first['statistics']
+            assert second['filename'] == os.path.basename(paths[1])
+            
+            # Least recently used entries are evicted beyond the size limit
+            cache.max_bytes = 0
+            cache.put('other', {'text': 'other'})
+            assert cache.get(cache.key_for(paths[0], 1)) is None
+        finally:
+            for path in paths:
+                os.unlink(path)
+    
+    def test_extraction_cache_keyed_by_handler(self):
+        """Test that the same bytes under another extension are not served the other handler's result."""
+        service = ExtractionService(cache=ExtractionCache(tempfile.mkdtemp(), max_bytes=10 ** 6))
+        content = b'name,consent\nAlice,yes\nBob,no\n'
+        
+        as_text = service.extract_text('a.txt', content)
+        as_csv = service.extract_text('b.csv', content)
+        assert as_text['format'] == 'txt'
+        assert as_csv['format'] == 'csv'
+        assert 'cache_hit' not in as_csv
+        assert as_csv['text'] == ExtractionService().extract_text('b.csv', content)['text']
+        assert service.extract_text('c.csv', content)['cache_hit'] is True
+    
+    def test_ocr_fills_empty_pages(self, monkeypatch):
+        """Test that only pages without text are recognized, in page order and once per image."""
+        class FakePdf:
+            def render_page_png(self, page_index, dpi=300, timeout=60):
+                # Pages 2 and 4 are the same scanned form, page 6 is blank
+                return {1: b'scan-a', 3: b'scan-a', 5: b'blank'}.get(page_index, b'scan-b')
+        
+        calls = []
+        
+        def fake_ocr_image(png_bytes, language, timeout):
+            calls.append(png_bytes)
+            return ' \n' if png_bytes == b'blank' else f' text of {png_bytes.decode()} '
+        
+        monkeypatch.setattr(ocr_service, '_ocr_image', fake_ocr_image)
+        service = ocr_service.OcrService(max_workers=1)
+        service._executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            pages = list(service.fill_empty_pages(FakePdf(), ['Typed page.', '', 'Typed too.', ' \n', '', '']))
+        finally:
+            service.shutdown()
+        
+        assert pages == [
+            ('Typed page.', False),
+            ('text of scan-a', True),
+            ('Typed too.', False),
+            ('text of scan-a', True),
+            ('text of scan-b', True),
+            ('', False),
+        ]
+        # Windows hold two pages per worker, so the repeated form is served from the cache
+        assert calls == [b'scan-a', b'scan-b', b'blank']
+    
+    def test_ocr_in_process(self, monkeypatch):
+        """Test that OCR in a pool worker runs tesseract without a nested pool."""
+        monkeypatch.setattr(ocr_service, '_ocr_image', lambda png_bytes, language, timeout: f' {png_bytes.decode()} ')
+        service = ocr_service.OcrService(max_workers=1, in_process=True)
+        
+        assert service.recognize({0: b'scan-a', 2: b'scan-a'}) == {0: 'scan-a', 2: 'scan-a'}
+        assert service._executor is None
+    
+    def test_extract_csv_streaming(self):
+        """Test that CSV rows are streamed into paragraphs with a sampled data payload."""
+        service = ExtractionService(table_chunk_rows=2, table_sample_rows=2)
+        content = b'name,consent\nAlice,yes\nBob,no\nCarol,yes\n'
+        
+        result = service.extract_from_csv('patients.csv', content)
+        assert result['text'] == (
+            'name, consent\n\n'
+            'name: Alice, consent: yes\nname: Bob, consent: no\n\n'
+            'name: Carol, consent: yes'
+        )
+        assert result['metadata']['row_count'] == 3
+        assert result['metadata']['column_count'] == 2
+        assert result['data'] == [['name', 'consent'], ['Alice', 'yes']]
+        assert result['metadata']['data_sampled'] is True
+        
+        service.table_sample_rows = 0
+        assert 'data' not in service.extract_from_csv('patients.csv', content)
+        assert service.extract_from_csv('empty.csv', b'\n')['text'] == 'Empty CSV file'
+    
+    def test_extract_xlsx_streaming(self):
+        """Test that spreadsheet rows are emitted as per-sheet paragraphs with capped sheet data."""
+        openpyxl = pytest.importorskip('openpyxl')
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = 'Consents'
+        for row in (['name', 'consent'], ['Alice', 'yes'], [None, None], ['Bob', None], ['Carol', 'no']):
+            sheet.append(row)
+        workbook.create_sheet('Notes').append(['Reviewed'])
+        with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as f:
+            workbook.save(f.name)
+        
+        try:
+            service = ExtractionService(table_chunk_rows=2, table_sample_rows=1)
+            paragraphs = list(service.iter_xlsx_paragraphs(f.name))
+            assert [p['text'] for p in paragraphs] == [
+                'Sheet: Consents',
+                'name | consent\nAlice | yes',
+                'Bob | \nCarol | no',
+                'Sheet: Notes',
+                'Reviewed',
+            ]
+            assert [p['id'] for p in paragraphs] == ['p1', 'p2', 'p3', 'p4', 'p5']
+            assert paragraphs[4]['sheet'] == 'Notes'
+            
+            result = service.extract_from_xlsx(f.name)
+            assert result['text'] == '\n\n'.join(p['text'] for p in paragraphs)
+            assert result['metadata']['row_count'] == 5
+            assert result['sheet_data'] == {'Consents': [['name', 'consent']], 'Notes': [['Reviewed']]}
+        finally:
+            os.unlink(f.name)
+    
+    def test_extract_xml_streaming(self):
+        """Test that XML elements are emitted in document order with an optional structure."""
+        content = (
+            b'<patient id="7"><name>Alice</name>'
+            b'<consent signed="yes">Treatment<date>2024-01-02</date></consent></patient>'
+        )
+        service = ExtractionService()
+        
+        result = service.extract_from_xml('patient.xml', content)
+        assert result['text'].splitlines() == [
+            "/patient {'id': '7'}",
+            '/patient/name: Alice',
+            "/patient/consent {'signed': 'yes'}: Treatment",
+            '/patient/consent/date: 2024-01-02',
+        ]
+        assert result['metadata']['root_tag'] == 'patient'
+        assert result['metadata']['element_count'] == 4
+        assert 'structure' not in result
+        
+        service.xml_structure = True
+        structure = service.extract_from_xml('patient.xml', content)['structure']
+        assert structure['attributes'] == {'id': '7'}
+        assert structure['children'][1]['text'] == 'Treatment'
+        assert structure['children'][1]['children'][0]['path'] == '/patient/consent/date'
+    
+    def test_extract_json_streaming(self):
+        """Test that top-level JSON items are streamed into paragraphs."""
+        content = b'[{"name": "Alice", "consents": ["treatment"]}, 12345, "note", {"name": "Bob"}]'
+        service = ExtractionService()
+        
+        result = service.extract_from_json('patients.json', content)
+        assert result['text'] == (
+            'Item 1:\nname: Alice\nconsents:\n - treatment\n\n'
+            'Item 2: 12345\n\nItem 3: note\n\nItem 4:\nname: Bob'
+        )
+        assert result['metadata']['type'] == 'list'
+        assert result['metadata']['data_size'] == len(content)
+        assert 'data' not in result
+        
+        # Items split across read blocks are decoded whole
+        with io.TextIOWrapper(io.BytesIO(content), encoding='utf-8') as f:
+            items = [value for _, _, value in extraction_service._iter_json_top_level(f, block_size=3)]
+        assert items == [{'name': 'Alice', 'consents': ['treatment']}, 12345, 'note', {'name': 'Bob'}]
+        
+        # Numbers cut at "1." or "2e" by a block boundary are not decoded early
+        numbers = '[1.25, 2e10, -3.5E-2, 40, 0.125e+3]'
+        for block_size in range(1, 12):
+            with io.StringIO(numbers) as f:
+                items = [value for _, _, value in extraction_service._iter_json_top_level(f, block_size=block_size)]
+            assert items == [1.25, 2e10, -3.5e-2, 40, 0.125e3], block_size
+        with io.StringIO('42') as f:
+            assert list(extraction_service._iter_json_top_level(f, block_size=1)) == [(None, None, 42)]
+        
+        service.json_data = True
+        result = service.extract_from_json('record.json', b'{"id": 7, "flags": {"minor": false}}')
+        assert result['data'] == {'id': 7, 'flags': {'minor': False}}
+        assert result['text'] == 'id: 7\n\nflags:\n minor: False'
+        assert 'error' in service.extract_from_json('broken.json', b'[1, 2')['metadata']
+    
+    def test_extract_dispatches_on_content(self):
+        """Test that mislabelled files are extracted by their content and binary junk is rejected."""
+        service = ExtractionService()
+        
+        result = service.extract_text('records.txt', b'[{"name": "Alice"}]')
+        assert result['format'] == 'txt'
+        
+        result = service.extract_text('records.pdf', b'{"name": "Alice", "consent": "yes"}')
+        assert result['format'] == 'json'
+        assert result['metadata']['declared_format'] == 'pdf'
+        assert 'consent: yes' in result['text']
+        
+        result = service.extract_text('notes.xyz', b'<patient><name>Alice</name></patient>')
+        assert result['format'] == 'xml'
+        assert '/patient/name: Alice' in result['text']
+        
+        service.supported_formats = {}  # No parser may run on binary junk
+        result = service.extract_text('scan.pdf', bytes(range(256)) * 8)
+        assert 'binary' in result['error']
@@ -0,0 +1,91 @@
+"""
+Tests for the durable job queue.
+"""
+import time
+from app.services.job_queue import JobQueue, CANCELLED, COMPLETED, FAILED, PENDING
+
+
+class TestJobQueue:
+    """Tests for the durable job queue."""
+
+    def test_claim_is_exclusive(self, app):
+        """Test that a task is claimed by one worker only."""
+        with app.app_context():
+            queue = JobQueue()
+            task_id = queue.enqueue('test', {'value': 1})
+
+            task = queue.claim('worker-1', ['test'])
+            assert task['_id'] == task_id
+            assert task['attempts'] == 1
+            assert queue.claim('worker-2', ['test']) is None
+
+            assert queue.complete(task_id, 'worker-1', {'ok': True})
+            stored = queue.get(task_id)
+            assert stored['status'] == COMPLETED
+            assert stored['result'] == {'ok': True}
+
+    def test_failed_task_is_retried_with_backoff(self, app):
+        """Test that a failed task is retried until it runs out of attempts."""
+        with app.app_context():
+            queue = JobQueue(max_attempts=2, retry_delay=0.2)
+            task_id = queue.enqueue('test', {'value': 1})
+
+            task = queue.claim('worker-1', ['test'])
+            assert queue.fail(task, 'worker-1', 'first error')
+            assert queue.get(task_id)['status'] == PENDING
+            # Not due before the retry delay has passed
+            assert queue.claim('worker-1', ['test']) is None
+
+            time.sleep(0.3)
+            task = queue.claim('worker-2', ['test'])
+            assert task['attempts'] == 2
+            assert not queue.fail(task, 'worker-2', 'second error')
+            assert queue.get(task_id)['status'] == FAILED
+            assert queue.get(task_id)['error'] == 'second error'
+
+    def test_expired_lease_is_claimed_again(self, app):
+        """Test that a task whose worker stopped heartbeating is taken over."""
+        with app.app_context():
+            queue = JobQueue(lease_seconds=0.2)
+            task_id = queue.enqueue('test', {'value': 1})
+            queue.claim('worker-1', ['test'])
+
+            time.sleep(0.3)
+            task = queue.claim('worker-2', ['test'])
+            assert task['_id'] == task_id
+            assert task['lease_owner'] == 'worker-2'
+            # The lost worker can no longer report the task
+            assert not queue.complete(task_id, 'worker-1')
+            assert queue.complete(task_id, 'worker-2')
+
+    def test_cancel_pending_task(self, app):
+        """Test that a cancelled task is never claimed."""
+        with app.app_context():
+            queue = JobQueue()
+            task_id = queue.enqueue('test', {'value': 1})
+
+            assert queue.cancel(task_id)
+            assert queue.get(task_id)['status'] == CANCELLED
+            assert queue.claim('worker-1', ['test']) is None
+
+    def test_cancel_running_task(self, app):
+        """Test that cancelling a running task asks its worker to stop."""
+        with app.app_context():
+            queue = JobQueue()
+            task_id = queue.enqueue('test', {'value': 1})
+            queue.claim('worker-1', ['test'])
+
+            assert queue.cancel(task_id)
+            assert queue.cancel_requested([task_id]) == [task_id]
+            assert queue.cancelled(task_id, 'worker-1')
+            assert queue.get(task_id)['status'] == CANCELLED
+
+    def test_fail_without_retry(self, app):
+        """Test that a failure no retry can fix ends the task at once."""
+        with app.app_context():
+            queue = JobQueue(max_attempts=3)
+            task_id = queue.enqueue('test', {'value': 1})
+
+            task = queue.claim('worker-1', ['test'])
+            assert not queue.fail(task, 'worker-1', 'missing input', retry=False)
+            assert queue.get(task_id)['status'] == FAILED
@@ -83,3 +83,30 @@ class TestRoutes:
         # Skip this test since the PDF export endpoint doesn't exist yet
         # This would be implemented in a future version of the application
         pytest.skip("PDF export endpoint not implemented yet")
+    
+    def test_bulk_job_events_route(self, client, app):
+        """Test streaming the events of a finished bulk job."""
+        from datetime import datetime
+        from app.services.job_queue import get_job_queue
+        with app.app_context():
+            queue = get_job_queue()
+            mongo.db.bulk_jobs.insert_one({
+                '_id': 'test-job', 'name': 'Test job', 'group_id': None,
+                'created_at': datetime.utcnow(), 'total_files': 2
+            })
+            queue.enqueue_many('bulk_file', [{'filename': 'a.txt'}, {'filename': 'b.txt'}], group='test-job')
+            for _ in range(2):
+                task = queue.claim('worker-1', ['bulk_file'])
+                queue.complete(task['_id'], 'worker-1', {'filename': task['payload']['filename'], 'score': 90})
+        
+        response = client.get('/compliance/bulk/status/test-job?summary=true')
+        assert response.get_json()['processed_files'] == 2
+        assert 'results' not in response.get_json()
+        
+        # Resume after the first file, as a reconnecting browser would
+        response = client.get('/compliance/bulk/events/test-job', headers={'Last-Event-ID': '1'})
+        assert response.mimetype == 'text/event-stream'
+        body = response.get_data(as_text=True)
+        assert 'id: 1\n' not in body
+        assert 'event: file\nid: 2\n' in body
+        assert body.rstrip().split('\n\n')[-1].startswith('event: done')
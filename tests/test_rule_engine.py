@@ -1,12 +1,38 @@
 """
 Tests for the rule engine.
 """
+from operator import itemgetter
+
+import pytest
 from app.services.rule_engine import (
     check_document_compliance,
     check_regex_rule,
     check_keyword_rule,
-    get_compliance_rules
+    get_compliance_rules,
+    get_compiled_rule_set,
+    evaluate_paragraphs,
+    audit_paragraphs,
+    stream_document_compliance,
+    CompiledRuleSet
 )
+from app.extensions import mongo
+from app.services.rule_store import get_rule_store, bump_rule_version
+from app.services.verdict_cache import VerdictCache
+from app.services.rule_pool import RulePool
+
+
+@pytest.fixture
+def evaluated(monkeypatch):
+    """Record the text and rule IDs of every CompiledRuleSet.evaluate call."""
+    calls = []
+    original_evaluate = CompiledRuleSet.evaluate
+
+    def recording_evaluate(self, text):
+        calls.append((text, [rule.rule_id for rule in self.rules]))
+        return original_evaluate(self, text)
+
+    monkeypatch.setattr(CompiledRuleSet, 'evaluate', recording_evaluate)
+    return calls
 
 
 class TestRuleEngine:
@@ -41,6 +67,38 @@ class TestRuleEngine:
             assert len(gdpr_rules) > 0
             assert len(hipaa_rules) > 0
     
+    def test_rules_reload_after_version_bump(self, app):
+        """Test that stored rule changes are picked up once the rule version is bumped."""
+        with app.app_context():
+            store = get_rule_store()
+            store.refresh_interval = 3600
+            
+            rule_set = get_compiled_rule_set(['GDPR'])
+            assert get_compiled_rule_set(['GDPR']) is rule_set
+            
+            mongo.db.compliance_rules.insert_one({
+                "rule_id": "test-gdpr-002",
+                "rule_type": "regex",
+                "compliance_type": "GDPR",
+                "description": "Missing data retention period",
+                "severity": "medium",
+                "pattern": r"retain\w*\s+for"
+            })
+            
+            # Cached rules are served until the version changes
+            assert get_compiled_rule_set(['GDPR']) is rule_set
+            
+            bump_rule_version()
+            reloaded = get_compiled_rule_set(['GDPR'])
+            assert reloaded is not rule_set
+            assert reloaded.version != rule_set.version
+            assert 'test-gdpr-002' in [rule.rule_id for rule in reloaded.rules]
+            
+            # Inactive rules are not loaded
+            mongo.db.compliance_rules.update_one({"rule_id": "test-gdpr-002"}, {"$set": {"is_active": False}})
+            bump_rule_version()
+            assert 'test-gdpr-002' not in [rule.rule_id for rule in get_compiled_rule_set(['GDPR']).rules]
+    
     def test_check_regex_rule(self):
         """Test checking a regex rule."""
         # Create a test rule object with the necessary attributes
@@ -95,6 +153,221 @@ class TestRuleEngine:
         paragraph = 'This document contains information about data protection.'
         assert check_keyword_rule(rule, paragraph) is False
     
+    def test_compiled_rule_set(self):
+        """Test that compiled rule sets are memoized and agree with the rule checks."""
+        # Order of compliance types does not matter for memoization
+        rule_set = get_compiled_rule_set(['GDPR', 'HIPAA'])
+        assert rule_set is get_compiled_rule_set(['HIPAA', 'GDPR'])
+        assert rule_set is not get_compiled_rule_set(['GDPR'])
+        
+        texts = [
+            'You have the right to access your data.',
+            'This Notice of Privacy Practices explains the log of disclosures.',
+            'Nothing relevant here.',
+            ''
+        ]
+        for text in texts:
+            fired = {rule.rule_id for rule in rule_set.evaluate(text)}
+            expected = {rule.rule_id for rule in rule_set.rules if check_keyword_rule(rule, text)}
+            assert fired == expected
+    
+    def test_keyword_automaton(self):
+        """Test that the keyword automaton reports the same rules as the per-rule loop."""
+        definitions = [
+            # Stored rules keep their keywords as a comma-separated pattern
+            {'rule_id': 'kw-1', 'rule_type': 'keyword', 'pattern': 'accounting,disclosure,disclosures'},
+            {'rule_id': 'kw-2', 'rule_type': 'keyword', 'keywords': ['Right to Erasure']},
+            {'rule_id': 're-1', 'rule_type': 'regex', 'pattern': r'privacy\s+notice'},
+        ]
+        loop_set = CompiledRuleSet(definitions, use_keyword_automaton=False)
+        automaton_set = CompiledRuleSet(definitions, use_keyword_automaton=True)
+        assert automaton_set.keyword_matcher is not None
+        
+        texts = [
+            'An accounting of disclosures is available.',
+            'You have the RIGHT TO ERASURE.',
+            'See our privacy notice.',
+            'Unrelated text.'
+        ]
+        for text in texts:
+            loop_ids = [rule.rule_id for rule in loop_set.evaluate(text)]
+            automaton_ids = [rule.rule_id for rule in automaton_set.evaluate(text)]
+            assert loop_ids == automaton_ids
+        
+        assert [rule.rule_id for rule in automaton_set.evaluate('Unrelated text.')] == ['kw-1', 'kw-2', 're-1']
+    
+    def test_evaluate_paragraphs_every_rule_fires(self):
+        """Test issue collection on a large document where every rule fires."""
+        rule_set = get_compiled_rule_set(['GDPR', 'HIPAA'])
+        paragraphs = [
+            {'id': f'p{i+1}', 'text': 'This paragraph mentions none of the required clauses.'}
+            for i in range(10000)
+        ]
+        # Repeated paragraph IDs still get one issue per rule
+        paragraphs.append({'id': 'p1', 'text': 'Duplicate paragraph ID.'})
+        
+        issues, paragraphs_with_issues = evaluate_paragraphs(paragraphs, rule_set)
+        
+        assert len(issues) == 10000 * len(rule_set)
+        assert len(paragraphs_with_issues) == 10000
+        assert len({issue['issue_id'] for issue in issues}) == len(issues)
+        assert len({(issue['rule_id'], issue['paragraph_id']) for issue in issues}) == len(issues)
+    
+    def test_incremental_audit(self, evaluated):
+        """Test that re-audits only evaluate changed paragraphs and rules and keep unchanged issues."""
+        definitions = [
+            {'rule_id': 'kw-1', 'rule_type': 'keyword', 'keywords': ['privacy notice']},
+            {'rule_id': 'kw-2', 'rule_type': 'keyword', 'keywords': ['right to erasure']},
+        ]
+        paragraphs = [
+            {'id': 'p1', 'text': 'See our privacy notice.'},
+            {'id': 'p2', 'text': 'Unrelated text.'},
+        ]
+        issues, _, audit = audit_paragraphs(paragraphs, CompiledRuleSet(definitions, version='v1'))
+        assert [(issue['rule_id'], issue['paragraph_id']) for issue in issues] == [
+            ('kw-2', 'p1'), ('kw-1', 'p2'), ('kw-2', 'p2')
+        ]
+        issues[0]['suggestions'].append('Mention the right to erasure.')
+        
+        # Change one rule and one paragraph
+        changed_definitions = [
+            definitions[0],
+            {'rule_id': 'kw-2', 'rule_type': 'keyword', 'keywords': ['right to erasure', 'notice']},
+        ]
+        changed_paragraphs = [paragraphs[0], {'id': 'p2', 'text': 'You have the right to erasure.'}]
+        rule_set = CompiledRuleSet(changed_definitions, version='v2')
+        
+        evaluated.clear()
+        reaudited, paragraphs_with_issues, new_audit = audit_paragraphs(
+            changed_paragraphs, rule_set, audit, previous_issues=issues
+        )
+        
+        # The unchanged paragraph is only evaluated against the changed rule
+        assert evaluated == [
+            ('See our privacy notice.', ['kw-2']),
+            ('You have the right to erasure.', ['kw-1', 'kw-2'])
+        ]
+        full, _ = evaluate_paragraphs(changed_paragraphs, rule_set)
+        assert [(issue['rule_id'], issue['paragraph_id']) for issue in reaudited] == \
+            [(issue['rule_id'], issue['paragraph_id']) for issue in full] == [('kw-1', 'p2')]
+        assert paragraphs_with_issues == {'p2'}
+        assert [entry['rule_version'] for entry in new_audit['paragraphs']] == ['v2', 'v2']
+        
+        # Nothing changed: every finding and issue is reused as is
+        again, _, _ = audit_paragraphs(changed_paragraphs, rule_set, new_audit, previous_issues=reaudited)
+        assert again == reaudited
+        
+        # Issues of unchanged paragraph/rule pairs keep their ID and suggestions
+        kept, _, _ = audit_paragraphs(paragraphs, CompiledRuleSet(definitions, version='v1'), audit, previous_issues=issues)
+        assert kept == issues
+    
+    def test_reaudit_from_cache_keeps_rule_order(self):
+        """Test that issues merged from an earlier audit and the verdict cache stay in rule order."""
+        definitions = [
+            {'rule_id': 'kw-1', 'rule_type': 'keyword', 'keywords': ['privacy notice']},
+            {'rule_id': 'kw-2', 'rule_type': 'keyword', 'keywords': ['right to erasure']},
+        ]
+        paragraphs = [{'id': 'p1', 'text': 'Unrelated text.'}]
+        cache = VerdictCache(max_size=100)
+        _, _, audit = audit_paragraphs(paragraphs, CompiledRuleSet(definitions, version='v1'), verdict_cache=cache)
+        
+        # kw-1 changes, and its verdict for the text is cached by another document
+        changed = CompiledRuleSet([
+            {'rule_id': 'kw-1', 'rule_type': 'keyword', 'keywords': ['privacy policy']},
+            definitions[1],
+        ], version='v2')
+        audit_paragraphs([{'id': 'other', 'text': 'Unrelated text.'}], changed, verdict_cache=cache)
+        
+        issues, _, _ = audit_paragraphs(paragraphs, changed, audit, verdict_cache=cache)
+        assert [issue['rule_id'] for issue in issues] == ['kw-1', 'kw-2']
+    
+    def test_whitespace_variants_are_cached_apart(self):
+        """Test that texts differing only in whitespace do not share cached verdicts."""
+        rule_set = CompiledRuleSet([{'rule_id': 'kw-1', 'rule_type': 'keyword', 'keywords': ['privacy notice']}])
+        cache = VerdictCache(max_size=100)
+        
+        audit_paragraphs([{'id': 'p1', 'text': 'See our privacy notice.'}], rule_set, verdict_cache=cache)
+        issues, _, _ = audit_paragraphs([{'id': 'p1', 'text': 'See our privacy\nnotice.'}], rule_set,
+                                        verdict_cache=cache)
+        assert [issue['rule_id'] for issue in issues] == ['kw-1']
+    
+    def test_verdict_cache_shared_across_documents(self, evaluated):
+        """Test that boilerplate paragraphs are evaluated once across documents."""
+        rule_set = CompiledRuleSet([
+            {'rule_id': 'kw-1', 'rule_type': 'keyword', 'keywords': ['privacy notice']},
+            {'rule_id': 're-1', 'rule_type': 'regex', 'pattern': r'right\s+to\s+erasure'},
+        ])
+        boilerplate = 'See our privacy notice.'
+        cache = VerdictCache(max_size=100)
+        
+        first, _, _ = audit_paragraphs([{'id': 'p1', 'text': boilerplate}], rule_set, verdict_cache=cache)
+        assert cache.stats()['misses'] == 2
+        
+        evaluated.clear()
+        second, _, _ = audit_paragraphs([
+            {'id': 'p1', 'text': 'You have the right to erasure.'},
+            {'id': 'p2', 'text': boilerplate},
+        ], rule_set, verdict_cache=cache)
+        
+        assert [text for text, _ in evaluated] == ['You have the right to erasure.']
+        assert [(issue['rule_id'], issue['paragraph_id']) for issue in second] == [('kw-1', 'p1'), ('re-1', 'p2')]
+        assert [issue['rule_id'] for issue in first] == ['re-1']
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['size']) == (2, 4, 4)
+        
+        # The in-memory tier is bounded
+        small = VerdictCache(max_size=3)
+        small.put_many({('h1', 'r', 'v'): True, ('h2', 'r', 'v'): False, ('h3', 'r', 'v'): True})
+        small.get_many([('h1', 'r', 'v')])
+        small.put_many({('h4', 'r', 'v'): False})
+        assert small.get_many([('h1', 'r', 'v'), ('h2', 'r', 'v'), ('h4', 'r', 'v')]) == {
+            ('h1', 'r', 'v'): True, ('h4', 'r', 'v'): False
+        }
+    
+    def test_parallel_evaluation(self):
+        """Test that evaluating in worker processes gives the same issues as in-process."""
+        rule_set = get_compiled_rule_set(['GDPR', 'HIPAA'])
+        texts = [
+            'You have the right to access your data.',
+            'This Notice of Privacy Practices explains the log of disclosures.',
+            'Nothing relevant here.',
+        ]
+        paragraphs = [{'id': f'p{i+1}', 'text': f'{texts[i % 3]} ({i})'} for i in range(50)]
+        
+        pool = RulePool(max_workers=2, min_paragraphs=10, chunk_size=7)
+        assert not pool.should_use(9)
+        try:
+            parallel, parallel_with_issues, _ = audit_paragraphs(paragraphs, rule_set, rule_pool=pool)
+        finally:
+            pool.shutdown()
+        inline, inline_with_issues = evaluate_paragraphs(paragraphs, rule_set)
+        
+        key = itemgetter('rule_id', 'paragraph_id')
+        assert [key(issue) for issue in parallel] == [key(issue) for issue in inline]
+        assert parallel_with_issues == inline_with_issues
+    
+    def test_stream_document_compliance(self):
+        """Test that streaming a document finds the same issues and score without touching the input."""
+        texts = ['You have the right to access your data.', 'Nothing relevant here.']
+        paragraphs = [{'id': f'p{i+1}', 'content': texts[i % 2]} for i in range(1200)]
+        
+        stream = stream_document_compliance((paragraph for paragraph in paragraphs), ['GDPR'])
+        streamed = list(stream)
+        
+        assert paragraphs[0] == {'id': 'p1', 'content': texts[0]}
+        rule_set = get_compiled_rule_set(['GDPR'])
+        expected, with_issues = evaluate_paragraphs(
+            [{'id': p['id'], 'text': p['content']} for p in paragraphs], rule_set
+        )
+        
+        def key(issue):
+            return issue['rule_id'], issue['paragraph_id']
+        
+        assert [key(issue) for issue in streamed] == [key(issue) for issue in expected]
+        assert stream.paragraph_count == 1200
+        assert stream.score == 100 * (1 - len(with_issues) / 1200)
+        assert stream.status in ('partially_compliant', 'non_compliant')
+    
     def test_check_document_compliance(self, app):
         """Test checking document compliance."""
         with app.app_context():
@@ -1,8 +1,16 @@
 """
 Tests for the utility functions.
 """
-from app.utils.text_processing import extract_paragraphs_with_ids, split_into_paragraphs
+from app.utils.text_processing import (
+    TextNormalizer,
+    extract_paragraphs_with_ids,
+    normalize_text,
+    split_into_paragraphs,
+)
+from app.utils.file_types import detect_extension, sniff_format
 from app.utils.pagination import get_pagination
+import re
+from app.utils.matchers import KeywordMatcher, RegexSetMatcher
 from app.models.document import Document, DocumentType, ComplianceStatus
 
 
@@ -66,6 +74,120 @@ class TestTextProcessing:
         
         # Verify the result
         assert len(paragraphs) == 0
+    
+    def test_normalize_text_in_chunks(self):
+        """Test that chunked normalization matches the chained cleaning steps and paragraph split."""
+        def legacy_clean(text):
+            text = re.sub(r"\n{3,}", "\n\n", text)
+            text = re.sub(r" {2,}", " ", text)
+            text = text.replace("\x00", "")
+            return re.sub(r"[\x01-\x08\x0b\x0c\x0e-\x1f\x7f]", "", text).strip()
+        
+        # Runs are collapsed before control characters are dropped, so
+        # "\n\x00\n\n" keeps three newlines
+        text = (" \x01Consent  form\n\x00\n\nPatient\x0c name:  Ana\n\n\n\n"
+                "Signed \x7f\n \n  Witness é\t\n")
+        expected = legacy_clean(text)
+        assert normalize_text(text) == expected
+        
+        for size in (1, 2, 5, len(text)):
+            normalizer = TextNormalizer()
+            cleaned = []
+            paragraphs = []
+            for start in range(0, len(text), size):
+                chunk_text, completed = normalizer.feed(text[start:start + size])
+                cleaned.append(chunk_text)
+                paragraphs.extend(completed)
+            paragraphs.extend(normalizer.close())
+            assert "".join(cleaned) == expected
+            assert paragraphs == split_into_paragraphs(expected)
+        assert paragraphs == ["Consent form", "Patient name: Ana", "Signed", "Witness é"]
+
+
+class TestFileTypes:
+    """Tests for format detection from leading bytes."""
+    
+    def test_sniff_format(self):
+        """Test that formats are recognized from their first bytes."""
+        assert sniff_format(b'%PDF-1.7\n%\xe2\xe3') == 'pdf'
+        assert sniff_format(b'PK\x03\x04\x14\x00\x06\x00[Content_Types].xmlword/document.xml') == 'docx'
+        assert sniff_format(b'{\\rtf1\\ansi Consent}') == 'rtf'
+        assert sniff_format(b'\xef\xbb\xbf<!DOCTYPE html><html><body>Notice</body></html>') == 'html'
+        assert sniff_format(b'<?xml version="1.0"?><patient/>') == 'xml'
+        assert sniff_format(b'  [{"id": 1}]') == 'json'
+        assert sniff_format(b'From: clinic@example.org\r\nSubject: Notice\r\n\r\nBody') == 'eml'
+        assert sniff_format('name,consent\nAna,sí\n'.encode('latin-1')) == 'text'
+        assert sniff_format(b'\x7fELF\x02\x01\x01\x00' + bytes(range(256))) is None
+    
+    def test_detect_extension(self):
+        """Test that declared extensions are kept only when they fit the content."""
+        assert detect_extension('notice.htm', b'<html><body>Notice</body></html>') == '.htm'
+        assert detect_extension('notice.txt', b'<html><body>Notice</body></html>') == '.txt'
+        assert detect_extension('notice.docx', b'%PDF-1.4') == '.pdf'
+        assert detect_extension('notice.pdf', b'Plain notice text') == '.txt'
+        assert detect_extension('notice.log', b'Plain notice text') == '.log'
+        assert detect_extension('notice.pdf', b'\x00\x01\x02\x03' * 100) is None
+
+
+class TestKeywordMatcher:
+    """Tests for the Aho-Corasick keyword matcher."""
+
+    def test_matches(self):
+        """Test that the matcher agrees with substring checks, including overlaps."""
+        keywords_by_key = {
+            'a': ['notice of privacy practices'],
+            'b': ['privacy practices', 'privacy notice'],
+            'c': ['practice'],
+            'd': ['right to erasure'],
+        }
+        matcher = KeywordMatcher(keywords_by_key)
+        
+        texts = [
+            'this notice of privacy practices applies',
+            'our privacy notice',
+            'nothing relevant',
+            '',
+        ]
+        for text in texts:
+            expected = {
+                key for key, keywords in keywords_by_key.items()
+                if any(keyword in text for keyword in keywords)
+            }
+            assert matcher.matches(text) == expected
+        
+        # An empty keyword is satisfied by any text
+        assert KeywordMatcher({'e': ['']}).matches('anything') == {'e'}
+
+
+class TestRegexSetMatcher:
+    """Tests for the single-pass regex set matcher."""
+
+    def test_matches(self):
+        """Test that the matcher reports exactly the patterns that search finds."""
+        patterns = [
+            r"right\s+to\s+access|access\s+to\s+(?:your|their)\s+(?:data|information)|request\s+(?:access|copy)",
+            r"notice\s+of\s+privacy\s+practices|privacy\s+notice|privacy\s+practices",
+            r"right\s+to\s+amend|amend\s+(?:your|their)\s+(?:information|record)",
+            r"(data)\s+\1",  # Backreference
+            r"\d+\s+days",
+            r"[a-z]+@[a-z]+\.com",  # No usable literal
+            r"stop",
+        ]
+        compiled = {index: re.compile(pattern, re.IGNORECASE) for index, pattern in enumerate(patterns)}
+        matcher = RegexSetMatcher(compiled)
+        
+        texts = [
+            'You may REQUEST ACCESS to your records within 30 days.',
+            'Read our Notice of Privacy Practices or contact privacy@example.com.',
+            'You can amend their record. Data data everywhere.',
+            'Access to your information is limited.',
+            'Nothing relevant here.',
+            'The long s in \u017ftop still matches case-insensitively.',
+            '',
+        ]
+        for text in texts:
+            expected = {index for index, pattern in compiled.items() if pattern.search(text)}
+            assert matcher.matches(text) == expected
 
 
 class TestPagination: